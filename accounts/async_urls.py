@@ -0,0 +1,6 @@
+from django.urls import path
+from . import async_views
+
+urlpatterns = [
+    path('me/', async_views.me_view, name='async-me'),
+]
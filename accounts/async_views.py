@@ -0,0 +1,8 @@
+from cati_system.async_api import async_api_view, render
+from .serializers import UserSerializer
+
+
+@async_api_view(['GET'])
+async def me_view(request):
+    """Async me_view; the user comes from the token cache or one async query"""
+    return render(UserSerializer(request.user).data)
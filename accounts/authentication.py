@@ -0,0 +1,168 @@
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+
+REVOKED_TOKEN_KEY = 'auth:revoked-token:{}'
+USER_GENERATION_KEY = 'auth:user-generation:{}'
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of token key -> (user, token) with a TTL.
+
+    Entries live in process memory, so a hit needs no database query.
+    Invalidation drops the local entry and also writes to the shared Django
+    cache, which other worker processes check on every hit: a revocation
+    marker for a deleted token, and a new generation of the user whenever the
+    user is saved. An entry cached under an older generation is a miss, so a
+    role change or deactivation is seen by every process on its next request.
+    Hits return a copy of the cached user, never the shared instance.
+    """
+
+    def __init__(self, max_size=10000, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        entry = self._lookup(key)
+        if entry is None:
+            return None
+        return self._confirm(key, entry, cache.get_many(self._shared_keys(key, entry)))
+
+    async def aget(self, key):
+        """get() for async views; the shared revocation check uses the async cache API"""
+        entry = self._lookup(key)
+        if entry is None:
+            return None
+        return self._confirm(key, entry, await cache.aget_many(self._shared_keys(key, entry)))
+
+    def _lookup(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < now:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+        return entry
+
+    @staticmethod
+    def _shared_keys(key, entry):
+        return [REVOKED_TOKEN_KEY.format(key), USER_GENERATION_KEY.format(entry[1].pk)]
+
+    def _confirm(self, key, entry, shared):
+        revoked = REVOKED_TOKEN_KEY.format(key) in shared
+        generation = shared.get(USER_GENERATION_KEY.format(entry[1].pk))
+        with self._lock:
+            if revoked or generation != entry[3]:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+        return copy.copy(entry[1]), entry[2]
+
+    def set(self, key, user, token):
+        self._store(key, user, token, cache.get(USER_GENERATION_KEY.format(user.pk)))
+
+    async def aset(self, key, user, token):
+        self._store(key, user, token, await cache.aget(USER_GENERATION_KEY.format(user.pk)))
+
+    def _store(self, key, user, token, generation):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, copy.copy(user), token, generation)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+            self.invalidations += 1
+        cache.set(REVOKED_TOKEN_KEY.format(key), True, timeout=self.ttl)
+
+    def invalidate_user(self, user_id):
+        """Drop every cached token of a user here and, through a new generation, in other workers"""
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[1].pk == user_id]:
+                del self._entries[key]
+                self.invalidations += 1
+        # Entries older than the TTL are gone anyway, so the generation only has to outlive them
+        cache.set(USER_GENERATION_KEY.format(user_id), uuid.uuid4().hex, timeout=self.ttl)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+token_cache = TokenCache(
+    max_size=getattr(settings, 'TOKEN_CACHE_MAX_SIZE', 10000),
+    ttl=getattr(settings, 'TOKEN_CACHE_TTL', 300),
+)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that resolves token -> user from token_cache"""
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is not None:
+            return cached
+
+        user, token = super().authenticate_credentials(key)
+        token_cache.set(key, user, token)
+        return user, token
+
+    async def aauthenticate(self, request):
+        """
+        authenticate() for async views on a plain Django request: resolves the
+        token through the async cache and ORM APIs instead of blocking.
+        """
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed('Invalid token header.')
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed('Invalid token header.')
+
+        cached = await token_cache.aget(key)
+        if cached is not None:
+            return cached
+
+        try:
+            token = await self.get_model().objects.select_related('user').aget(key=key)
+        except self.get_model().DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        await token_cache.aset(key, token.user, token)
+        return token.user, token
@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import token_cache
+from .models import User
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    token_cache.invalidate(instance.key)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tokens(sender, instance, **kwargs):
+    # Refresh cached users in every process on any change (role, is_staff, is_active, ...).
+    # After commit, so no process reloads the old row under the new generation.
+    user_id = instance.pk
+    transaction.on_commit(lambda: token_cache.invalidate_user(user_id))
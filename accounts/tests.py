@@ -0,0 +1,81 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+
+from accounts.authentication import TokenCache
+from accounts.models import User
+from cati_system import testing
+from cati_system.metrics import SLOT_KEY, MetricsRegistry
+
+
+class AccountQueryBudgetTests(testing.QueryBudgetTestCase):
+    ENDPOINTS = [
+        ('me', 1, lambda f: '/api/auth/me/'),
+        ('async-me', 1, lambda f: '/api/async/auth/me/'),
+    ]
+
+
+class TokenCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='cached', password='cached', role='admin')
+        self.token = Token.objects.create(user=self.user)
+        # A second cache stands in for another worker process sharing the Django cache
+        self.caches = [TokenCache(), TokenCache()]
+        for token_cache in self.caches:
+            token_cache.set(self.token.key, self.user, self.token)
+
+    def test_user_change_is_seen_by_every_process(self):
+        self.user.role = 'interviewer'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        for token_cache in self.caches:
+            self.assertIsNone(token_cache.get(self.token.key))
+
+    def test_hits_return_a_copy_of_the_user(self):
+        first, _ = self.caches[0].get(self.token.key)
+        first.role = 'interviewer'
+        second, _ = self.caches[0].get(self.token.key)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.role, 'admin')
+        self.assertEqual(self.caches[0].stats()['hits'], 2)
+
+    def test_metrics_report_the_hit_ratio(self):
+        auth = f'Token {self.token.key}'
+        for _ in range(2):
+            response = self.client.get('/api/metrics', secure=True, HTTP_AUTHORIZATION=auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('cati_token_cache_hits_total', response.content.decode())
+        self.assertIn('cati_token_cache_hit_ratio', response.content.decode())
+
+
+class MetricsRegistryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def publish(self, pid, value):
+        registry = MetricsRegistry()
+        registry.observe('cati_request_sql_queries', ('view', 'GET'), value)
+        with mock.patch('cati_system.metrics.os.getpid', return_value=pid):
+            registry.maybe_flush(force=True)
+        return registry
+
+    def test_every_process_keeps_its_own_slot(self):
+        first, second = self.publish(101, 1), self.publish(102, 2)
+        self.assertNotEqual(first._slot, second._slot)
+        with mock.patch('cati_system.metrics.os.getpid', return_value=103):
+            merged, _ = MetricsRegistry().collect()
+        self.assertEqual(merged[('cati_request_sql_queries', ('view', 'GET'))][2], 2)
+
+    def test_an_expired_slot_is_reused_and_its_owner_moves(self):
+        first = self.publish(101, 1)
+        cache.delete(SLOT_KEY.format(first._slot))
+        second = self.publish(102, 2)
+        self.assertEqual(second._slot, first._slot)
+
+        with mock.patch('cati_system.metrics.os.getpid', return_value=101):
+            first.maybe_flush(force=True)
+        self.assertNotEqual(first._slot, second._slot)
+        self.assertEqual(cache.get(SLOT_KEY.format(second._slot))['process'], second.process_id)
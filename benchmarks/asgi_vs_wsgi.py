@@ -0,0 +1,168 @@
+"""
+Compare the synchronous (WSGI) hot reads with their async (ASGI) versions.
+
+Starts gunicorn (WSGI, sync workers) and uvicorn (ASGI) with the same number
+of worker processes against the configured database, then drives each
+endpoint pair with an increasing number of concurrent clients and prints
+throughput and latency percentiles as JSON:
+
+    python benchmarks/asgi_vs_wsgi.py --token <key> --contact-id 1 --interview-id 1 \
+        --workers 4 --concurrency 1,16,64 --requests 2000
+
+The servers inherit the environment (SECRET_KEY, DATABASE settings, ...).
+Use DEBUG=True when no TLS terminator sits in front, otherwise every request
+is redirected to HTTPS.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (name, WSGI path, ASGI path)
+ENDPOINTS = [
+    ('current_user', '/api/auth/me/', '/api/async/auth/me/'),
+    ('question_catalog', '/api/interviews/questions/', '/api/async/interviews/questions/'),
+    ('contact_rounds', '/api/interviews/contact/{contact_id}/rounds/',
+     '/api/async/interviews/contact/{contact_id}/rounds/'),
+    ('interview_detail', '/api/interviews/{interview_id}/', '/api/async/interviews/{interview_id}/'),
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind, port, workers):
+    if kind == 'wsgi':
+        command = [sys.executable, '-m', 'gunicorn', 'cati_system.wsgi:application',
+                   '--workers', str(workers), '--bind', f'127.0.0.1:{port}', '--log-level', 'warning']
+    else:
+        command = [sys.executable, '-m', 'uvicorn', 'cati_system.asgi:application',
+                   '--workers', str(workers), '--host', '127.0.0.1', '--port', str(port),
+                   '--log-level', 'warning', '--no-access-log']
+    process = subprocess.Popen(command, cwd=BASE_DIR)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'{kind} server did not start on port {port}')
+
+
+async def fetch(port, path, token):
+    """One request on a fresh connection; returns (status, seconds)"""
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write((
+        f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+        f'Authorization: Token {token}\r\nConnection: close\r\n\r\n'
+    ).encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    elapsed = time.perf_counter() - started
+    status = int(response.split(b' ', 2)[1]) if response else 0
+    return status, elapsed
+
+
+async def run_load(port, path, token, concurrency, total):
+    latencies = []
+    errors = 0
+    remaining = total
+
+    async def client():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            try:
+                status, elapsed = await fetch(port, path, token)
+            except OSError:
+                errors += 1
+                continue
+            if status != 200:
+                errors += 1
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    return summarize(latencies, errors, wall)
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return round(ordered[index] * 1000, 2)
+
+
+def summarize(latencies, errors, wall):
+    ordered = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / wall, 1) if wall else None,
+        'p50_ms': percentile(ordered, 0.50),
+        'p95_ms': percentile(ordered, 0.95),
+        'p99_ms': percentile(ordered, 0.99),
+        'max_ms': percentile(ordered, 1.0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--token', required=True, help='API token of an interviewer or admin')
+    parser.add_argument('--contact-id', type=int, required=True)
+    parser.add_argument('--interview-id', type=int, required=True,
+                        help='An interview owned by the token user')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--concurrency', default='1,16,64',
+                        help='Comma separated numbers of concurrent clients')
+    parser.add_argument('--requests', type=int, default=1000, help='Requests per endpoint and level')
+    parser.add_argument('--endpoints', default=','.join(name for name, _, _ in ENDPOINTS))
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(',')]
+    selected = [endpoint for endpoint in ENDPOINTS if endpoint[0] in args.endpoints.split(',')]
+    ports = {'wsgi': free_port(), 'asgi': free_port()}
+    servers = {kind: start_server(kind, port, args.workers) for kind, port in ports.items()}
+
+    report = {'workers': args.workers, 'requests': args.requests, 'results': []}
+    try:
+        for name, wsgi_path, asgi_path in selected:
+            paths = {
+                'wsgi': wsgi_path.format(contact_id=args.contact_id, interview_id=args.interview_id),
+                'asgi': asgi_path.format(contact_id=args.contact_id, interview_id=args.interview_id),
+            }
+            for level in levels:
+                row = {'endpoint': name, 'concurrency': level}
+                for kind in ['wsgi', 'asgi']:
+                    # Warm up caches and connections before measuring
+                    asyncio.run(run_load(ports[kind], paths[kind], args.token, level, level))
+                    row[kind] = asyncio.run(
+                        run_load(ports[kind], paths[kind], args.token, level, args.requests)
+                    )
+                report['results'].append(row)
+    finally:
+        for process in servers.values():
+            process.terminate()
+        for process in servers.values():
+            process.wait()
+
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
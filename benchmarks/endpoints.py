@@ -0,0 +1,384 @@
+"""
+Endpoint benchmark suite.
+
+Creates a throwaway test database, fills it with `generate_dataset`, then
+drives every URL of accounts/urls.py, contacts/urls.py and
+interviews/urls.py through the Django test client and prints, per scenario,
+latency percentiles, query counts and peak Python memory as JSON:
+
+    python benchmarks/endpoints.py --contacts 5000 --iterations 30 --output run.json
+    python benchmarks/endpoints.py --contacts 5000 --baseline run.json
+
+Every request runs inside a transaction that is rolled back, so writes do
+not change the data seen by later iterations and runs are repeatable for a
+given seed. The suite fails when a URL has no scenario.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cati_system.settings')
+
+import django  # noqa: E402
+
+URL_MODULES = ['accounts.urls', 'contacts.urls', 'interviews.urls']
+
+
+class Scenario:
+    def __init__(self, name, url_name, method='get', kwargs=None, data=None, query=None,
+                 setup=None, multipart=False, expect=(200,)):
+        self.name = name
+        self.url_name = url_name
+        self.method = method
+        self.kwargs = kwargs or {}
+        self.data = data
+        self.query = query
+        self.setup = setup
+        self.multipart = multipart
+        self.expect = expect
+
+    def request(self, client, context, iteration):
+        from django.urls import reverse
+
+        kwargs = self.kwargs(context) if callable(self.kwargs) else self.kwargs
+        headers = {'HTTP_AUTHORIZATION': f"Token {context['token']}"}
+        if self.setup:
+            extra = self.setup(context) or {}
+            kwargs = {**kwargs, **extra.get('kwargs', {})}
+            headers.update(extra.get('headers', {}))
+
+        path = reverse(self.url_name, kwargs=kwargs)
+        query = self.query(context) if callable(self.query) else self.query
+        if query:
+            path = f'{path}?{query}'
+        data = self.data(context, iteration) if callable(self.data) else self.data
+        options = {'secure': True, **headers}
+        if self.method != 'get' and not self.multipart:
+            options['content_type'] = 'application/json'
+            data = json.dumps(data or {})
+        response = getattr(client, self.method)(path, data, **options)
+        if response.streaming:
+            # Streaming responses do their work while being consumed
+            for _ in response.streaming_content:
+                pass
+        return response
+
+
+def import_file(context, iteration):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    rows = ['name,phone,serialNumber,cuid,ticketNumber,location']
+    rows += [f'Import {i},0909{i:07d},ISN{i},ICU{i},ITK{i},Lagos' for i in range(200)]
+    return {'file': SimpleUploadedFile('contacts.csv', '\n'.join(rows).encode(), 'text/csv')}
+
+
+def fresh_token(context):
+    """A disposable token for logout, created inside the rolled-back transaction"""
+    from rest_framework.authtoken.models import Token
+
+    Token.objects.filter(user=context['logout_user']).delete()
+    token = Token.objects.create(user=context['logout_user'])
+    return {'headers': {'HTTP_AUTHORIZATION': f'Token {token.key}'}}
+
+
+def leased_round(context):
+    from interviews.dispatch import lease_next_round
+
+    interview_round = lease_next_round(context['user'])
+    return {'kwargs': {'round_id': interview_round.id}}
+
+
+def archived_contact(context):
+    """Archive a completed contact inside the rolled-back transaction (included in the timing)"""
+    from datetime import timedelta
+
+    from django.utils import timezone
+    from interviews.archive import archive_batch
+
+    archive_batch([context['completed_contact'].id], timezone.now() + timedelta(days=1))
+    return {'kwargs': {'contact_id': context['completed_contact'].id}}
+
+
+def recent_changes(context):
+    """A poll by a client that synced right after the dataset was built"""
+    from urllib.parse import urlencode
+
+    return urlencode({'since': context['synced_at'].isoformat()})
+
+
+def offline_batch(context, iteration):
+    """What an interviewer queues offline: a round start, answers, progress and the XForm"""
+    return {'operations': [
+        {'key': f'start-{iteration}', 'type': 'start_round',
+         'contact_id': context['fresh_contact'].id, 'round_number': 1},
+        {'key': f'answers-{iteration}', 'type': 'upsert_responses', 'interview_key': f'start-{iteration}',
+         'responses': [{'question_id': q.id, 'answer': f'answer {iteration}'} for q in context['questions'][:20]]},
+        {'key': f'progress-{iteration}', 'type': 'progress', 'interview_key': f'start-{iteration}',
+         'current_question_index': 20, 'stage': 2},
+        {'key': f'xform-{iteration}', 'type': 'submit_xform', 'interview_key': f'start-{iteration}',
+         'form_data': {'consent': True, 'household': {'size': 4, 'region': 'Lagos'}}},
+    ]}
+
+
+SCENARIOS = [
+    Scenario('login', 'login', 'post',
+             data=lambda c, i: {'username': c['user'].username, 'password': c['password']}),
+    Scenario('logout', 'logout', 'post', setup=fresh_token),
+    Scenario('me', 'me'),
+
+    Scenario('contact_list', 'contact-list-create'),
+    Scenario('contact_list_search', 'contact-list-create', query='search=Okafor'),
+    Scenario('contact_list_status', 'contact-list-create', query='status=round_2&ordering=-updated_at'),
+    Scenario('contact_create', 'contact-list-create', 'post', expect=(201,),
+             data=lambda c, i: {'name': 'Bench Contact', 'phone': f'0707{i:07d}'}),
+    Scenario('contact_detail', 'contact-detail', kwargs=lambda c: {'pk': c['contact'].id}),
+    Scenario('contact_update', 'contact-detail', 'patch', kwargs=lambda c: {'pk': c['contact'].id},
+             data={'notes': 'Updated by benchmark'}),
+    Scenario('contact_import', 'contact-import', 'post', data=import_file, multipart=True,
+             expect=(200, 201)),
+    Scenario('contact_phone_lookup', 'contact-phone-lookup',
+             query=lambda c: f"phone={c['contact'].phone}"),
+
+    Scenario('interview_list', 'interview-list-create'),
+    Scenario('interview_list_responses', 'interview-list-create', query='include_responses=true'),
+    Scenario('interview_create', 'interview-list-create', 'post', expect=(201,),
+             data=lambda c, i: {'contact_id': c['fresh_contact'].id}),
+    Scenario('interview_detail', 'interview-detail', kwargs=lambda c: {'pk': c['open_interview'].id}),
+    Scenario('interview_update', 'interview-detail', 'patch',
+             kwargs=lambda c: {'pk': c['open_interview'].id}, data={'stage': 2}),
+    Scenario('xform_submit', 'submit-xform-data', 'post',
+             kwargs=lambda c: {'interview_id': c['open_interview'].id},
+             data={'form_data': {'consent': True, 'household': {'size': 4, 'region': 'Kano'}}}),
+    Scenario('next_question', 'next-question', 'post',
+             kwargs=lambda c: {'interview_id': c['open_interview'].id}, data={}),
+    Scenario('save_progress', 'save-interview-progress', 'post',
+             kwargs=lambda c: {'interview_id': c['open_interview'].id},
+             data=lambda c, i: {'current_question_index': i, 'stage': 1}),
+    Scenario('question_catalog', 'question-list', query='round=2'),
+    Scenario('export_csv', 'export-responses', query='output=csv'),
+    Scenario('export_ndjson', 'export-responses', query='output=ndjson&round=1'),
+    Scenario('form_field_summary', 'form-field-summary', query='path=household.size'),
+    Scenario('dashboard', 'dashboard'),
+    Scenario('archived_contact', 'archived-contact', setup=archived_contact),
+    Scenario('sync_full', 'sync-changes', query='limit=200'),
+    Scenario('sync_poll', 'sync-changes', query=recent_changes),
+    Scenario('sync_upload', 'sync-upload', 'post', data=offline_batch),
+    Scenario('response_create', 'create-response', 'post',
+             data=lambda c, i: {'interview_id': c['open_interview'].id,
+                                'question_id': c['question'].id, 'answer': f'answer {i}'}),
+    Scenario('response_batch', 'create-responses-batch', 'post',
+             data=lambda c, i: {'interview_id': c['open_interview'].id, 'responses': [
+                 {'question_id': q.id, 'answer': f'answer {i}'} for q in c['questions'][:20]
+             ]}),
+    Scenario('dispatch_next', 'dispatch-next', 'post', expect=(200, 204)),
+    Scenario('dispatch_release', 'dispatch-release', 'post', setup=leased_round),
+    Scenario('contact_rounds', 'contact-interview-rounds',
+             kwargs=lambda c: {'contact_id': c['contact'].id}),
+    Scenario('start_round', 'start-interview-round', 'post',
+             kwargs=lambda c: {'contact_id': c['fresh_contact'].id, 'round_number': 1},
+             expect=(200, 201)),
+]
+
+
+def url_names():
+    from django.urls import URLPattern, get_resolver
+
+    names = set()
+    for module in URL_MODULES:
+        for pattern in get_resolver(module).url_patterns:
+            if isinstance(pattern, URLPattern) and pattern.name:
+                names.add(pattern.name)
+    return names
+
+
+def build_context(prefix, password):
+    from django.utils import timezone
+    from contacts.models import Contact
+    from interviews.models import Interview, Question
+    from rest_framework.authtoken.models import Token
+
+    from accounts.models import User
+
+    user = User.objects.filter(username=f'{prefix}-user-0').get()
+    logout_user, _ = User.objects.get_or_create(
+        username=f'{prefix}-logout', defaults={'role': 'interviewer'}
+    )
+    open_interview = Interview.objects.filter(interviewer=user, status='in_progress').order_by('id').first()
+    if open_interview is None:
+        raise SystemExit('The dataset has no open interview for the benchmark user; generate more contacts')
+    fresh_contact = Contact.objects.filter(
+        created_by=user, status='round_1', interviews__isnull=True
+    ).order_by('id').first()
+    completed_contact = Contact.objects.filter(created_by=user, status='completed').order_by('id').first()
+    if completed_contact is None:
+        raise SystemExit('The dataset has no completed contact for the benchmark user; generate more contacts')
+    questions = list(Question.objects.order_by('stage', 'order', 'id'))
+    return {
+        'synced_at': timezone.now(),
+        'user': user,
+        'password': password,
+        'token': Token.objects.get_or_create(user=user)[0].key,
+        'logout_user': logout_user,
+        'contact': Contact.objects.filter(created_by=user).order_by('id').first(),
+        'fresh_contact': fresh_contact,
+        'completed_contact': completed_contact,
+        'open_interview': open_interview,
+        'questions': questions,
+        'question': questions[0],
+    }
+
+
+def percentile(ordered, fraction):
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return round(ordered[index] * 1000, 3)
+
+
+def run_scenario(client, scenario, context, iterations, warmup):
+    from django.db import connection, transaction
+    from django.test.utils import CaptureQueriesContext
+
+    latencies = []
+    queries = []
+    statuses = set()
+
+    def once(iteration):
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = scenario.request(client, context, iteration)
+                elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+        return response.status_code, elapsed, len(captured)
+
+    for iteration in range(warmup):
+        once(iteration)
+    for iteration in range(iterations):
+        status_code, elapsed, query_count = once(warmup + iteration)
+        statuses.add(status_code)
+        latencies.append(elapsed)
+        queries.append(query_count)
+
+    tracemalloc.start()
+    once(warmup + iterations)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    ordered = sorted(latencies)
+    return {
+        'url_name': scenario.url_name,
+        'method': scenario.method.upper(),
+        'statuses': sorted(statuses),
+        'ok': statuses <= set(scenario.expect),
+        'iterations': iterations,
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 3),
+        'p50_ms': percentile(ordered, 0.50),
+        'p90_ms': percentile(ordered, 0.90),
+        'p95_ms': percentile(ordered, 0.95),
+        'p99_ms': percentile(ordered, 0.99),
+        'max_ms': percentile(ordered, 1.0),
+        'queries': max(queries),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline):
+    for name, result in results.items():
+        before = baseline.get('scenarios', {}).get(name)
+        if not before:
+            continue
+        result['baseline'] = {
+            'p50_change_pct': round((result['p50_ms'] / before['p50_ms'] - 1) * 100, 1) if before['p50_ms'] else None,
+            'p99_change_pct': round((result['p99_ms'] / before['p99_ms'] - 1) * 100, 1) if before['p99_ms'] else None,
+            'queries_change': result['queries'] - before['queries'],
+            'peak_memory_change_kb': round(result['peak_memory_kb'] - before['peak_memory_kb'], 1),
+        }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--contacts', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--only', help='Comma separated scenario names')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    parser.add_argument('--baseline', help='Previous JSON report to compare against')
+    args = parser.parse_args()
+
+    django.setup()
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    missing = url_names() - {scenario.url_name for scenario in SCENARIOS}
+    if missing:
+        raise SystemExit(f"No benchmark scenario for: {', '.join(sorted(missing))}")
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        password = 'bench-password'
+        call_command('generate_dataset', users=args.users, contacts=args.contacts, seed=args.seed,
+                     password=password, stdout=io.StringIO())
+        context = build_context('bench', password)
+
+        selected = args.only.split(',') if args.only else None
+        client = Client()
+        results = {}
+        for scenario in SCENARIOS:
+            if selected and scenario.name not in selected:
+                continue
+            results[scenario.name] = run_scenario(client, scenario, context, args.iterations, args.warmup)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            compare(results, json.load(baseline))
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'dataset': {'users': args.users, 'contacts': args.contacts, 'seed': args.seed},
+            'iterations': args.iterations,
+            'warmup': args.warmup,
+        },
+        'scenarios': results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            handle.write(output + '\n')
+    print(output)
+    if not all(result['ok'] for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class CatiSystemConfig(AppConfig):
+    name = 'cati_system'
+
+    def ready(self):
+        if getattr(settings, 'SERIALIZER_TIMING', True):
+            from .middleware import install_serializer_timing
+            install_serializer_timing()
@@ -0,0 +1,84 @@
+"""
+Support for the async (ASGI) read endpoints.
+
+DRF views are synchronous, so under ASGI every one of them occupies a thread
+for its whole database round-trip. The endpoints mounted under /api/async/
+are plain Django coroutine views instead: `async_api_view` authenticates the
+token with the async cache/ORM APIs, the views load everything they serialize
+with the async ORM, and the regular DRF serializers then run over in-memory
+objects. Responses are rendered with DRF's JSONRenderer, so payloads and
+error bodies match the synchronous endpoints.
+"""
+from functools import wraps
+
+from django.http import HttpResponse
+from rest_framework import exceptions, status
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from accounts.authentication import CachedTokenAuthentication
+
+
+def render(data, status_code=status.HTTP_200_OK, headers=None):
+    content = JSONRenderer().render(data) if data is not None else b''
+    return HttpResponse(content, status=status_code, content_type='application/json', headers=headers)
+
+
+def async_api_view(methods):
+    """
+    Decorator for coroutine views: restricts the HTTP methods, requires token
+    authentication (request.user/request.auth) and renders APIExceptions.
+    """
+    authenticator = CachedTokenAuthentication()
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            try:
+                if request.method not in methods:
+                    raise exceptions.MethodNotAllowed(request.method)
+                user_auth = await authenticator.aauthenticate(request)
+                if user_auth is None:
+                    raise exceptions.NotAuthenticated()
+                request.user, request.auth = user_auth
+                return await view(request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                headers = {}
+                if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                    headers['WWW-Authenticate'] = authenticator.authenticate_header(request)
+                data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+                return render(data, exc.status_code, headers)
+        return wrapper
+    return decorator
+
+
+async def apaginate(request, queryset):
+    """
+    PageNumberPagination for coroutine views. Returns the objects of the
+    requested page and the response envelope without its `results`.
+    """
+    page_size = api_settings.PAGE_SIZE
+    try:
+        page = int(request.GET.get(PageNumberPagination.page_query_param, 1))
+        if page < 1:
+            raise ValueError
+    except ValueError:
+        raise exceptions.NotFound(PageNumberPagination.invalid_page_message)
+
+    count = await queryset.acount()
+    if page > 1 and (page - 1) * page_size >= count:
+        raise exceptions.NotFound(PageNumberPagination.invalid_page_message)
+    objects = [obj async for obj in queryset[(page - 1) * page_size:page * page_size]]
+
+    url = request.build_absolute_uri()
+    page_param = PageNumberPagination.page_query_param
+    next_link = replace_query_param(url, page_param, page + 1) if page * page_size < count else None
+    if page == 1:
+        previous_link = None
+    elif page == 2:
+        previous_link = remove_query_param(url, page_param)
+    else:
+        previous_link = replace_query_param(url, page_param, page - 1)
+    return objects, {'count': count, 'next': next_link, 'previous': previous_link}
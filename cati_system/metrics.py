@@ -0,0 +1,219 @@
+"""
+Request performance metrics in the Prometheus text format.
+
+Every process aggregates histograms in memory (see PerformanceMiddleware)
+and periodically publishes a snapshot of them, with the counters of its
+token cache, to the shared Django cache, so `/api/metrics` can merge the
+numbers of every worker process when a shared cache backend is configured.
+With the default local-memory cache each process only reports itself.
+
+Each process publishes under its own numbered slot key. Slots are claimed
+with atomic cache operations only (add, and incr for a new slot number), so
+concurrent workers never overwrite each other's registration. The slot of a
+process that stops publishing expires and is reused.
+"""
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from accounts.authentication import token_cache
+
+SLOT_COUNT_KEY = 'metrics:slots'
+SLOT_KEY = 'metrics:slot:{}'
+
+# name: (help, buckets)
+HISTOGRAMS = {
+    'cati_request_duration_seconds': (
+        'Request duration',
+        [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+    ),
+    'cati_request_sql_queries': (
+        'SQL queries per request',
+        [0, 1, 2, 5, 10, 20, 50, 100, 200, 500],
+    ),
+    'cati_request_sql_duration_seconds': (
+        'Total SQL time per request',
+        [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5],
+    ),
+    'cati_request_serializer_duration_seconds': (
+        'Time spent producing serializer data per request',
+        [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5],
+    ),
+    'cati_response_size_bytes': (
+        'Response body size (non-streaming responses)',
+        [256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304],
+    ),
+}
+
+# name: (help, type, TokenCache.stats() key)
+TOKEN_CACHE_METRICS = {
+    'cati_token_cache_hits_total': ('Token authentications served from the cache', 'counter', 'hits'),
+    'cati_token_cache_misses_total': ('Token authentications that queried the database', 'counter', 'misses'),
+    'cati_token_cache_evictions_total': ('Tokens evicted from a full cache', 'counter', 'evictions'),
+    'cati_token_cache_invalidations_total': ('Cached tokens dropped on invalidation', 'counter', 'invalidations'),
+    'cati_token_cache_entries': ('Tokens currently cached', 'gauge', 'size'),
+}
+
+
+class MetricsRegistry:
+    """Thread-safe in-process histograms keyed by (metric, view, method)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._series = {}
+        self._last_flush = 0.0
+        self._pid = None
+        self._slot = None
+        self.process_id = None
+
+    def observe(self, name, labels, value):
+        buckets = HISTOGRAMS[name][1]
+        with self._lock:
+            series = self._series.get((name, labels))
+            if series is None:
+                series = self._series[(name, labels)] = [[0] * (len(buckets) + 1), 0.0, 0]
+            series[0][bisect_left(buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self):
+        with self._lock:
+            series = {key: [list(counts), total, count] for key, (counts, total, count) in self._series.items()}
+        return {'series': series, 'token_cache': token_cache.stats(), 'process': self.process_id}
+
+    def flush_due(self):
+        """Whether the publish interval has passed; no I/O, so cheap on the request path"""
+        return time.monotonic() - self._last_flush >= getattr(settings, 'METRICS_FLUSH_SECONDS', 15)
+
+    def maybe_flush(self, force=False):
+        """Publish this process' snapshot to the shared cache at most once per interval"""
+        if not force and not self.flush_due():
+            return
+        # One thread publishes; the others skip instead of queueing behind it
+        if not self._flush_lock.acquire(blocking=force):
+            return
+        try:
+            self._last_flush = time.monotonic()
+            self._publish()
+        finally:
+            self._flush_lock.release()
+
+    def _publish(self):
+        pid = os.getpid()
+        if pid != self._pid:
+            # First publish, or a worker forked from a process that had published
+            self._pid, self._slot = pid, None
+            self.process_id = f'{socket.gethostname()}:{pid}'
+        timeout = max(getattr(settings, 'METRICS_FLUSH_SECONDS', 15) * 10, 60)
+        snapshot = self.snapshot()
+
+        if self._slot is not None:
+            key = SLOT_KEY.format(self._slot)
+            current = cache.get(key)
+            if current is not None and current.get('process') == self.process_id:
+                cache.set(key, snapshot, timeout=timeout)
+                return
+            if current is None and cache.add(key, snapshot, timeout=timeout):
+                return
+            # The slot expired and another process took it
+        self._slot = self._claim_slot(snapshot, timeout)
+
+    @staticmethod
+    def _claim_slot(snapshot, timeout):
+        """Store `snapshot` in a free slot, reusing expired ones first; returns the slot number"""
+        cache.add(SLOT_COUNT_KEY, 0, timeout=None)
+        for slot in range(cache.get(SLOT_COUNT_KEY) or 0):
+            if cache.add(SLOT_KEY.format(slot), snapshot, timeout=timeout):
+                return slot
+        try:
+            slot = cache.incr(SLOT_COUNT_KEY) - 1
+        except ValueError:
+            # The counter was evicted between add() and incr()
+            cache.add(SLOT_COUNT_KEY, 0, timeout=None)
+            slot = cache.incr(SLOT_COUNT_KEY) - 1
+        cache.set(SLOT_KEY.format(slot), snapshot, timeout=timeout)
+        return slot
+
+    def collect(self):
+        """Merged histograms and token cache counters of every process that published recently"""
+        self.maybe_flush(force=True)
+        slots = cache.get(SLOT_COUNT_KEY) or 0
+        snapshots = cache.get_many([SLOT_KEY.format(slot) for slot in range(slots)])
+
+        merged = {}
+        token_stats = {}
+        for snapshot in snapshots.values():
+            for key, (counts, total, count) in snapshot['series'].items():
+                series = merged.setdefault(key, [[0] * len(counts), 0.0, 0])
+                series[0] = [a + b for a, b in zip(series[0], counts)]
+                series[1] += total
+                series[2] += count
+            for key, value in snapshot['token_cache'].items():
+                token_stats[key] = token_stats.get(key, 0) + value
+        return merged, token_stats
+
+
+registry = MetricsRegistry()
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def render_prometheus(series, token_stats):
+    lines = []
+    for name, (help_text, buckets) in HISTOGRAMS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for (metric, labels), (counts, total, count) in sorted(series.items()):
+            if metric != name:
+                continue
+            view, method = labels
+            base = f'view="{escape_label(view)}",method="{escape_label(method)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{base},le="+Inf"}} {count}')
+            lines.append(f'{name}_sum{{{base}}} {total}')
+            lines.append(f'{name}_count{{{base}}} {count}')
+
+    for name, (help_text, kind, key) in TOKEN_CACHE_METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.append(f'{name} {token_stats.get(key, 0)}')
+    lookups = token_stats.get('hits', 0) + token_stats.get('misses', 0)
+    lines.append('# HELP cati_token_cache_hit_ratio Share of token authentications served from the cache')
+    lines.append('# TYPE cati_token_cache_hit_ratio gauge')
+    lines.append(f"cati_token_cache_hit_ratio {token_stats.get('hits', 0) / lookups if lookups else 0}")
+    return '\n'.join(lines) + '\n'
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. Requires `Authorization: Bearer <METRICS_TOKEN>`
+    when a token is configured, otherwise an authenticated admin.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    authorized = bool(token) and request.headers.get('Authorization') == f'Bearer {token}'
+    user = request.user
+    if not authorized and not (user.is_authenticated and (user.is_staff or user.role == 'admin')):
+        return Response({'error': 'Not allowed'}, status=status.HTTP_403_FORBIDDEN)
+
+    return HttpResponse(
+        render_prometheus(*registry.collect()),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -0,0 +1,156 @@
+import logging
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+current_request_stats = ContextVar('current_request_stats', default=None)
+
+
+class RequestStats:
+    """Timings collected while one request is handled"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.statements = {}
+        self.serializer_time = 0.0
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.sql_count += 1
+            self.sql_time += elapsed
+            statement = self.statements.setdefault(sql, [0, 0.0])
+            statement[0] += 1
+            statement[1] += elapsed
+
+
+def install_serializer_timing():
+    """
+    Time the outermost `serializer.data` evaluation of each request. Nested
+    serializers and lazy queries they trigger are included in that time.
+
+    This wraps BaseSerializer.data for the whole process, so it is installed
+    once from CatiSystemConfig.ready() and only when SERIALIZER_TIMING is on.
+    Outside a request the wrapper only reads a context variable.
+    """
+    original = BaseSerializer.data
+    if getattr(original.fget, 'timed', False):
+        return
+
+    def data(self):
+        stats = current_request_stats.get()
+        if stats is None or stats.serializing:
+            return original.fget(self)
+        stats.serializing = True
+        started = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            stats.serializer_time += time.perf_counter() - started
+            stats.serializing = False
+
+    data.timed = True
+    BaseSerializer.data = property(data)
+
+
+class PerformanceMiddleware:
+    """
+    Records per request the view name, SQL query count and time, serializer
+    time, response size and total time. Adds them as a Server-Timing header,
+    feeds the /api/metrics histograms and logs the top SQL statements of
+    requests slower than SLOW_REQUEST_MS.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        try:
+            with self.recording(stats):
+                response = self.get_response(request)
+        finally:
+            current_request_stats.reset(token)
+        self.finish(request, response, stats)
+        registry.maybe_flush()
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        # The async ORM runs on the request's sync thread with that thread's
+        # connections, so the wrappers are installed (and removed) there
+        recording = await sync_to_async(self.recording)(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recording.close)()
+            current_request_stats.reset(token)
+        self.finish(request, response, stats)
+        if registry.flush_due():
+            # Publishing makes blocking cache calls, which must stay off the event loop
+            await sync_to_async(registry.maybe_flush)()
+        return response
+
+    @staticmethod
+    def recording(stats):
+        """Install the SQL recorder on this thread's connections until the stack is closed"""
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        return stack
+
+    def finish(self, request, response, stats):
+        total = time.perf_counter() - stats.started
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else '<unresolved>'
+        labels = (view, request.method)
+
+        registry.observe('cati_request_duration_seconds', labels, total)
+        registry.observe('cati_request_sql_queries', labels, stats.sql_count)
+        registry.observe('cati_request_sql_duration_seconds', labels, stats.sql_time)
+        registry.observe('cati_request_serializer_duration_seconds', labels, stats.serializer_time)
+        if not response.streaming:
+            registry.observe('cati_response_size_bytes', labels, len(response.content))
+
+        if getattr(settings, 'SERVER_TIMING_HEADER', True):
+            response['Server-Timing'] = ', '.join([
+                f'sql;dur={stats.sql_time * 1000:.2f};desc="{stats.sql_count} queries"',
+                f'serializer;dur={stats.serializer_time * 1000:.2f}',
+                f'total;dur={total * 1000:.2f}',
+            ])
+
+        slow_ms = getattr(settings, 'SLOW_REQUEST_MS', 1000)
+        if slow_ms and total * 1000 >= slow_ms:
+            top = sorted(stats.statements.items(), key=lambda item: item[1][1], reverse=True)
+            top = top[:getattr(settings, 'SLOW_REQUEST_TOP_SQL', 5)]
+            logger.warning(
+                'Slow request %s %s (%s): %.1f ms, %d queries in %.1f ms, serializer %.1f ms\n%s',
+                request.method, request.get_full_path(), view, total * 1000,
+                stats.sql_count, stats.sql_time * 1000, stats.serializer_time * 1000,
+                '\n'.join(f'  {count}x {elapsed * 1000:.1f} ms: {sql}' for sql, (count, elapsed) in top)
+            )
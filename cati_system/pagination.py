@@ -0,0 +1,212 @@
+import base64
+import binascii
+import json
+from urllib import parse
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination with opaque cursors.
+
+    Pages are selected with a WHERE clause on the ordering columns of the
+    last row seen (plus `id` as a tie-breaker) instead of OFFSET, and no
+    COUNT(*) is issued, so every page costs the same as the first one. The
+    ordering is whatever OrderingFilter or the model Meta applied to the
+    queryset; nullable columns sort last. Requests carrying `page` fall back
+    to page-number pagination for older clients.
+    """
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 200
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.fallback = None
+        if PageNumberPagination.page_query_param in request.query_params:
+            self.fallback = PageNumberPagination()
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset)
+        cursor = self.decode_cursor(request)
+
+        reverse = cursor is not None and cursor['reverse']
+        queryset = queryset.order_by(*self.order_expressions(reverse))
+        if cursor is not None:
+            queryset = queryset.filter(self.seek_filter(cursor['position'], reverse))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        self.first, self.last = (results[0], results[-1]) if results else (None, None)
+        if not results and reverse:
+            self.has_next = False
+        return results
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, queryset):
+        """[(field, descending)] for the queryset ordering, ending with id"""
+        model = queryset.model
+        ordering = list(queryset.query.order_by) or list(model._meta.ordering)
+        fields = []
+        for item in ordering:
+            if not isinstance(item, str) or '__' in item or item.lstrip('-') == '?':
+                raise NotFound('Ordering not supported for cursor pagination')
+            name = item.lstrip('-')
+            if name == 'pk':
+                name = model._meta.pk.name
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                raise NotFound('Ordering not supported for cursor pagination')
+            fields.append((field, item.startswith('-')))
+        if not any(field.primary_key for field, _ in fields):
+            fields.append((model._meta.pk, False))
+        return fields
+
+    def order_expressions(self, reverse):
+        # Nulls sort last going forward and first when walking back. Only
+        # nullable columns get a NULLS clause: on the others it would stop
+        # the database from reading the order straight from an index.
+        nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+        expressions = []
+        for field, descending in self.ordering:
+            expression = F(field.name)
+            descending = descending != reverse
+            options = nulls if field.null else {}
+            expressions.append(expression.desc(**options) if descending else expression.asc(**options))
+        return expressions
+
+    def seek_filter(self, position, reverse):
+        """Rows strictly after `position` in the (possibly reversed) ordering"""
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (field, descending), value in zip(self.ordering, position):
+            descending = descending != reverse
+            condition |= equal & self._after(field, value, descending, nulls_last=not reverse)
+            equal &= Q(**{f'{field.name}__isnull': True}) if value is None else Q(**{field.name: value})
+        (field, descending), value = self.ordering[0], position[0]
+        return self._bound(field, value, descending != reverse, nulls_last=not reverse) & condition
+
+    @staticmethod
+    def _bound(field, value, descending, nulls_last):
+        """
+        Rows at or after `value` in the first ordering column. Implied by the
+        seek condition, but the OR alone gives the index no range start.
+        """
+        if value is None:
+            return Q(**{f'{field.name}__isnull': True}) if nulls_last else Q()
+        bound = Q(**{f"{field.name}__{'lte' if descending else 'gte'}": value})
+        if field.null and nulls_last:
+            bound |= Q(**{f'{field.name}__isnull': True})
+        return bound
+
+    @staticmethod
+    def _after(field, value, descending, nulls_last):
+        if value is None:
+            return Q(pk__in=[]) if nulls_last else Q(**{f'{field.name}__isnull': False})
+        after = Q(**{f"{field.name}__{'lt' if descending else 'gt'}": value})
+        if field.null and nulls_last:
+            after |= Q(**{f'{field.name}__isnull': True})
+        return after
+
+    def encode_cursor(self, obj, reverse):
+        position = [field.value_to_string(obj) if getattr(obj, field.attname) is not None else None
+                    for field, _ in self.ordering]
+        payload = {
+            'o': [('-' if descending else '') + field.name for field, descending in self.ordering],
+            'p': position,
+            'r': reverse,
+        }
+        token = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+        return replace_query_param(remove_query_param(self.base_url, self.cursor_query_param),
+                                   self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(parse.unquote(token).encode()))
+            ordering = [('-' if descending else '') + field.name for field, descending in self.ordering]
+            if payload['o'] != ordering or len(payload['p']) != len(self.ordering):
+                raise ValueError
+            position = [
+                None if value is None else field.to_python(value)
+                for (field, _), value in zip(self.ordering, payload['p'])
+            ]
+            return {'position': position, 'reverse': bool(payload.get('r'))}
+        except (binascii.Error, TypeError, KeyError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or self.last is None:
+            return None
+        return self.encode_cursor(self.last, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first is None:
+            return None
+        return self.encode_cursor(self.first, reverse=True)
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
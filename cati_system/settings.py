@@ -38,6 +38,7 @@ THIRD_PARTY_APPS = [
 ]
 
 LOCAL_APPS = [
+    'cati_system',
     'accounts',
     'contacts',
     'interviews',
@@ -46,6 +47,7 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    'cati_system.middleware.PerformanceMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -81,9 +83,32 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Seconds a writer waits for SQLite's database lock before failing with
+        # "database is locked" (see interviews.operations.lock_round)
+        'OPTIONS': {
+            'timeout': 20,
+        },
+        # A file rather than in-memory test database, so threaded tests share it
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
     }
 }
 
+# Cache
+# Use a shared backend (e.g. Redis/Memcached) in multi-process deployments so
+# invalidations reach every worker
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='cati-default'),
+    }
+}
+
+# Seconds a serialized question catalog page stays cached (entries are also
+# invalidated whenever a question changes)
+QUESTION_CATALOG_CACHE_TIMEOUT = config('QUESTION_CATALOG_CACHE_TIMEOUT', default=86400, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -119,7 +144,7 @@ AUTH_USER_MODEL = 'accounts.User'
 # DRF Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'accounts.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -129,6 +154,24 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# Token authentication cache (per process, revocations shared through CACHES)
+TOKEN_CACHE_MAX_SIZE = config('TOKEN_CACHE_MAX_SIZE', default=10000, cast=int)
+TOKEN_CACHE_TTL = config('TOKEN_CACHE_TTL', default=300, cast=int)
+
+# Request performance instrumentation (cati_system.middleware.PerformanceMiddleware)
+# Add Server-Timing headers with SQL/serializer/total time to every response
+SERVER_TIMING_HEADER = config('SERVER_TIMING_HEADER', default=True, cast=bool)
+# Time serializer.data per request for Server-Timing and /api/metrics. This wraps
+# BaseSerializer.data process-wide; when off, serializer time is reported as 0.
+SERIALIZER_TIMING = config('SERIALIZER_TIMING', default=True, cast=bool)
+# Log requests slower than this many milliseconds with their top SQL statements (0 disables)
+SLOW_REQUEST_MS = config('SLOW_REQUEST_MS', default=1000, cast=int)
+SLOW_REQUEST_TOP_SQL = config('SLOW_REQUEST_TOP_SQL', default=5, cast=int)
+# Seconds between publishing a process' metrics to the shared cache for /api/metrics
+METRICS_FLUSH_SECONDS = config('METRICS_FLUSH_SECONDS', default=15, cast=int)
+# Bearer token for Prometheus scrapes of /api/metrics (admins can always read it)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
 # Spectacular Settings
 SPECTACULAR_SETTINGS = {
     'TITLE': 'CATI System API',
@@ -137,6 +180,44 @@ SPECTACULAR_SETTINGS = {
     'SERVE_INCLUDE_SCHEMA': False,
 }
 
+# Interview round scheduler
+# Seconds between in-process activation passes for due rounds (0 disables it;
+# use the activate_due_rounds management command instead). The scheduler runs
+# in serving processes only, never in management commands.
+ROUND_SCHEDULER_INTERVAL = config('ROUND_SCHEDULER_INTERVAL', default=0, cast=int)
+
+# Seconds an interviewer keeps a round handed out by the dispatch queue
+DISPATCH_LEASE_SECONDS = config('DISPATCH_LEASE_SECONDS', default=900, cast=int)
+
+# Seconds during which a repeated autosave of the same interview position is not rewritten
+INTERVIEW_AUTOSAVE_COALESCE_SECONDS = config('INTERVIEW_AUTOSAVE_COALESCE_SECONDS', default=5, cast=int)
+
+# Days a fully completed contact must stay unchanged before archive_contacts moves it to the archive
+ARCHIVE_AFTER_DAYS = config('ARCHIVE_AFTER_DAYS', default=90, cast=int)
+
+# Delta sync: seconds of changes re-sent on each poll to catch late commits, and
+# days tombstones of deleted rows are kept (older cursors must sync from scratch)
+SYNC_WATERMARK_LAG_SECONDS = config('SYNC_WATERMARK_LAG_SECONDS', default=5, cast=int)
+SYNC_TOMBSTONE_RETENTION_DAYS = config('SYNC_TOMBSTONE_RETENTION_DAYS', default=30, cast=int)
+
+# Days the results of uploaded sync operations are kept to deduplicate client retries
+SYNC_IDEMPOTENCY_RETENTION_DAYS = config('SYNC_IDEMPOTENCY_RETENTION_DAYS', default=30, cast=int)
+
+# Interview round calendar
+# Holidays are ISO dates (YYYY-MM-DD); weekend days use Monday=0 ... Sunday=6.
+# ROUND_INTERVALS overrides the interval per round number, e.g. {3: {'months': 3}}
+ROUND_HOLIDAYS = config('ROUND_HOLIDAYS', default='', cast=Csv())
+ROUND_WEEKEND_DAYS = [5, 6]
+ROUND_INTERVAL_DAYS = config('ROUND_INTERVAL_DAYS', default=90, cast=int)
+ROUND_INTERVALS = {}
+
+# XForm form_data paths (dot-separated) copied into the indexed form field
+# table on submit; leave empty to extract every non-empty leaf
+XFORM_INDEXED_PATHS = config('XFORM_INDEXED_PATHS', default='', cast=Csv())
+
+# Country calling code assumed for local phone numbers when normalizing to E.164
+PHONE_DEFAULT_COUNTRY_CODE = config('PHONE_DEFAULT_COUNTRY_CODE', default='234')
+
 # CORS Settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
@@ -0,0 +1,119 @@
+"""
+Query-count budgets for the list and detail endpoints.
+
+Every endpoint is requested against two fixtures, one with 10 rows and one
+with 200 rows in each collection it reads. The test fails when the number of
+queries differs between the two (an N+1) or exceeds the budget declared for
+the view, and the failure message lists the captured SQL.
+"""
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+from accounts.authentication import token_cache
+from accounts.models import User
+from contacts.models import Contact
+from contacts.search import normalize_phone
+from interviews.catalog import bump_catalog_version
+from interviews.form_fields import extract_form_fields
+from interviews.models import Interview, InterviewRound, Question, Response
+
+
+def build_fixture(size):
+    """An admin owning `size` contacts, interviews, questions and answers"""
+    user = User.objects.create_user(username=f'budget-{size}', password='budget', role='admin')
+    token = Token.objects.create(user=user)
+
+    questions = Question.objects.bulk_create([
+        Question(text=f'Question {i}', type='text', stage=i % 4 + 1, order=i)
+        for i in range(size)
+    ])
+    bump_catalog_version()
+
+    contacts = Contact.objects.bulk_create([
+        Contact(name=f'Contact {i}', phone=f'0803{i:07d}', phone_key=normalize_phone(f'0803{i:07d}'),
+                location='Lagos', created_by=user)
+        for i in range(size)
+    ])
+    rounds = []
+    for contact in contacts:
+        rounds.extend(InterviewRound.build_rounds_for_contact(contact))
+    InterviewRound.objects.bulk_create(rounds)
+    first_rounds = {r.contact_id: r for r in rounds if r.round_number == 1}
+
+    interviews = Interview.objects.bulk_create([
+        Interview(contact=contact, interviewer=user, interview_round=first_rounds[contact.id],
+                  status='in_progress', form_data={'household': {'size': i % 7}, 'region': 'Lagos'})
+        for i, contact in enumerate(contacts)
+    ])
+    # The first interview answers every question, the others answer one
+    Response.objects.bulk_create(
+        [Response(interview=interviews[0], question=question, answer='yes') for question in questions]
+        + [Response(interview=interview, question=questions[0], answer='no') for interview in interviews[1:]]
+    )
+    extract_form_fields(interviews)
+
+    return {
+        'user': user,
+        'token': token.key,
+        'contact': contacts[0],
+        'interview': interviews[0],
+    }
+
+
+class QueryBudgetTestCase(TestCase):
+    """
+    Subclasses declare ENDPOINTS as (name, budget, path) where `path` maps a
+    fixture to the URL to GET. Caches are cleared before every request, so
+    the counts include authentication and cold-cache work.
+    """
+    SIZES = (10, 200)
+    ENDPOINTS = []
+
+    def measure(self, fixture, path):
+        cache.clear()
+        token_cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(
+                path(fixture), secure=True, HTTP_AUTHORIZATION=f"Token {fixture['token']}"
+            )
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertLess(response.status_code, 400, f'GET {path(fixture)} returned {response.status_code}')
+        return [query['sql'] for query in captured.captured_queries]
+
+    def measure_all(self):
+        results = {name: {} for name, _, _ in self.ENDPOINTS}
+        for size in self.SIZES:
+            with transaction.atomic():
+                fixture = build_fixture(size)
+                for name, _, path in self.ENDPOINTS:
+                    results[name][size] = self.measure(fixture, path)
+                transaction.set_rollback(True)
+        return results
+
+    @staticmethod
+    def format_queries(queries):
+        return '\n'.join(f'  {index}. {sql}' for index, sql in enumerate(queries, start=1))
+
+    def assertQueryBudget(self, name, budget, queries_by_size):
+        small, large = (queries_by_size[size] for size in self.SIZES)
+        if len(small) != len(large):
+            self.fail(
+                f'{name}: query count depends on row count '
+                f'({len(small)} queries for {self.SIZES[0]} rows, {len(large)} for {self.SIZES[1]} rows)\n'
+                f'Queries with {self.SIZES[1]} rows:\n{self.format_queries(large)}'
+            )
+        if len(large) > budget:
+            self.fail(
+                f'{name}: {len(large)} queries exceed the budget of {budget}\n'
+                f'{self.format_queries(large)}'
+            )
+
+    def test_query_budgets(self):
+        results = self.measure_all()
+        for name, budget, _ in self.ENDPOINTS:
+            with self.subTest(endpoint=name):
+                self.assertQueryBudget(name, budget, results[name])
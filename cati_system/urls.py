@@ -4,12 +4,17 @@ URL configuration for cati_system project.
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from .metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    path('api/metrics', metrics_view, name='metrics'),
     path('api/auth/', include('accounts.urls')),
     path('api/contacts/', include('contacts.urls')),
     path('api/interviews/', include('interviews.urls')),
+    # Async (ASGI) versions of the hot reads, see cati_system/async_api.py
+    path('api/async/auth/', include('accounts.async_urls')),
+    path('api/async/interviews/', include('interviews.async_urls')),
 ]
\ No newline at end of file
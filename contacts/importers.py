@@ -0,0 +1,220 @@
+import csv
+import json
+import time
+
+from django.core.exceptions import ValidationError
+from django.db import DataError, IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Contact
+from .search import normalize_phone
+
+
+class ImportStopped(Exception):
+    """The rest of the file cannot be read (e.g. it is not UTF-8 or the CSV is malformed)"""
+
+    def __init__(self, line_number, message):
+        super().__init__(message)
+        self.line_number = line_number
+        self.message = message
+
+
+class ContactImporter:
+    """
+    Streaming bulk import of contacts from CSV or NDJSON.
+
+    Rows are parsed lazily and written in chunks: every chunk bulk-creates its
+    contacts and their 4 interview rounds inside a single transaction, so a
+    chunk costs a handful of queries instead of ~6 per contact.
+    """
+    FORMATS = ['csv', 'ndjson']
+    FIELDS = [
+        'name', 'phone', 'serialNumber', 'cuid', 'ticketNumber',
+        'location', 'status', 'notes'
+    ]
+    UNIQUE_FIELDS = ['phone', 'serialNumber', 'cuid', 'ticketNumber']
+
+    def __init__(self, user, chunk_size=1000, max_errors=1000):
+        self.user = user
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+
+    @classmethod
+    def detect_format(cls, filename='', content_type=''):
+        """Guess the file format from its name or content type"""
+        filename = (filename or '').lower()
+        content_type = (content_type or '').lower()
+        if filename.endswith(('.ndjson', '.jsonl')) or 'ndjson' in content_type or 'jsonl' in content_type:
+            return 'ndjson'
+        if filename.endswith('.csv') or 'csv' in content_type:
+            return 'csv'
+        return None
+
+    def iter_rows(self, stream, file_format):
+        """
+        Yield (line_number, row dict or None, error) for every record in the
+        stream. Raises ImportStopped when the rest of a CSV file cannot be read.
+        """
+        if file_format not in self.FORMATS:
+            raise ValueError(f"Unsupported format: {file_format}")
+
+        if file_format == 'csv':
+            reader = csv.DictReader(self._decoded_lines(stream))
+            try:
+                for row in reader:
+                    yield reader.line_num, row, None
+            except UnicodeDecodeError:
+                raise ImportStopped(reader.line_num + 1, 'Line is not valid UTF-8; the rest of the file was not read')
+            except csv.Error as e:
+                raise ImportStopped(reader.line_num, f'Invalid CSV: {e}; the rest of the file was not read')
+            return
+
+        for line_number, raw in enumerate(stream, start=1):
+            try:
+                line = raw.decode('utf-8-sig' if line_number == 1 else 'utf-8')
+            except UnicodeDecodeError:
+                yield line_number, None, 'Line is not valid UTF-8'
+                continue
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(row, dict):
+                yield line_number, None, "Each line must be a JSON object"
+                continue
+            yield line_number, row, None
+
+    @staticmethod
+    def _decoded_lines(stream):
+        # Decoded line by line rather than through a TextIOWrapper, whose
+        # block-wise decoding cannot tell which line held an invalid byte
+        for index, raw in enumerate(stream):
+            yield raw.decode('utf-8-sig' if index == 0 else 'utf-8')
+
+    def run(self, stream, file_format):
+        """Import every row of the stream and return a report"""
+        report = {
+            'rows': 0,
+            'created': 0,
+            'failed': 0,
+            'errors': [],
+            'stopped': False,
+            'elapsed_seconds': 0.0,
+            'rows_per_second': 0.0,
+        }
+        started = time.monotonic()
+
+        chunk = []
+        try:
+            for line_number, row, error in self.iter_rows(stream, file_format):
+                report['rows'] += 1
+                if error:
+                    self._add_error(report, line_number, error)
+                    continue
+                chunk.append((line_number, row))
+                if len(chunk) >= self.chunk_size:
+                    self._import_chunk(chunk, report)
+                    chunk = []
+        except ImportStopped as e:
+            # Rows read before the unreadable part are still imported
+            report['stopped'] = True
+            self._add_error(report, e.line_number, e.message)
+        if chunk:
+            self._import_chunk(chunk, report)
+
+        elapsed = time.monotonic() - started
+        report['elapsed_seconds'] = round(elapsed, 3)
+        report['rows_per_second'] = round(report['rows'] / elapsed, 1) if elapsed else 0.0
+        return report
+
+    def build_contact(self, row):
+        """Validate a raw row and turn it into an unsaved Contact"""
+        data = {}
+        for field in self.FIELDS:
+            value = row.get(field)
+            if isinstance(value, str):
+                value = value.strip()
+            if value in (None, ''):
+                continue
+            data[field] = str(value)
+
+        contact = Contact(created_by=self.user, **data)
+        contact.status = Contact.normalize_status(contact.status)
+        contact.phone_key = normalize_phone(contact.phone)
+        contact.full_clean(exclude=['created_by'], validate_unique=False, validate_constraints=False)
+        return contact
+
+    def _unique_key(self, contact):
+        key = tuple(getattr(contact, field) for field in self.UNIQUE_FIELDS)
+        # NULLs never collide in the database unique index
+        return None if None in key else key
+
+    def _import_chunk(self, chunk, report):
+        contacts = []
+        seen = set()
+        for line_number, row in chunk:
+            try:
+                contact = self.build_contact(row)
+            except ValidationError as e:
+                self._add_error(report, line_number, e.message_dict)
+                continue
+            key = self._unique_key(contact)
+            if key is not None and key in seen:
+                self._add_error(report, line_number, 'Duplicate contact in file')
+                continue
+            if key is not None:
+                seen.add(key)
+            contacts.append((line_number, contact))
+
+        if seen:
+            existing = set(
+                Contact.objects.filter(phone__in={key[0] for key in seen})
+                .values_list(*self.UNIQUE_FIELDS)
+            )
+            duplicates = seen & existing
+            if duplicates:
+                remaining = []
+                for line_number, contact in contacts:
+                    if self._unique_key(contact) in duplicates:
+                        self._add_error(report, line_number, 'Contact already exists')
+                    else:
+                        remaining.append((line_number, contact))
+                contacts = remaining
+
+        if not contacts:
+            return
+
+        from interviews import counters
+        from interviews.models import InterviewRound
+
+        # All contacts of a chunk share the same schedule
+        schedule = InterviewRound.round_schedule(timezone.now())
+        try:
+            with transaction.atomic():
+                created = Contact.objects.bulk_create([contact for _, contact in contacts])
+                rounds = []
+                for contact in created:
+                    rounds.extend(InterviewRound.build_rounds_for_contact(contact, schedule))
+                InterviewRound.objects.bulk_create(rounds)
+
+                deltas = counters.new_deltas()
+                for contact in created:
+                    counters.transition(deltas, counters.CONTACT_STATUS, None, contact.status)
+                for interview_round in rounds:
+                    counters.transition(deltas, counters.ROUND_STATUS, None, interview_round.status)
+                counters.apply_deltas(deltas)
+        except (IntegrityError, DataError) as e:
+            # E.g. a concurrent import created one of these contacts first
+            for line_number, _ in contacts:
+                self._add_error(report, line_number, f'Failed to import chunk: {e}')
+            return
+
+        report['created'] += len(created)
+
+    def _add_error(self, report, line_number, error):
+        report['failed'] += 1
+        if len(report['errors']) < self.max_errors:
+            report['errors'].append({'line': line_number, 'errors': error})
@@ -0,0 +1,47 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from contacts.importers import ContactImporter
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Bulk import contacts (and their interview rounds) from a CSV or NDJSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to the CSV or NDJSON file')
+        parser.add_argument('--user', required=True, help='Username the contacts are created by')
+        parser.add_argument('--format', dest='file_format', choices=ContactImporter.FORMATS,
+                            help='File format (guessed from the extension by default)')
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Number of rows written per transaction')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist")
+
+        file_format = options['file_format'] or ContactImporter.detect_format(options['path'])
+        if not file_format:
+            raise CommandError('Could not detect the file format, pass --format')
+
+        importer = ContactImporter(user, chunk_size=max(1, options['chunk_size']))
+        try:
+            with open(options['path'], 'rb') as stream:
+                report = importer.run(stream, file_format)
+        except OSError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(json.dumps(report, indent=2, default=str))
+        if report['stopped']:
+            raise CommandError(
+                f"Stopped at an unreadable line after importing {report['created']} of {report['rows']} rows"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['created']} of {report['rows']} rows "
+            f"({report['rows_per_second']} rows/s)"
+        ))
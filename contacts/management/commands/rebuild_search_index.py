@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from contacts.models import Contact
+from contacts.search import FTS_TABLE, normalize_phone
+
+
+class Command(BaseCommand):
+    help = 'Recompute normalized phone keys and rebuild the contact search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of contacts updated per query')
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        updated = 0
+        batch = []
+        for contact in Contact.objects.only('id', 'phone', 'phone_key').iterator(chunk_size=batch_size):
+            phone_key = normalize_phone(contact.phone)
+            if phone_key != contact.phone_key:
+                contact.phone_key = phone_key
+                batch.append(contact)
+            if len(batch) >= batch_size:
+                updated += Contact.objects.bulk_update(batch, ['phone_key'])
+                batch = []
+        updated += Contact.objects.bulk_update(batch, ['phone_key'])
+
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+        self.stdout.write(self.style.SUCCESS(f'Updated {updated} phone keys and rebuilt the search index'))
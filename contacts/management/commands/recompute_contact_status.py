@@ -0,0 +1,65 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections, models
+
+
+def recompute_range(bounds, dry_run):
+    """Recompute the contacts with ids in [start, end); runs in a worker process"""
+    from contacts.models import Contact
+
+    start, end = bounds
+    try:
+        return Contact.recompute_statuses(
+            Contact.objects.filter(id__gte=start, id__lt=end), dry_run=dry_run
+        )
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Recompute every contact status from its interview rounds, in parallel over id ranges'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Number of worker processes (1 runs in this process)')
+        parser.add_argument('--chunk-size', type=int, default=5000,
+                            help='Width of the contact id range handled per task')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only print the status changes that would be written')
+
+    def handle(self, *args, **options):
+        from contacts.models import Contact
+
+        chunk_size = max(1, options['chunk_size'])
+        dry_run = options['dry_run']
+        bounds = Contact.objects.aggregate(low=models.Min('id'), high=models.Max('id'))
+        if bounds['low'] is None:
+            self.stdout.write('No contacts to recompute')
+            return
+        ranges = [
+            (start, start + chunk_size)
+            for start in range(bounds['low'], bounds['high'] + 1, chunk_size)
+        ]
+
+        if options['workers'] > 1:
+            # Children must not share the parent's database connections
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=options['workers'], initializer=django.setup) as pool:
+                results = pool.map(recompute_range, ranges, [dry_run] * len(ranges))
+                changed = self.report(results, dry_run)
+        else:
+            changed = self.report((recompute_range(r, dry_run) for r in ranges), dry_run)
+
+        verb = 'Would update' if dry_run else 'Updated'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {changed} contacts'))
+
+    def report(self, results, dry_run):
+        changed = 0
+        for changes in results:
+            changed += len(changes)
+            if dry_run:
+                for contact_id, old, new in changes:
+                    self.stdout.write(f'contact {contact_id}: {old} -> {new}')
+        return changed
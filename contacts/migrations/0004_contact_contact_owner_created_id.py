@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0003_alter_contact_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['created_by', '-created_at', 'id'], name='contact_owner_created_id'),
+        ),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:45
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copies of the search index definition and of the phone normalization
+# at the time of this migration; later changes to contacts.search must not
+# change what it does
+SEARCH_FIELDS = ['name', 'phone', 'serialNumber', 'cuid', 'ticketNumber', 'location']
+FTS_TABLE = 'contacts_contact_fts'
+SEARCH_DOCUMENT = " || ' ' || ".join(f'coalesce("contacts_contact"."{field}", \'\')' for field in SEARCH_FIELDS)
+COLUMNS = ', '.join(SEARCH_FIELDS)
+OLD_VALUES = ', '.join(f'old.{field}' for field in SEARCH_FIELDS)
+NEW_VALUES = ', '.join(f'new.{field}' for field in SEARCH_FIELDS)
+
+SEARCH_INDEX_SQL = {
+    'sqlite': [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+            {COLUMNS},
+            content='contacts_contact', content_rowid='id', tokenize='trigram'
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON contacts_contact BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {COLUMNS}) VALUES (new.id, {NEW_VALUES});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON contacts_contact BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD_VALUES});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON contacts_contact BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD_VALUES});
+            INSERT INTO {FTS_TABLE}(rowid, {COLUMNS}) VALUES (new.id, {NEW_VALUES});
+        END""",
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+    ],
+    'postgresql': [
+        'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+        f"CREATE INDEX IF NOT EXISTS contacts_contact_search_tsv ON contacts_contact "
+        f"USING GIN (to_tsvector('simple', {SEARCH_DOCUMENT}))",
+        f"CREATE INDEX IF NOT EXISTS contacts_contact_search_trgm ON contacts_contact "
+        f"USING GIN (({SEARCH_DOCUMENT}) gin_trgm_ops)",
+    ],
+}
+
+DROP_SEARCH_INDEX_SQL = {
+    'sqlite': [
+        f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+        f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+        f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+        f'DROP TABLE IF EXISTS {FTS_TABLE}',
+    ],
+    'postgresql': [
+        'DROP INDEX IF EXISTS contacts_contact_search_tsv',
+        'DROP INDEX IF EXISTS contacts_contact_search_trgm',
+    ],
+}
+
+
+def normalize_phone(raw):
+    """Phone number in E.164 (e.g. 0803 123 4567 -> +2348031234567)"""
+    if not raw:
+        return ''
+    country_code = getattr(settings, 'PHONE_DEFAULT_COUNTRY_CODE', '234')
+    raw = str(raw).strip()
+    digits = re.sub(r'\D', '', raw)
+    if not digits:
+        return ''
+    if raw.startswith('+'):
+        number = digits
+    elif digits.startswith('00'):
+        number = digits[2:]
+    elif digits.startswith('0'):
+        number = country_code + digits[1:]
+    elif digits.startswith(country_code) and len(digits) > 10:
+        number = digits
+    else:
+        number = country_code + digits
+    return f'+{number}'[:20]
+
+
+def backfill_phone_keys(apps, schema_editor):
+    Contact = apps.get_model('contacts', 'Contact')
+    batch = []
+    for contact in Contact.objects.only('id', 'phone').iterator(chunk_size=1000):
+        contact.phone_key = normalize_phone(contact.phone)
+        batch.append(contact)
+        if len(batch) >= 1000:
+            Contact.objects.bulk_update(batch, ['phone_key'])
+            batch = []
+    Contact.objects.bulk_update(batch, ['phone_key'])
+
+
+def forwards_search_index(apps, schema_editor):
+    for statement in SEARCH_INDEX_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def backwards_search_index(apps, schema_editor):
+    for statement in DROP_SEARCH_INDEX_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0004_contact_contact_owner_created_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contact',
+            name='phone_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Phone number normalized to E.164, used for caller-ID lookups', max_length=20),
+        ),
+        migrations.RunPython(backfill_phone_keys, migrations.RunPython.noop),
+        migrations.RunPython(forwards_search_index, backwards_search_index),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-17 01:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0005_contact_phone_key_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['created_by', 'updated_at', 'id'], name='contact_owner_updated_id'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations
+
+# Frozen copy of the search fields at the time of this migration
+SEARCH_FIELDS = ['name', 'phone', 'serialNumber', 'cuid', 'ticketNumber', 'location']
+FTS_TABLE = 'contacts_contact_fts'
+COLUMNS = ', '.join(SEARCH_FIELDS)
+TRIGGER_BODY = f"""BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {COLUMNS})
+        VALUES ('delete', old.id, {', '.join(f'old.{field}' for field in SEARCH_FIELDS)});
+        INSERT INTO {FTS_TABLE}(rowid, {COLUMNS})
+        VALUES (new.id, {', '.join(f'new.{field}' for field in SEARCH_FIELDS)});
+    END"""
+
+# Fires only when an indexed column changes, not on status or updated_at writes
+UPDATE_OF_SEARCH_FIELDS_TRIGGER_SQL = (
+    f'CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF {COLUMNS} ON contacts_contact {TRIGGER_BODY}'
+)
+UPDATE_TRIGGER_SQL = f'CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON contacts_contact {TRIGGER_BODY}'
+
+
+def replace_update_trigger(schema_editor, create_sql):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    if FTS_TABLE not in schema_editor.connection.introspection.table_names():
+        return
+    schema_editor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au')
+    schema_editor.execute(create_sql)
+
+
+def forwards_update_trigger(apps, schema_editor):
+    replace_update_trigger(schema_editor, UPDATE_OF_SEARCH_FIELDS_TRIGGER_SQL)
+
+
+def backwards_update_trigger(apps, schema_editor):
+    replace_update_trigger(schema_editor, UPDATE_TRIGGER_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0006_contact_owner_updated_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards_update_trigger, backwards_update_trigger),
+    ]
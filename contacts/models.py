@@ -1,10 +1,28 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from .search import normalize_phone
 
 User = get_user_model()
 
 
+class ContactQuerySet(models.QuerySet):
+    def with_interview_summary(self):
+        """Annotate interview counts and prefetch rounds so serializing a page costs a constant number of queries"""
+        from interviews.models import Interview
+
+        # A correlated subquery rather than Count('interviews'): the GROUP BY of
+        # a join would make the database sort every matching contact before
+        # the LIMIT, even when an index already yields the page order
+        interview_counts = Interview.objects.filter(contact=models.OuterRef('pk')).order_by().values(
+            'contact'
+        ).annotate(count=models.Count('id')).values('count')
+        return self.annotate(
+            num_interviews=Coalesce(models.Subquery(interview_counts), 0)
+        ).prefetch_related('interview_rounds')
+
+
 class Contact(models.Model):
     STATUS_CHOICES = [
         ('not_started', 'Not Started'),
@@ -23,6 +41,8 @@ class Contact(models.Model):
     
     name = models.CharField(max_length=255)
     phone = models.CharField(max_length=20)
+    phone_key = models.CharField(max_length=20, blank=True, default='', db_index=True, editable=False,
+                                 help_text='Phone number normalized to E.164, used for caller-ID lookups')
     serialNumber = models.CharField(max_length=100, blank=True, null=True)
     cuid = models.CharField(max_length=100, blank=True, null=True)
     ticketNumber = models.CharField(max_length=100, blank=True, null=True)
@@ -34,20 +54,43 @@ class Contact(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     last_contact = models.DateTimeField(null=True, blank=True)
 
+    objects = ContactQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         unique_together = ['phone', 'serialNumber', 'cuid', 'ticketNumber']
+        indexes = [
+            # Backs keyset pagination of a user's contact list
+            models.Index(fields=['created_by', '-created_at', 'id'], name='contact_owner_created_id'),
+            # Backs the delta sync feed (changes since a watermark)
+            models.Index(fields=['created_by', 'updated_at', 'id'], name='contact_owner_updated_id'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.phone})"
 
+    @staticmethod
+    def normalize_status(status):
+        """Map old status values to the new format"""
+        if status == 'not started':
+            return 'not_started'
+        if status in ['1', '2', '3', '4']:
+            return f'round_{status}'
+        return status
+
     @property
     def interview_count(self):
+        if hasattr(self, 'num_interviews'):
+            return self.num_interviews
         return self.interviews.count()
 
     @property
     def current_round(self):
         """Get the current active or pending interview round"""
+        if 'interview_rounds' in getattr(self, '_prefetched_objects_cache', {}):
+            # Use the prefetched rounds instead of issuing a query per contact
+            open_rounds = [r for r in self.interview_rounds.all() if r.status != 'completed']
+            return min(open_rounds, key=lambda r: r.round_number, default=None)
         return self.interview_rounds.exclude(status='completed').order_by('round_number').first()
 
     def initialize_interview_rounds(self):
@@ -55,34 +98,130 @@ class Contact(models.Model):
         from interviews.models import InterviewRound
         InterviewRound.create_rounds_for_contact(self)
 
+    @staticmethod
+    def derive_status(current_round_number, completed_rounds, status):
+        """Derive the contact status from its first open round and completed round count"""
+        if current_round_number is None:
+            # If no rounds exist or all rounds are completed
+            if completed_rounds == 4:
+                return 'completed'
+            elif completed_rounds == 0:
+                return 'not_started'
+            return status
+        # Set status based on current round
+        return f'round_{current_round_number}'
+
     def update_status_from_rounds(self):
         """Update contact status based on interview rounds"""
         current_round = self.current_round
-        
+        completed_rounds = 0
         if not current_round:
-            # If no rounds exist or all rounds are completed
             completed_rounds = self.interview_rounds.filter(status='completed').count()
-            if completed_rounds == 4:
-                self.status = 'completed'
-            elif completed_rounds == 0:
-                self.status = 'not_started'
-        else:
-            # Set status based on current round
-            self.status = f'round_{current_round.round_number}'
-        
+
+        self.status = self.derive_status(
+            current_round.round_number if current_round else None,
+            completed_rounds,
+            self.status
+        )
         self.save()
 
+    @classmethod
+    def bulk_update_status_from_rounds(cls, contact_ids):
+        """
+        Recompute the status of many contacts with one aggregate query over
+        their rounds and write only the changed ones with bulk_update.
+        Returns the number of contacts whose status changed.
+        """
+        contact_ids = list(contact_ids)
+        if not contact_ids:
+            return 0
+        return len(cls.recompute_statuses(cls.objects.filter(id__in=contact_ids)))
+
+    @classmethod
+    def recompute_statuses(cls, contacts, dry_run=False):
+        """
+        Derive the status of every contact in the `contacts` queryset from one
+        GROUP BY over their rounds and bulk_update the ones that drifted.
+        Returns [(contact_id, old_status, new_status)] for the changes; with
+        `dry_run` nothing is written.
+        """
+        from interviews import counters
+        from interviews.models import InterviewRound
+
+        summaries = {
+            row['contact_id']: row
+            for row in InterviewRound.objects.filter(contact__in=contacts.values('id'))
+            .order_by()
+            .values('contact_id')
+            .annotate(
+                current_round_number=models.Min('round_number', filter=~models.Q(status='completed')),
+                completed_rounds=models.Count('id', filter=models.Q(status='completed')),
+            )
+        }
+
+        now = timezone.now()
+        changes = []
+        changed = []
+        deltas = counters.new_deltas()
+        for contact in contacts.order_by('id').only('id', 'status'):
+            summary = summaries.get(contact.id, {})
+            status = cls.derive_status(
+                summary.get('current_round_number'),
+                summary.get('completed_rounds', 0),
+                contact.status
+            )
+            if status != contact.status:
+                changes.append((contact.id, contact.status, status))
+                counters.transition(deltas, counters.CONTACT_STATUS, contact.status, status)
+                contact.status = status
+                contact.updated_at = now
+                changed.append(contact)
+
+        if changed and not dry_run:
+            with transaction.atomic():
+                cls.objects.bulk_update(changed, ['status', 'updated_at'], batch_size=500)
+                counters.apply_deltas(deltas)
+        return changes
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so save() can update the dashboard counters
+        instance._loaded_status = instance.__dict__.get('status')
+        instance._loaded_owner = instance.__dict__.get('created_by_id')
+        return instance
+
     def save(self, *args, **kwargs):
+        from interviews import counters
+
         is_new = self.pk is None
+        update_fields = kwargs.get('update_fields')
+        old_status = getattr(self, '_loaded_status', None)
+        track_status = is_new or (
+            old_status is not None and (update_fields is None or 'status' in update_fields)
+        )
+        old_owner = getattr(self, '_loaded_owner', None)
+        owner_changed = not is_new and old_owner is not None and old_owner != self.created_by_id and (
+            update_fields is None or 'created_by' in update_fields
+        )
         
         # Normalize old status values to new format
-        if self.status == 'not started':
-            self.status = 'not_started'
-        elif self.status in ['1', '2', '3', '4']:
-            self.status = f'round_{self.status}'
-        
-        super().save(*args, **kwargs)
+        self.status = self.normalize_status(self.status)
+        self.phone_key = normalize_phone(self.phone)
         
-        if is_new:
-            # Initialize interview rounds for new contacts
-            self.initialize_interview_rounds()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            
+            if is_new:
+                # Initialize interview rounds for new contacts
+                self.initialize_interview_rounds()
+            elif owner_changed:
+                # Rounds carry a copy of the owner for the delta sync feed
+                self.interview_rounds.update(owner_id=self.created_by_id, updated_at=timezone.now())
+            
+            if track_status:
+                counters.apply_deltas(counters.transition(
+                    counters.new_deltas(), counters.CONTACT_STATUS, old_status, self.status
+                ))
+        self._loaded_status = self.status
+        self._loaded_owner = self.created_by_id
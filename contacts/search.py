@@ -0,0 +1,120 @@
+"""
+Index-backed contact search.
+
+Search terms keep the semantics of DRF's SearchFilter (every term must
+match, as a case-insensitive substring, one of the searchable fields), but
+are answered from an index instead of six ORed LIKE scans:
+
+* SQLite: an FTS5 table with the trigram tokenizer, kept in sync by triggers
+  (so bulk inserts, updates and deletes are covered too).
+* PostgreSQL: GIN indexes on a tsvector and a pg_trgm expression over the
+  same fields.
+* Anything else falls back to icontains lookups.
+
+Phone-like terms additionally match the normalized `Contact.phone_key`.
+The indexes and triggers are created by contacts migrations 0005 and 0007.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+SEARCH_FIELDS = ['name', 'phone', 'serialNumber', 'cuid', 'ticketNumber', 'location']
+FTS_TABLE = 'contacts_contact_fts'
+# Trigram matching needs at least 3 characters
+MIN_INDEXED_TERM_LENGTH = 3
+
+PHONE_LIKE = re.compile(r'\+?[\d\s\-().]{7,}')
+
+
+def normalize_phone(raw, country_code=None):
+    """Normalize a phone number to E.164 (e.g. 0803 123 4567 -> +2348031234567)"""
+    if not raw:
+        return ''
+    country_code = country_code or getattr(settings, 'PHONE_DEFAULT_COUNTRY_CODE', '234')
+    raw = str(raw).strip()
+    digits = re.sub(r'\D', '', raw)
+    if not digits:
+        return ''
+    if raw.startswith('+'):
+        number = digits
+    elif digits.startswith('00'):
+        number = digits[2:]
+    elif digits.startswith('0'):
+        number = country_code + digits[1:]
+    elif digits.startswith(country_code) and len(digits) > 10:
+        number = digits
+    else:
+        number = country_code + digits
+    return f'+{number}'[:20]
+
+
+def is_phone_like(term):
+    return bool(PHONE_LIKE.fullmatch(term))
+
+
+def search_document_sql(table='contacts_contact'):
+    """SQL expression concatenating the searchable columns (must match the index)"""
+    return " || ' ' || ".join(f'coalesce("{table}"."{field}", \'\')' for field in SEARCH_FIELDS)
+
+
+class LikeSearchBackend:
+    """Fallback: icontains over every searchable field"""
+
+    def term_condition(self, term):
+        condition = Q()
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f'{field}__icontains': term})
+        return condition
+
+    def search(self, queryset, terms):
+        for term in terms:
+            condition = self.term_condition(term)
+            if is_phone_like(term):
+                condition |= Q(phone_key=normalize_phone(term))
+            queryset = queryset.filter(condition)
+        return queryset
+
+
+class SQLiteFTSBackend(LikeSearchBackend):
+    def term_condition(self, term):
+        if len(term) < MIN_INDEXED_TERM_LENGTH:
+            return super().term_condition(term)
+        match = '"{}"'.format(term.replace('"', '""'))
+        return Q(id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match]
+        ))
+
+
+class PostgresSearchBackend(LikeSearchBackend):
+    def term_condition(self, term):
+        document = search_document_sql()
+        like = '%{}%'.format(term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_'))
+        sql = f'({document}) ILIKE %s'
+        params = [like]
+        words = re.findall(r'\w+', term)
+        if words:
+            sql = f"to_tsvector('simple', {document}) @@ to_tsquery('simple', %s) OR {sql}"
+            params.insert(0, ' & '.join(f'{word}:*' for word in words))
+        return Q(RawSQL(f'({sql})', params, output_field=BooleanField()))
+
+
+def get_search_backend():
+    if connection.vendor == 'sqlite':
+        return SQLiteFTSBackend()
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend()
+    return LikeSearchBackend()
+
+
+class ContactSearchFilter(filters.SearchFilter):
+    """SearchFilter that answers `?search=` from the contact search index"""
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return get_search_backend().search(queryset, terms)
@@ -16,27 +16,26 @@ class ContactSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'interview_count']
 
+    @staticmethod
+    def round_summary(round):
+        return {
+            'id': round.id,
+            'round_number': round.round_number,
+            'status': round.status,
+            'scheduled_at': round.scheduled_at,
+            'can_start_interview': round.can_start_interview()
+        }
+
     def get_current_round(self, obj):
         current_round = obj.current_round
         if current_round:
-            return {
-                'id': current_round.id,
-                'round_number': current_round.round_number,
-                'status': current_round.status,
-                'scheduled_at': current_round.scheduled_at,
-                'can_start_interview': current_round.can_start_interview()
-            }
+            return self.round_summary(current_round)
         return None
 
     def get_interview_rounds(self, obj):
+        # Uses the prefetched rounds when the queryset comes from with_interview_summary()
         rounds = obj.interview_rounds.all()
-        return [{
-            'id': round.id,
-            'round_number': round.round_number,
-            'status': round.status,
-            'scheduled_at': round.scheduled_at,
-            'can_start_interview': round.can_start_interview()
-        } for round in rounds]
+        return [self.round_summary(round) for round in rounds]
 
     def create(self, validated_data):
         validated_data['created_by'] = self.context['request'].user
@@ -0,0 +1,191 @@
+import io
+import json
+
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from cati_system import testing
+from cati_system.pagination import KeysetPagination
+from contacts.importers import ContactImporter
+from contacts.models import Contact
+from contacts.search import normalize_phone
+from interviews.models import InterviewRound
+
+
+class ContactQueryBudgetTests(testing.QueryBudgetTestCase):
+    ENDPOINTS = [
+        ('contact-list', 3, lambda f: '/api/contacts/'),
+        ('contact-list-search', 3, lambda f: '/api/contacts/?search=Contact'),
+        ('contact-list-ordering', 3, lambda f: '/api/contacts/?ordering=name&status=not_started'),
+        ('contact-list-page', 4, lambda f: '/api/contacts/?page=1'),
+        ('contact-detail', 3, lambda f: f"/api/contacts/{f['contact'].id}/"),
+        ('contact-phone-lookup', 3, lambda f: f"/api/contacts/lookup/?phone={f['contact'].phone}"),
+    ]
+
+
+class ContactPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='pager', password='pager', role='interviewer')
+        self.auth = f'Token {Token.objects.create(user=self.user).key}'
+        moment = timezone.now() - timedelta(days=1)
+        last_contacts = [None, moment, None, moment, moment + timedelta(hours=1), None, moment]
+        for index, last_contact in enumerate(last_contacts):
+            Contact.objects.create(name=f'Contact {index % 3}', phone=f'0803400000{index}',
+                                   last_contact=last_contact, created_by=self.user)
+        # Every contact created at the same moment, so created_at order is decided by id alone
+        Contact.objects.filter(created_by=self.user).update(created_at=moment)
+
+    def get(self, url):
+        response = self.client.get(url, HTTP_AUTHORIZATION=self.auth, secure=True)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def walk(self, url):
+        """Ids of every page following `next`, then of every page following `previous` back"""
+        forward = []
+        page = self.get(url)
+        while True:
+            forward.append([contact['id'] for contact in page['results']])
+            if page['next'] is None:
+                break
+            page = self.get(page['next'])
+        backward = [[contact['id'] for contact in page['results']]]
+        while page['previous'] is not None:
+            page = self.get(page['previous'])
+            backward.append([contact['id'] for contact in page['results']])
+        return forward, backward[::-1]
+
+    def assert_pages(self, ordering, expected):
+        forward, backward = self.walk(f'/api/contacts/?page_size=2&ordering={ordering}')
+        self.assertEqual([contact_id for page in forward for contact_id in page], expected)
+        self.assertEqual(backward, forward)
+        self.assertEqual(len(forward), 4)
+
+    def test_pages_cover_ties_in_both_directions(self):
+        contacts = list(Contact.objects.filter(created_by=self.user))
+        by_id = sorted(contacts, key=lambda contact: contact.id)
+        self.assert_pages('name', [c.id for c in sorted(by_id, key=lambda contact: contact.name)])
+        self.assert_pages('-name', [c.id for c in sorted(by_id, key=lambda contact: contact.name, reverse=True)])
+        self.assert_pages('-created_at', [c.id for c in by_id])
+
+    def test_nulls_sort_last(self):
+        contacts = sorted(Contact.objects.filter(created_by=self.user), key=lambda contact: contact.id)
+        dated = sorted((c for c in contacts if c.last_contact), key=lambda contact: contact.last_contact)
+        undated = [c for c in contacts if c.last_contact is None]
+        self.assert_pages('last_contact', [c.id for c in dated + undated])
+        self.assert_pages('-last_contact', [c.id for c in sorted(dated, key=lambda contact: contact.last_contact,
+                                                                   reverse=True) + undated])
+
+    def page_query(self, ordering, position):
+        paginator = KeysetPagination()
+        queryset = Contact.objects.filter(created_by=self.user).with_interview_summary().order_by(ordering)
+        paginator.ordering = paginator.get_ordering(queryset)
+        return queryset.order_by(*paginator.order_expressions(False)).filter(
+            paginator.seek_filter(position, False)
+        )[:50]
+
+    def test_nulls_clauses_only_for_nullable_columns(self):
+        moment = timezone.now()
+        self.assertNotIn('NULLS', str(self.page_query('-created_at', [moment, 1]).query))
+        self.assertIn('NULLS LAST', str(self.page_query('last_contact', [moment, 1]).query))
+
+    @skipUnless(connection.vendor == 'sqlite', 'checks the SQLite query plan')
+    def test_deep_page_seeks_on_the_index_without_sorting(self):
+        plan = self.page_query('-created_at', [timezone.now(), 1]).explain()
+        self.assertIn('INDEX contact_owner_created_id (created_by_id=? AND created_at<?)', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_invalid_cursor_is_not_found(self):
+        page = self.get('/api/contacts/?page_size=2&ordering=name')
+        for url in ['/api/contacts/?cursor=not-a-cursor', page['next']]:
+            response = self.client.get(url.replace('ordering=name', 'ordering=-name'),
+                                       HTTP_AUTHORIZATION=self.auth, secure=True)
+            self.assertEqual(response.status_code, 404)
+
+
+class ContactImportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='importer', password='importer', role='admin')
+        Contact.objects.create(name='Existing', phone='08030000001', serialNumber='SN1', cuid='CU1',
+                               ticketNumber='TK1', created_by=self.user)
+
+    def run_import(self, text, file_format, chunk_size=2):
+        data = text if isinstance(text, bytes) else text.encode()
+        return ContactImporter(self.user, chunk_size=chunk_size).run(io.BytesIO(data), file_format)
+
+    def test_csv_rows_are_created_with_their_rounds(self):
+        report = self.run_import(
+            'name,phone,location\n'
+            'Ada,08031000001,Lagos\n'
+            'Bola,08031000002,Abuja\n'
+            'Chidi,08031000003,Kano\n',
+            'csv'
+        )
+        self.assertEqual((report['rows'], report['created'], report['failed']), (3, 3, 0))
+        imported = Contact.objects.filter(name__in=['Ada', 'Bola', 'Chidi'])
+        self.assertEqual(imported.count(), 3)
+        self.assertEqual(InterviewRound.objects.filter(contact__in=imported).count(), 12)
+        self.assertEqual(imported.get(name='Ada').phone_key, normalize_phone('08031000001'))
+
+    def test_invalid_rows_are_rejected_and_reported_by_line(self):
+        report = self.run_import('\n'.join([
+            json.dumps({'name': 'Valid', 'phone': '08032000001'}),
+            '{not json',
+            '["not", "an", "object"]',
+            json.dumps({'phone': '08032000002'}),
+            json.dumps({'name': 'Bad status', 'phone': '08032000003', 'status': 'round_9'}),
+            json.dumps({'name': 'Twice', 'phone': '08032000004', 'serialNumber': 'S', 'cuid': 'C', 'ticketNumber': 'T'}),
+            json.dumps({'name': 'Twice', 'phone': '08032000004', 'serialNumber': 'S', 'cuid': 'C', 'ticketNumber': 'T'}),
+            json.dumps({'name': 'Existing', 'phone': '08030000001', 'serialNumber': 'SN1', 'cuid': 'CU1',
+                        'ticketNumber': 'TK1'}),
+        ]), 'ndjson', chunk_size=10)
+
+        self.assertEqual((report['rows'], report['created'], report['failed']), (8, 2, 6))
+        errors = {error['line']: error['errors'] for error in report['errors']}
+        self.assertEqual(sorted(errors), [2, 3, 4, 5, 7, 8])
+        self.assertIn('name', errors[4])
+        self.assertEqual(errors[7], 'Duplicate contact in file')
+        self.assertEqual(errors[8], 'Contact already exists')
+        self.assertEqual(Contact.objects.filter(name='Twice').count(), 1)
+
+    def test_undecodable_csv_stops_after_importing_the_rows_before_it(self):
+        report = self.run_import(
+            b'name,phone,location\n'
+            b'Ada,08033000001,Lagos\n'
+            b'Bola,08033000002,Abuja\n'
+            b'Chidi,08033000003,Kano\n'
+            b'Dayo,08033000004,Ibadan\xe9\n'
+            b'Emeka,08033000005,Enugu\n',
+            'csv'
+        )
+        self.assertTrue(report['stopped'])
+        self.assertEqual((report['rows'], report['created'], report['failed']), (3, 3, 1))
+        self.assertEqual(report['errors'][0]['line'], 5)
+        self.assertEqual(Contact.objects.filter(name__in=['Ada', 'Bola', 'Chidi', 'Dayo', 'Emeka']).count(), 3)
+
+    def test_undecodable_ndjson_line_is_rejected_alone(self):
+        report = self.run_import(
+            json.dumps({'name': 'Fola', 'phone': '08033000006'}).encode() + b'\n'
+            + '{"name": "G\u00e9", "phone": "08033000007"}\n'.encode('latin-1')
+            + json.dumps({'name': 'Hauwa', 'phone': '08033000008'}).encode() + b'\n',
+            'ndjson'
+        )
+        self.assertFalse(report['stopped'])
+        self.assertEqual((report['rows'], report['created'], report['failed']), (3, 2, 1))
+        self.assertEqual(report['errors'], [{'line': 2, 'errors': 'Line is not valid UTF-8'}])
+
+    def test_import_endpoint_reports_a_stopped_import_as_bad_request(self):
+        upload = io.BytesIO(b'name,phone\nIfe,08033000009\nJide\xe9,08033000010\n')
+        upload.name = 'contacts.csv'
+        response = self.client.post(
+            '/api/contacts/import/', {'file': upload}, secure=True,
+            HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual((response.json()['created'], response.json()['failed']), (1, 1))
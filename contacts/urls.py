@@ -4,4 +4,6 @@ from . import views
 urlpatterns = [
     path('', views.ContactListCreateView.as_view(), name='contact-list-create'),
     path('<int:pk>/', views.ContactRetrieveUpdateDestroyView.as_view(), name='contact-detail'),
+    path('import/', views.ContactImportView.as_view(), name='contact-import'),
+    path('lookup/', views.ContactPhoneLookupView.as_view(), name='contact-phone-lookup'),
 ]
\ No newline at end of file
@@ -1,21 +1,44 @@
-from rest_framework import generics, filters
+from rest_framework import generics, filters, status
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
+from cati_system.pagination import KeysetPagination
+from .importers import ContactImporter
 from .models import Contact
+from .search import ContactSearchFilter, normalize_phone
 from .serializers import ContactSerializer
 
 
 class ContactListCreateView(generics.ListCreateAPIView):
     serializer_class = ContactSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend, ContactSearchFilter, filters.OrderingFilter]
     filterset_fields = ['status']
     search_fields = ['name', 'phone', 'serialNumber', 'cuid', 'ticketNumber', 'location']
     ordering_fields = ['created_at', 'name', 'last_contact']
     ordering = ['-created_at']
 
     def get_queryset(self):
-        return Contact.objects.filter(created_by=self.request.user)
+        return Contact.objects.filter(created_by=self.request.user).with_interview_summary()
+
+
+class ContactPhoneLookupView(generics.ListAPIView):
+    """Caller-ID lookup: contacts whose normalized phone matches `?phone=`"""
+    serializer_class = ContactSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+
+    def get_queryset(self):
+        phone_key = normalize_phone(self.request.query_params.get('phone', ''))
+        if not phone_key:
+            return Contact.objects.none()
+        return Contact.objects.filter(
+            created_by=self.request.user,
+            phone_key=phone_key
+        ).with_interview_summary()
 
 
 class ContactRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
@@ -23,4 +46,46 @@ class ContactRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Contact.objects.filter(created_by=self.request.user)
\ No newline at end of file
+        return Contact.objects.filter(created_by=self.request.user).with_interview_summary()
+
+
+class ContactImportView(APIView):
+    """
+    Bulk import contacts from an uploaded CSV or NDJSON file.
+
+    Expects a multipart upload with a `file` field. The format is taken from
+    the optional `file_type` field (csv/ndjson) or guessed from the file name.
+    The file must be UTF-8. A CSV file that cannot be read to the end returns
+    400 with the report of the rows imported before the unreadable line.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response(
+                {'error': 'file is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        file_format = request.data.get('file_type') or ContactImporter.detect_format(
+            upload.name, upload.content_type
+        )
+        if file_format not in ContactImporter.FORMATS:
+            return Response(
+                {'error': f"file_type must be one of: {', '.join(ContactImporter.FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            chunk_size = int(request.data.get('chunk_size', 1000))
+        except (TypeError, ValueError):
+            chunk_size = 1000
+
+        importer = ContactImporter(request.user, chunk_size=max(1, min(chunk_size, 5000)))
+        report = importer.run(upload, file_format)
+        if report['stopped']:
+            # Rows before the unreadable part were imported; the report says which failed
+            return Response(report, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_201_CREATED if report['created'] else status.HTTP_200_OK)
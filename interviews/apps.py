@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class InterviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'interviews'
\ No newline at end of file
+    name = 'interviews'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        interval = getattr(settings, 'ROUND_SCHEDULER_INTERVAL', 0)
+        if interval > 0:
+            from .scheduler import is_serving_process, start_scheduler
+            if is_serving_process():
+                start_scheduler(interval)
@@ -0,0 +1,218 @@
+"""
+Archival of fully completed contacts.
+
+A contact whose four rounds are completed, with no open interview and
+nothing changed for ARCHIVE_AFTER_DAYS, is moved out of the hot tables:
+the contact, its rounds, interviews, responses and extracted form values
+are serialized into one zlib-compressed JSON document stored in an
+ArchivedContact row, and the originals are deleted in the same transaction.
+Restoring re-inserts the graph with its original ids and creation times.
+"""
+import json
+import zlib
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+
+from contacts.models import Contact
+from . import counters, sync
+from .models import ArchivedContact, FormFieldValue, Interview, InterviewRound, Response
+
+# Insert order on restore; every model references one before it
+ARCHIVED_MODELS = [Contact, InterviewRound, Interview, Response, FormFieldValue]
+DOCUMENT_VERSION = 1
+
+
+class RestoreError(Exception):
+    """An archived contact cannot be put back (e.g. it conflicts with live rows)"""
+
+
+class ArchiveJSONEncoder(DjangoJSONEncoder):
+    """Keeps the microseconds DjangoJSONEncoder drops, so timestamps restore exactly"""
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def archive_cutoff(older_than_days=None):
+    if older_than_days is None:
+        older_than_days = getattr(settings, 'ARCHIVE_AFTER_DAYS', 90)
+    return timezone.now() - timedelta(days=older_than_days)
+
+
+def eligible_contacts(cutoff):
+    """Completed contacts with 4 completed rounds and no interview open or touched since `cutoff`"""
+    recent_or_open = Interview.objects.filter(contact=models.OuterRef('pk')).filter(
+        models.Q(status__in=['in_progress', 'paused']) | models.Q(updated_at__gte=cutoff)
+    )
+    return Contact.objects.filter(status='completed', updated_at__lt=cutoff).annotate(
+        total_rounds=models.Count('interview_rounds'),
+        completed_rounds=models.Count(
+            'interview_rounds', filter=models.Q(interview_rounds__status='completed')
+        ),
+    ).filter(total_rounds=4, completed_rounds=4).exclude(models.Exists(recent_or_open))
+
+
+def build_documents(contact_ids):
+    """{contact_id: [serialized records]} for the whole graph of each contact"""
+    records = defaultdict(list)
+    contacts = Contact.objects.filter(id__in=contact_ids).order_by('id')
+    for record in serializers.serialize('python', contacts):
+        records[record['pk']].append(record)
+    for record in serializers.serialize('python', InterviewRound.objects.filter(contact_id__in=contact_ids)):
+        records[record['fields']['contact']].append(record)
+
+    interview_contacts = {}
+    for record in serializers.serialize('python', Interview.objects.filter(contact_id__in=contact_ids)):
+        interview_contacts[record['pk']] = record['fields']['contact']
+        records[record['fields']['contact']].append(record)
+    for model in (Response, FormFieldValue):
+        queryset = model.objects.filter(interview__contact_id__in=contact_ids)
+        for record in serializers.serialize('python', queryset):
+            records[interview_contacts[record['fields']['interview']]].append(record)
+    return records
+
+
+def encode_document(records):
+    document = {'version': DOCUMENT_VERSION, 'records': records}
+    return zlib.compress(json.dumps(document, cls=ArchiveJSONEncoder).encode())
+
+
+def decode_document(payload):
+    return json.loads(zlib.decompress(bytes(payload)))
+
+
+def archive_batch(contact_ids, cutoff):
+    """
+    Archive the contacts among `contact_ids` that are still eligible and
+    return their ids. Everything happens in one transaction.
+    """
+    with transaction.atomic():
+        # Lock the rows first; eligibility is re-checked under the lock
+        locked = list(Contact.objects.select_for_update().filter(id__in=contact_ids).values_list('id', flat=True))
+        ids = list(eligible_contacts(cutoff).filter(id__in=locked).values_list('id', flat=True))
+        if not ids:
+            return []
+
+        documents = build_documents(ids)
+        archives = []
+        for contact_record in (records[0] for records in documents.values()):
+            fields = contact_record['fields']
+            completed = [
+                record['fields']['completed_at'] for record in documents[contact_record['pk']]
+                if record['model'] == 'interviews.interview' and record['fields']['completed_at']
+            ]
+            archives.append(ArchivedContact(
+                contact_id=contact_record['pk'],
+                created_by_id=fields['created_by'],
+                name=fields['name'],
+                phone_key=fields['phone_key'],
+                completed_at=max(completed, default=None),
+                payload=encode_document(documents[contact_record['pk']]),
+            ))
+        ArchivedContact.objects.bulk_create(archives)
+
+        # The delete cascades to the whole graph; the post_delete counter
+        # updates and sync tombstones are written once for the batch
+        with counters.batched(), sync.batched():
+            Contact.objects.filter(id__in=ids).delete()
+    return ids
+
+
+def archive_contacts(batch_size=500, older_than_days=None, dry_run=False):
+    """Archive every eligible contact in batches. Returns the number archived (or eligible with dry_run)."""
+    cutoff = archive_cutoff(older_than_days)
+    candidates = list(eligible_contacts(cutoff).order_by('id').values_list('id', flat=True))
+    if dry_run:
+        return len(candidates)
+
+    archived = 0
+    for start in range(0, len(candidates), batch_size):
+        archived += len(archive_batch(candidates[start:start + batch_size], cutoff))
+    return archived
+
+
+def restore_contacts(contact_ids):
+    """
+    Re-insert archived contacts with their original ids and creation
+    timestamps and delete the archive rows. Returns the restored contact ids.
+    """
+    try:
+        with transaction.atomic():
+            archives = list(ArchivedContact.objects.select_for_update().filter(contact_id__in=contact_ids))
+            if not archives:
+                return []
+
+            objects = defaultdict(list)
+            for archive in archives:
+                records = decode_document(archive.payload)['records']
+                for deserialized in serializers.deserialize('python', records):
+                    objects[type(deserialized.object)].append(deserialized.object)
+
+            # Documents archived before rounds carried their owner
+            owners = {contact.id: contact.created_by_id for contact in objects[Contact]}
+            for interview_round in objects[InterviewRound]:
+                if interview_round.owner_id is None:
+                    interview_round.owner_id = owners[interview_round.contact_id]
+
+            deltas = counters.new_deltas()
+            for model in ARCHIVED_MODELS:
+                instances = objects[model]
+                # bulk_create stamps auto_now_add fields with the current time, so
+                # the archived values are written back afterwards. updated_at keeps
+                # the restore time so delta sync clients fetch the rows again.
+                timestamp_fields = [
+                    field.attname for field in model._meta.concrete_fields
+                    if getattr(field, 'auto_now_add', False)
+                ]
+                timestamps = [[getattr(obj, name) for name in timestamp_fields] for obj in instances]
+                model.objects.bulk_create(instances)
+                for obj, values in zip(instances, timestamps):
+                    for name, value in zip(timestamp_fields, values):
+                        setattr(obj, name, value)
+                if timestamp_fields:
+                    model.objects.bulk_update(instances, timestamp_fields, batch_size=500)
+
+            for contact in objects[Contact]:
+                counters.transition(deltas, counters.CONTACT_STATUS, None, contact.status)
+            for interview_round in objects[InterviewRound]:
+                counters.transition(deltas, counters.ROUND_STATUS, None, interview_round.status)
+            for interview in objects[Interview]:
+                if interview.status == 'completed':
+                    deltas[(counters.INTERVIEWS_COMPLETED, counters.completion_key(interview.completed_at))] += 1
+            counters.apply_deltas(deltas)
+
+            ArchivedContact.objects.filter(id__in=[archive.id for archive in archives]).delete()
+    except IntegrityError as exc:
+        raise RestoreError(f'Archived contacts conflict with existing data: {exc}') from exc
+    return [archive.contact_id for archive in archives]
+
+
+def archived_document(archive):
+    """The archived graph grouped by model, as {id, **fields} records"""
+    groups = {
+        'interviews.interviewround': 'interview_rounds',
+        'interviews.interview': 'interviews',
+        'interviews.response': 'responses',
+        'interviews.formfieldvalue': 'form_values',
+    }
+    document = {
+        'contact_id': archive.contact_id,
+        'archived_at': archive.archived_at,
+        'contact': None,
+        **{name: [] for name in groups.values()},
+    }
+    for record in decode_document(archive.payload)['records']:
+        item = {'id': record['pk'], **record['fields']}
+        if record['model'] == 'contacts.contact':
+            document['contact'] = item
+        else:
+            document[groups[record['model']]].append(item)
+    return document
@@ -0,0 +1,8 @@
+from django.urls import path
+from . import async_views
+
+urlpatterns = [
+    path('<int:pk>/', async_views.interview_detail, name='async-interview-detail'),
+    path('questions/', async_views.question_catalog, name='async-question-list'),
+    path('contact/<int:contact_id>/rounds/', async_views.contact_rounds, name='async-contact-interview-rounds'),
+]
@@ -0,0 +1,79 @@
+"""
+Async counterparts of the hottest interview reads, served under /api/async/
+(see cati_system/async_api.py). Payloads match the synchronous views.
+"""
+from asgiref.sync import sync_to_async
+from django.db import models
+from django_filters import utils as filter_utils
+from django_filters.filterset import filterset_factory
+from rest_framework import exceptions, status
+
+from cati_system.async_api import apaginate, async_api_view, render
+from contacts.models import Contact
+from .catalog import (
+    aget_cached_catalog, aget_catalog_version, aset_cached_catalog, catalog_etag,
+    catalog_fingerprint
+)
+from .models import Interview, Question
+from .serializers import InterviewRoundSerializer, InterviewSerializer, QuestionSerializer
+
+QuestionFilterSet = filterset_factory(Question, fields=['stage', 'type'])
+
+
+@async_api_view(['GET'])
+async def question_catalog(request):
+    """Async QuestionListView: same ETag/304 handling and versioned cache"""
+    fingerprint = catalog_fingerprint(await aget_catalog_version(), request)
+    etag = catalog_etag(fingerprint)
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+
+    if_none_match = request.headers.get('If-None-Match', '')
+    if etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*':
+        return render(None, status.HTTP_304_NOT_MODIFIED, headers)
+
+    data = await aget_cached_catalog(fingerprint)
+    if data is None:
+        queryset = Question.objects.all().order_by('stage', 'order')
+        round_number = request.GET.get('round')
+        if round_number:
+            # Questions that are either common (round=null) or specific to this round
+            queryset = queryset.filter(models.Q(round__isnull=True) | models.Q(round=round_number))
+        filterset = QuestionFilterSet(request.GET, queryset=queryset)
+        if not filterset.is_valid():
+            raise filter_utils.translate_validation(filterset.errors)
+
+        questions, data = await apaginate(request, filterset.qs)
+        data['results'] = QuestionSerializer(questions, many=True).data
+        await aset_cached_catalog(fingerprint, data)
+    return render(data, headers=headers)
+
+
+@async_api_view(['GET'])
+async def contact_rounds(request, contact_id):
+    """Async ContactInterviewRoundsView"""
+    try:
+        contact = await Contact.objects.aget(id=contact_id)
+    except Contact.DoesNotExist:
+        return render({'error': 'Contact not found'}, status.HTTP_404_NOT_FOUND)
+
+    rounds = [r async for r in contact.interview_rounds.order_by('round_number')]
+    if not rounds:
+        # Initialize rounds if they don't exist
+        await sync_to_async(contact.initialize_interview_rounds)()
+        rounds = [r async for r in contact.interview_rounds.order_by('round_number')]
+
+    return render({
+        'contact_id': contact.id,
+        'contact_name': contact.name,
+        'rounds': InterviewRoundSerializer(rounds, many=True).data,
+    })
+
+
+@async_api_view(['GET'])
+async def interview_detail(request, pk):
+    """Async read of InterviewRetrieveUpdateDestroyView"""
+    try:
+        interview = await Interview.objects.filter(interviewer=request.user).with_related().aget(pk=pk)
+    except Interview.DoesNotExist:
+        raise exceptions.NotFound(f'No {Interview._meta.object_name} matches the given query.')
+    return render(InterviewSerializer(interview).data)
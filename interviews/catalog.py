@@ -0,0 +1,64 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+CATALOG_VERSION_KEY = 'questions:catalog-version'
+
+
+def get_catalog_version():
+    """Current version of the question catalog, created on first use"""
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+async def aget_catalog_version():
+    version = await cache.aget(CATALOG_VERSION_KEY)
+    if version is None:
+        await cache.aadd(CATALOG_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = await cache.aget(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """Invalidate every cached catalog page by moving to a new version"""
+    cache.set(CATALOG_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def catalog_fingerprint(version, request):
+    """Stable digest of the catalog version and the request's path/query/host"""
+    params = sorted(request.GET.lists())
+    raw = f"{version}|{request.get_host()}|{request.path}|{params}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def catalog_etag(fingerprint):
+    return f'"{fingerprint}"'
+
+
+def get_cached_catalog(fingerprint):
+    return cache.get(f'questions:catalog:{fingerprint}')
+
+
+def set_cached_catalog(fingerprint, data):
+    cache.set(
+        f'questions:catalog:{fingerprint}',
+        data,
+        timeout=getattr(settings, 'QUESTION_CATALOG_CACHE_TIMEOUT', 60 * 60 * 24)
+    )
+
+
+async def aget_cached_catalog(fingerprint):
+    return await cache.aget(f'questions:catalog:{fingerprint}')
+
+
+async def aset_cached_catalog(fingerprint, data):
+    await cache.aset(
+        f'questions:catalog:{fingerprint}',
+        data,
+        timeout=getattr(settings, 'QUESTION_CATALOG_CACHE_TIMEOUT', 60 * 60 * 24)
+    )
@@ -0,0 +1,138 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import models, transaction
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .models import DashboardCounter
+
+CONTACT_STATUS = 'contact_status'
+ROUND_STATUS = 'round_status'
+INTERVIEWS_COMPLETED = 'interviews_completed'
+
+_batched_deltas = ContextVar('batched_counter_deltas', default=None)
+
+
+def new_deltas():
+    return defaultdict(int)
+
+
+def transition(deltas, scope, old, new):
+    """Record a move from `old` to `new` (either may be None for create/delete)"""
+    if old == new:
+        return deltas
+    if old is not None:
+        deltas[(scope, str(old))] -= 1
+    if new is not None:
+        deltas[(scope, str(new))] += 1
+    return deltas
+
+
+def completion_key(completed_at):
+    return timezone.localdate(completed_at or timezone.now()).isoformat()
+
+
+def apply_deltas(deltas):
+    """
+    Add `deltas` ({(scope, key): change}) to the counters. Call inside the
+    transaction that makes the status change so counters never drift from it.
+    """
+    pending = _batched_deltas.get()
+    if pending is not None:
+        for counter, delta in deltas.items():
+            pending[counter] += delta
+        return
+
+    now = timezone.now()
+    for (scope, key), delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        counter = DashboardCounter.objects.filter(scope=scope, key=key)
+        if not counter.update(value=models.F('value') + delta, updated_at=now):
+            DashboardCounter.objects.bulk_create(
+                [DashboardCounter(scope=scope, key=key, value=0)], ignore_conflicts=True
+            )
+            counter.update(value=models.F('value') + delta, updated_at=now)
+
+
+@contextmanager
+def batched():
+    """
+    Collect every apply_deltas() made inside the block (e.g. by post_delete
+    receivers during a bulk delete) and write the sum once when it exits.
+    Use inside the transaction that makes the changes.
+    """
+    pending = new_deltas()
+    token = _batched_deltas.set(pending)
+    try:
+        yield pending
+    finally:
+        _batched_deltas.reset(token)
+    apply_deltas(pending)
+
+
+def dashboard_snapshot(today=None):
+    """Read every live count in one query over the small counters table"""
+    today = (today or timezone.localdate()).isoformat()
+    counters = DashboardCounter.objects.filter(
+        models.Q(scope__in=[CONTACT_STATUS, ROUND_STATUS]) |
+        models.Q(scope=INTERVIEWS_COMPLETED, key=today)
+    ).values_list('scope', 'key', 'value', 'updated_at')
+
+    snapshot = {'contacts': {}, 'rounds': {}, 'interviews_completed_today': 0, 'updated_at': None}
+    for scope, key, value, updated_at in counters:
+        if scope == CONTACT_STATUS:
+            snapshot['contacts'][key] = value
+        elif scope == ROUND_STATUS:
+            snapshot['rounds'][key] = value
+        else:
+            snapshot['interviews_completed_today'] = value
+        if snapshot['updated_at'] is None or updated_at > snapshot['updated_at']:
+            snapshot['updated_at'] = updated_at
+    return snapshot
+
+
+def reconcile_counters():
+    """
+    Rebuild every counter from scratch with GROUP BY queries. The counter rows
+    are locked before counting, so a concurrent apply_deltas() either commits
+    before the counts are read or waits and adds its delta on top of them.
+    """
+    from contacts.models import Contact
+    from .models import Interview, InterviewRound
+
+    with transaction.atomic():
+        existing = {
+            (counter.scope, counter.key): counter
+            for counter in DashboardCounter.objects.select_for_update()
+        }
+
+        counts = {}
+        for status, count in Contact.objects.order_by().values_list('status').annotate(count=models.Count('id')):
+            counts[(CONTACT_STATUS, status)] = count
+        for status, count in InterviewRound.objects.order_by().values_list('status').annotate(count=models.Count('id')):
+            counts[(ROUND_STATUS, status)] = count
+        completed = Interview.objects.filter(status='completed').annotate(
+            day=TruncDate(Coalesce('completed_at', 'updated_at'))
+        ).order_by().values_list('day').annotate(count=models.Count('id'))
+        for day, count in completed:
+            counts[(INTERVIEWS_COMPLETED, day.isoformat())] = count
+
+        now = timezone.now()
+        changed = []
+        for counter_key, counter in existing.items():
+            value = counts.get(counter_key)
+            if value is not None and counter.value != value:
+                counter.value, counter.updated_at = value, now
+                changed.append(counter)
+        DashboardCounter.objects.bulk_update(changed, ['value', 'updated_at'])
+        DashboardCounter.objects.filter(
+            id__in=[counter.id for counter_key, counter in existing.items() if counter_key not in counts]
+        ).delete()
+        DashboardCounter.objects.bulk_create([
+            DashboardCounter(scope=scope, key=key, value=value)
+            for (scope, key), value in counts.items() if (scope, key) not in existing
+        ], ignore_conflicts=True)
+    return len(counts)
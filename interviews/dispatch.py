@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from .models import Interview, InterviewRound
+
+# Number of candidates tried per round-trip on the lease (non-locking) path
+CANDIDATE_BATCH = 20
+
+
+def lease_duration():
+    return timedelta(seconds=getattr(settings, 'DISPATCH_LEASE_SECONDS', 900))
+
+
+def lease_is_free(now):
+    return models.Q(leased_by__isnull=True) | models.Q(lease_expires_at__isnull=True) | models.Q(lease_expires_at__lte=now)
+
+
+def eligible_rounds(now):
+    """
+    Rounds that can be called right now: active, scheduled time reached, not
+    leased by anyone and without an open interview, best candidates first.
+    """
+    open_interviews = Interview.objects.filter(
+        interview_round=models.OuterRef('pk'),
+        status__in=['in_progress', 'paused']
+    )
+    return InterviewRound.objects.filter(
+        lease_is_free(now),
+        status='active',
+        scheduled_at__lte=now,
+    ).exclude(
+        models.Exists(open_interviews)
+    ).order_by('-priority', 'scheduled_at', 'id')
+
+
+def lease_next_round(user, now=None):
+    """
+    Atomically hand `user` the next eligible round, or None when the queue is
+    empty. A round the user already holds is returned again (with its lease
+    extended). PostgreSQL claims the row with SELECT ... FOR UPDATE SKIP LOCKED,
+    other databases with a conditional UPDATE on the lease columns, so
+    concurrent interviewers never block on or receive the same round.
+    """
+    now = now or timezone.now()
+    expires_at = now + lease_duration()
+
+    held = InterviewRound.objects.filter(
+        leased_by=user,
+        lease_expires_at__gt=now,
+        status='active'
+    ).order_by('lease_expires_at').first()
+    if held:
+        InterviewRound.objects.filter(pk=held.pk).update(lease_expires_at=expires_at, updated_at=now)
+        held.lease_expires_at = expires_at
+        return held
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            interview_round = eligible_rounds(now).select_for_update(skip_locked=True, of=('self',)).first()
+            if interview_round is None:
+                return None
+            interview_round.leased_by = user
+            interview_round.lease_expires_at = expires_at
+            interview_round.updated_at = now
+            interview_round.save(update_fields=['leased_by', 'lease_expires_at', 'updated_at'])
+            return interview_round
+
+    while True:
+        candidates = list(eligible_rounds(now).values_list('id', flat=True)[:CANDIDATE_BATCH])
+        if not candidates:
+            return None
+        for round_id in candidates:
+            claimed = InterviewRound.objects.filter(lease_is_free(now), pk=round_id, status='active').update(
+                leased_by=user,
+                lease_expires_at=expires_at,
+                updated_at=now
+            )
+            if claimed:
+                return InterviewRound.objects.get(pk=round_id)
+
+
+def release_round(user, round_id):
+    """Give up the user's lease on a round; returns whether a lease was released"""
+    return bool(InterviewRound.objects.filter(pk=round_id, leased_by=user).update(
+        leased_by=None,
+        lease_expires_at=None,
+        updated_at=timezone.now()
+    ))
@@ -0,0 +1,90 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+from .models import Question, Response
+
+
+class Echo:
+    """File-like object that hands back what csv.writer writes"""
+
+    def write(self, value):
+        return value
+
+
+class WideResponseExport:
+    """
+    Pivot interview responses into one row per interview with one column per
+    question, streaming as it goes.
+
+    Interviews and responses are read with two ordered iterators (server-side
+    cursors on Postgres) and merge-joined on the interview id, so memory use
+    only depends on the number of questions, not the number of interviews.
+    """
+    BASE_COLUMNS = [
+        'interview_id', 'contact_id', 'contact_name', 'contact_phone',
+        'round_number', 'status', 'stage', 'started_at', 'completed_at'
+    ]
+    BASE_FIELDS = [
+        'id', 'contact_id', 'contact__name', 'contact__phone',
+        'interview_round__round_number', 'status', 'stage', 'started_at', 'completed_at'
+    ]
+
+    def __init__(self, interviews, chunk_size=2000, round_number=None):
+        self.interviews = interviews
+        self.chunk_size = chunk_size
+        questions = Question.objects.order_by('stage', 'order', 'id')
+        if round_number is not None:
+            # Only the common questions and those of the exported round
+            questions = questions.filter(models.Q(round__isnull=True) | models.Q(round=round_number))
+        self.question_ids = list(questions.values_list('id', flat=True))
+
+    @property
+    def columns(self):
+        return self.BASE_COLUMNS + [f'q_{question_id}' for question_id in self.question_ids]
+
+    def rows(self):
+        """Yield (base values, {question_id: answer}) per interview, ordered by id"""
+        interviews = self.interviews.order_by('id').values_list(*self.BASE_FIELDS)
+        responses = Response.objects.filter(
+            interview_id__in=self.interviews.order_by().values('id')
+        ).order_by('interview_id').values_list('interview_id', 'question_id', 'answer')
+
+        response_iter = responses.iterator(chunk_size=self.chunk_size)
+        pending = next(response_iter, None)
+        for interview in interviews.iterator(chunk_size=self.chunk_size):
+            answers = {}
+            while pending is not None and pending[0] <= interview[0]:
+                if pending[0] == interview[0]:
+                    answers[pending[1]] = pending[2]
+                pending = next(response_iter, None)
+            yield interview, answers
+
+    @staticmethod
+    def _csv_value(value):
+        if value is None:
+            return ''
+        if isinstance(value, (list, dict, bool)):
+            return json.dumps(value)
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return value
+
+    def stream_csv(self):
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.columns)
+        for interview, answers in self.rows():
+            yield writer.writerow(
+                [self._csv_value(value) for value in interview]
+                + [self._csv_value(answers.get(question_id)) for question_id in self.question_ids]
+            )
+
+    def stream_ndjson(self):
+        for interview, answers in self.rows():
+            row = dict(zip(self.BASE_COLUMNS, interview))
+            row['responses'] = {
+                f'q_{question_id}': answers.get(question_id) for question_id in self.question_ids
+            }
+            yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
@@ -0,0 +1,77 @@
+import json
+import math
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import FormFieldValue
+
+PATH_SEPARATOR = '.'
+
+
+def flatten(form_data, prefix=''):
+    """Yield (path, value) for every leaf of a nested form_data dict"""
+    if not isinstance(form_data, dict):
+        return
+    for key, value in form_data.items():
+        path = f'{prefix}{PATH_SEPARATOR}{key}' if prefix else str(key)
+        if isinstance(value, dict):
+            yield from flatten(value, path)
+        else:
+            yield path, value
+
+
+def indexed_paths():
+    """Paths configured for extraction; an empty setting extracts every leaf"""
+    return set(getattr(settings, 'XFORM_INDEXED_PATHS', []) or [])
+
+
+def typed_value(interview_id, path, value):
+    """Build a FormFieldValue holding `value` in its typed columns"""
+    field_value = FormFieldValue(interview_id=interview_id, path=path)
+    if isinstance(value, bool):
+        field_value.value_bool = value
+        field_value.value_text = 'true' if value else 'false'
+        return field_value
+    if isinstance(value, (int, float)):
+        field_value.value_number = value
+        field_value.value_text = str(value)
+        return field_value
+    if isinstance(value, list):
+        value = json.dumps(value)
+    text = str(value).strip()
+    field_value.value_text = text[:255]
+    try:
+        number = float(text)
+    except ValueError:
+        number = None
+    if number is not None and math.isfinite(number):
+        field_value.value_number = number
+    return field_value
+
+
+def build_values(interview_id, form_data, paths=None):
+    paths = indexed_paths() if paths is None else paths
+    return [
+        typed_value(interview_id, path, value)
+        for path, value in flatten(form_data)
+        if value not in (None, '', []) and (not paths or path in paths)
+    ]
+
+
+def extract_form_fields(interviews):
+    """
+    Replace the extracted fields of `interviews` (objects with id and
+    form_data) with a fresh copy, using one delete and one bulk insert.
+    """
+    paths = indexed_paths()
+    interview_ids = []
+    values = []
+    for interview in interviews:
+        interview_ids.append(interview.id)
+        values.extend(build_values(interview.id, interview.form_data, paths))
+
+    with transaction.atomic():
+        FormFieldValue.objects.filter(interview_id__in=interview_ids).delete()
+        FormFieldValue.objects.bulk_create(values, batch_size=1000)
+    return len(values)
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from interviews.scheduler import activate_due_rounds
+
+
+class Command(BaseCommand):
+    help = 'Activate pending interview rounds whose scheduled time has passed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Number of rounds activated per transaction')
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Keep running and repeat every N seconds (0 runs once)')
+
+    def handle(self, *args, **options):
+        while True:
+            result = activate_due_rounds(batch_size=max(1, options['batch_size']))
+            self.stdout.write(self.style.SUCCESS(
+                f"Activated {result['activated']} rounds, "
+                f"updated {result['contacts_updated']} contacts"
+            ))
+            if options['interval'] <= 0:
+                break
+            time.sleep(options['interval'])
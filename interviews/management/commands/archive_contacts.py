@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from interviews.archive import archive_contacts
+
+
+class Command(BaseCommand):
+    help = (
+        'Move fully completed contacts with their rounds, interviews, responses and form values '
+        'into the archive table'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Contacts archived per transaction')
+        parser.add_argument('--older-than-days', type=int, default=None,
+                            help='Only archive contacts unchanged for this many days (default ARCHIVE_AFTER_DAYS)')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the eligible contacts')
+
+    def handle(self, *args, **options):
+        count = archive_contacts(
+            batch_size=max(1, options['batch_size']),
+            older_than_days=options['older_than_days'],
+            dry_run=options['dry_run'],
+        )
+        if options['dry_run']:
+            self.stdout.write(f'{count} contacts are eligible for archival')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Archived {count} contacts'))
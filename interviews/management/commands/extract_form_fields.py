@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from interviews.form_fields import extract_form_fields
+from interviews.models import Interview
+
+
+class Command(BaseCommand):
+    help = 'Backfill the indexed form field table from Interview.form_data'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Number of interviews extracted per transaction')
+        parser.add_argument('--only-missing', action='store_true',
+                            help='Skip interviews that already have extracted fields')
+
+    def handle(self, *args, **options):
+        interviews = Interview.objects.filter(form_data__isnull=False).order_by('id').only('id', 'form_data')
+        if options['only_missing']:
+            interviews = interviews.filter(form_values__isnull=True)
+
+        batch_size = max(1, options['batch_size'])
+        processed = 0
+        extracted = 0
+        batch = []
+        for interview in interviews.iterator(chunk_size=batch_size):
+            batch.append(interview)
+            if len(batch) >= batch_size:
+                extracted += extract_form_fields(batch)
+                processed += len(batch)
+                batch = []
+        if batch:
+            extracted += extract_form_fields(batch)
+            processed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Extracted {extracted} fields from {processed} interviews'
+        ))
@@ -0,0 +1,212 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from contacts.models import Contact
+from contacts.search import normalize_phone
+from interviews.catalog import bump_catalog_version
+from interviews.counters import reconcile_counters
+from interviews.form_fields import extract_form_fields
+from interviews.models import Interview, InterviewRound, Question, Response
+from interviews.scheduling import get_calendar
+
+User = get_user_model()
+
+LOCATIONS = ['Lagos', 'Abuja', 'Kano', 'Ibadan', 'Port Harcourt', 'Enugu', 'Kaduna', 'Jos']
+FIRST_NAMES = ['Ada', 'Bola', 'Chidi', 'Dayo', 'Emeka', 'Funmi', 'Gbenga', 'Halima', 'Ifeoma', 'Jide']
+LAST_NAMES = ['Okafor', 'Adeyemi', 'Bello', 'Eze', 'Ibrahim', 'Nwosu', 'Ogunleye', 'Musa', 'Obi', 'Yusuf']
+# Probability of a contact having completed 0..4 rounds
+PROGRESS_WEIGHTS = [40, 25, 15, 10, 10]
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a large synthetic dataset in bulk: users, contacts with their 4 rounds, '
+        'interviews, responses and form_data'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Number of interviewers')
+        parser.add_argument('--contacts', type=int, default=1000)
+        parser.add_argument('--responses-per-interview', type=int, default=20,
+                            help='Maximum answers stored per interview')
+        parser.add_argument('--in-progress-ratio', type=float, default=0.2,
+                            help='Share of active rounds that have an open interview')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Contacts written per transaction')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed (same seed, same dataset)')
+        parser.add_argument('--prefix', default='bench', help='Prefix of generated usernames')
+        parser.add_argument('--password', default='bench-password', help='Password of generated users')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        self.rng = random.Random(options['seed'])
+        self.options = options
+
+        users = self.create_users(options['users'], options['prefix'], options['password'])
+        self.questions = self.ensure_questions()
+        # Continue numbering after existing contacts so reruns don't collide on the unique fields
+        self.first_index = (Contact.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+
+        totals = {'contacts': 0, 'rounds': 0, 'interviews': 0, 'responses': 0}
+        batch_size = max(1, options['batch_size'])
+        for offset in range(0, options['contacts'], batch_size):
+            count = min(batch_size, options['contacts'] - offset)
+            for key, value in self.create_batch(users, offset, count).items():
+                totals[key] += value
+            self.stdout.write(f"  {offset + count}/{options['contacts']} contacts")
+
+        reconcile_counters()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {len(users)} users, {totals['contacts']} contacts, {totals['rounds']} rounds, "
+            f"{totals['interviews']} interviews and {totals['responses']} responses in {elapsed:.1f}s"
+        ))
+
+    def create_users(self, count, prefix, password):
+        usernames = [f'{prefix}-user-{index}' for index in range(count)]
+        existing = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+        # Hashing is deliberately slow, so every generated user shares one hash
+        password_hash = make_password(password)
+        User.objects.bulk_create([
+            User(username=username, password=password_hash, role='interviewer',
+                 email=f'{username}@example.com')
+            for username in usernames if username not in existing
+        ])
+        return list(User.objects.filter(username__in=usernames).order_by('id'))
+
+    def ensure_questions(self):
+        """The existing questionnaire, or a generated one when there is none"""
+        if not Question.objects.exists():
+            questions = []
+            for stage in range(1, 5):
+                for order in range(10):
+                    question_type = self.rng.choice(['text', 'multiple_choice', 'scale', 'boolean'])
+                    questions.append(Question(
+                        text=f'Stage {stage} question {order + 1}',
+                        type=question_type,
+                        stage=stage,
+                        order=order,
+                        options=['A', 'B', 'C', 'D'] if question_type == 'multiple_choice' else None,
+                        # A quarter of the questions only belong to one round
+                        round=self.rng.randint(1, 4) if order % 4 == 3 else None,
+                    ))
+            Question.objects.bulk_create(questions)
+            bump_catalog_version()
+        questions = list(Question.objects.order_by('stage', 'order', 'id'))
+        return {
+            round_number: [q for q in questions if q.round in (None, round_number)]
+            for round_number in range(1, 5)
+        }
+
+    def answer(self, question):
+        if question.type == 'multiple_choice':
+            return self.rng.choice(question.options or ['A', 'B'])
+        if question.type == 'scale':
+            return self.rng.randint(1, 10)
+        if question.type == 'boolean':
+            return self.rng.random() < 0.5
+        return f'Answer {self.rng.randint(1, 10_000)}'
+
+    def form_data(self):
+        return {
+            'consent': True,
+            'household': {
+                'size': self.rng.randint(1, 12),
+                'region': self.rng.choice(LOCATIONS),
+                'head': self.rng.random() < 0.4,
+            },
+            'income': round(self.rng.uniform(10_000, 2_000_000), 2),
+            'device': self.rng.choice(['android', 'ios', 'feature_phone']),
+            'notes': self.rng.choice(['', 'Call back later', 'Prefers evenings', 'Spoke to relative']),
+        }
+
+    def create_batch(self, users, offset, count):
+        now = timezone.now()
+        contacts = []
+        progress = []
+        for index in range(self.first_index + offset, self.first_index + offset + count):
+            completed = self.rng.choices(range(5), weights=PROGRESS_WEIGHTS)[0]
+            progress.append(completed)
+            phone = f'080{index:08d}'
+            contacts.append(Contact(
+                name=f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}',
+                phone=phone,
+                phone_key=normalize_phone(phone),
+                serialNumber=f'SN{index:08d}',
+                cuid=f'CU{index:08d}',
+                ticketNumber=f'TK{index:08d}',
+                location=self.rng.choice(LOCATIONS),
+                status='completed' if completed == 4 else f'round_{completed + 1}',
+                created_by=self.rng.choice(users),
+            ))
+
+        with transaction.atomic():
+            contacts = Contact.objects.bulk_create(contacts)
+
+            # Older contacts have gone through more rounds
+            starts = [now - timedelta(days=95 * completed + self.rng.randint(0, 60)) for completed in progress]
+            schedules = get_calendar().schedule_many(starts)
+
+            rounds = []
+            for contact, completed, schedule in zip(contacts, progress, schedules):
+                for round_number, scheduled_at in enumerate(schedule, start=1):
+                    if round_number <= completed:
+                        round_status = 'completed'
+                    elif round_number == completed + 1:
+                        round_status = 'active'
+                    else:
+                        round_status = 'pending'
+                    rounds.append(InterviewRound(
+                        contact=contact, owner_id=contact.created_by_id, round_number=round_number,
+                        scheduled_at=scheduled_at, status=round_status,
+                        priority=self.rng.choice([0, 0, 0, 1, 5]),
+                    ))
+            InterviewRound.objects.bulk_create(rounds)
+
+            interviews = []
+            for interview_round in rounds:
+                is_open = (interview_round.status == 'active'
+                           and self.rng.random() < self.options['in_progress_ratio'])
+                if interview_round.status != 'completed' and not is_open:
+                    continue
+                completed_at = min(now, interview_round.scheduled_at + timedelta(days=self.rng.randint(0, 10)))
+                interviews.append(Interview(
+                    contact_id=interview_round.contact_id,
+                    interviewer=self.rng.choice(users),
+                    interview_round=interview_round,
+                    stage=self.rng.randint(1, 4),
+                    status='in_progress' if is_open else 'completed',
+                    current_question_index=self.rng.randint(0, 30),
+                    form_data=None if is_open else self.form_data(),
+                    completed_at=None if is_open else completed_at,
+                ))
+            interviews = Interview.objects.bulk_create(interviews)
+
+            responses = []
+            limit = self.options['responses_per_interview']
+            for interview in interviews:
+                questions = self.questions[interview.interview_round.round_number]
+                answered = questions[:limit]
+                if interview.status != 'completed':
+                    answered = answered[:self.rng.randint(0, len(answered))]
+                responses.extend(
+                    Response(interview=interview, question=question, answer=self.answer(question))
+                    for question in answered
+                )
+            Response.objects.bulk_create(responses, batch_size=2000)
+            extract_form_fields([interview for interview in interviews if interview.form_data])
+
+        return {
+            'contacts': len(contacts),
+            'rounds': len(rounds),
+            'interviews': len(interviews),
+            'responses': len(responses),
+        }
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from interviews.upload import prune_operations
+
+
+class Command(BaseCommand):
+    help = 'Delete sync upload idempotency records older than SYNC_IDEMPOTENCY_RETENTION_DAYS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='Override the retention in days')
+
+    def handle(self, *args, **options):
+        deleted = prune_operations(options['days'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} idempotency records'))
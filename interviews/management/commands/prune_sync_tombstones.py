@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from interviews.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = 'Delete delta sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='Override the retention in days')
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones(options['days'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} tombstones'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from interviews.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the dashboard counters from the contact, round and interview tables'
+
+    def handle(self, *args, **options):
+        rows = reconcile_counters()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} dashboard counters'))
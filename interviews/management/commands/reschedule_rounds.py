@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+
+from interviews.models import InterviewRound
+from interviews.scheduling import reschedule_following_rounds
+
+
+class Command(BaseCommand):
+    help = 'Move pending rounds that are scheduled too soon after their completed previous round'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of completed rounds processed per transaction')
+
+    def handle(self, *args, **options):
+        completed = InterviewRound.objects.filter(status='completed').annotate(
+            finished_at=models.Max('interviews__completed_at')
+        ).order_by('contact_id', 'round_number').values_list(
+            'contact_id', 'round_number', 'finished_at', 'updated_at'
+        )
+
+        moved = 0
+        batch = []
+        for contact_id, round_number, finished_at, updated_at in completed.iterator(chunk_size=options['batch_size']):
+            batch.append((contact_id, round_number, finished_at or updated_at))
+            # Keep every round of a contact in the same batch
+            if len(batch) >= options['batch_size'] and batch[-2:-1] and batch[-2][0] != contact_id:
+                last = batch.pop()
+                moved += self._reschedule(batch)
+                batch = [last]
+        if batch:
+            moved += self._reschedule(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Rescheduled {moved} rounds'))
+
+    def _reschedule(self, batch):
+        with transaction.atomic():
+            return len(reschedule_following_rounds(batch))
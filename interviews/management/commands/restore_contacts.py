@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from interviews.archive import RestoreError, restore_contacts
+from interviews.models import ArchivedContact
+
+
+class Command(BaseCommand):
+    help = 'Move archived contacts and their interview data back into the live tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('contact_ids', nargs='*', type=int, help='Ids of the archived contacts')
+        parser.add_argument('--all', action='store_true', help='Restore every archived contact')
+
+    def handle(self, *args, **options):
+        contact_ids = options['contact_ids']
+        if options['all']:
+            contact_ids = list(ArchivedContact.objects.values_list('contact_id', flat=True))
+        elif not contact_ids:
+            raise CommandError('Pass contact ids or --all')
+
+        try:
+            restored = restore_contacts(contact_ids)
+        except RestoreError as exc:
+            raise CommandError(str(exc)) from exc
+
+        missing = sorted(set(contact_ids) - set(restored))
+        if missing:
+            self.stderr.write(f"Not archived: {', '.join(map(str, missing))}")
+        self.stdout.write(self.style.SUCCESS(f'Restored {len(restored)} contacts'))
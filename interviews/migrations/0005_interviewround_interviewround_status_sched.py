@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0003_alter_contact_status'),
+        ('interviews', '0004_merge_20250626_0206'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interviewround',
+            index=models.Index(fields=['status', 'scheduled_at'], name='interviewround_status_sched'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0005_interviewround_interviewround_status_sched'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FormFieldValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=255)),
+                ('value_text', models.CharField(blank=True, max_length=255, null=True)),
+                ('value_number', models.FloatField(blank=True, null=True)),
+                ('value_bool', models.BooleanField(blank=True, null=True)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='form_values', to='interviews.interview')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['path', 'value_text'], name='formfield_path_text'), models.Index(fields=['path', 'value_number'], name='formfield_path_number')],
+                'unique_together': {('interview', 'path')},
+            },
+        ),
+    ]
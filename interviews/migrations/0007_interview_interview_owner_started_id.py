@@ -0,0 +1,20 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0004_contact_contact_owner_created_id'),
+        ('interviews', '0006_formfieldvalue'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['interviewer', '-started_at', 'id'], name='interview_owner_started_id'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0005_contact_phone_key_search_index'),
+        ('interviews', '0007_interview_interview_owner_started_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewround',
+            name='lease_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='interviewround',
+            name='leased_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='leased_rounds', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='interviewround',
+            name='priority',
+            field=models.IntegerField(default=0, help_text='Higher priority rounds are dispatched first'),
+        ),
+        migrations.AddIndex(
+            model_name='interviewround',
+            index=models.Index(fields=['status', '-priority', 'scheduled_at'], name='interviewround_dispatch'),
+        ),
+    ]
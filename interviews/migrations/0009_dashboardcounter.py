@@ -0,0 +1,48 @@
+# Generated by Django 5.2.3 on 2026-10-17 00:48
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce, TruncDate
+
+
+def populate_counters(apps, schema_editor):
+    Contact = apps.get_model('contacts', 'Contact')
+    InterviewRound = apps.get_model('interviews', 'InterviewRound')
+    Interview = apps.get_model('interviews', 'Interview')
+    DashboardCounter = apps.get_model('interviews', 'DashboardCounter')
+
+    rows = []
+    for scope, model in [('contact_status', Contact), ('round_status', InterviewRound)]:
+        for status, count in model.objects.order_by().values_list('status').annotate(count=models.Count('id')):
+            rows.append(DashboardCounter(scope=scope, key=status, value=count))
+    completed = Interview.objects.filter(status='completed').annotate(
+        day=TruncDate(Coalesce('completed_at', 'updated_at'))
+    ).order_by().values_list('day').annotate(count=models.Count('id'))
+    for day, count in completed:
+        rows.append(DashboardCounter(scope='interviews_completed', key=day.isoformat(), value=count))
+    DashboardCounter.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0005_contact_phone_key_search_index'),
+        ('interviews', '0008_interviewround_lease_expires_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('contact_status', 'Contacts per status'), ('round_status', 'Rounds per status'), ('interviews_completed', 'Interviews completed per day')], max_length=30)),
+                ('key', models.CharField(max_length=50)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['scope', 'key'],
+                'unique_together': {('scope', 'key')},
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-17 01:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0009_dashboardcounter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedContact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('contact_id', models.BigIntegerField(unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('phone_key', models.CharField(blank=True, db_index=True, default='', max_length=20)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('payload', models.BinaryField()),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_contacts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-archived_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.3 on 2026-10-17 01:06
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0006_contact_owner_updated_index'),
+        ('interviews', '0010_archivedcontact'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('contact', 'Contact'), ('interview_round', 'Interview round'), ('interview', 'Interview')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('contact_id', models.BigIntegerField()),
+                ('owner_id', models.BigIntegerField(blank=True, help_text='User whose feed reports the deletion', null=True)),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['interviewer', 'updated_at', 'id'], name='interview_owner_updated_id'),
+        ),
+        migrations.AddIndex(
+            model_name='interviewround',
+            index=models.Index(fields=['updated_at', 'id'], name='interviewround_updated_id'),
+        ),
+        migrations.AddIndex(
+            model_name='synctombstone',
+            index=models.Index(fields=['owner_id', 'deleted_at', 'id'], name='tombstone_owner_deleted_id'),
+        ),
+        migrations.AddIndex(
+            model_name='synctombstone',
+            index=models.Index(fields=['contact_id', 'deleted_at', 'id'], name='tombstone_contact_deleted_id'),
+        ),
+    ]
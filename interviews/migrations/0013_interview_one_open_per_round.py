@@ -0,0 +1,47 @@
+# Generated by Django 5.2.3 on 2026-10-17 01:12
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def detach_duplicate_open_interviews(apps, schema_editor):
+    """
+    Keep the newest open interview of each round (the one the start endpoint
+    resumed) and detach older duplicates from the round instead of deleting
+    their answers
+    """
+    Interview = apps.get_model('interviews', 'Interview')
+    open_interviews = Interview.objects.filter(
+        status__in=['in_progress', 'paused'], interview_round__isnull=False
+    )
+    duplicated_rounds = open_interviews.values('interview_round').annotate(
+        count=models.Count('id')
+    ).filter(count__gt=1).values_list('interview_round', flat=True)
+
+    detached = []
+    for round_id in duplicated_rounds:
+        ids = list(
+            open_interviews.filter(interview_round=round_id)
+            .order_by('-started_at', '-id').values_list('id', flat=True)
+        )
+        detached.extend(ids[1:])
+    if detached:
+        Interview.objects.filter(id__in=detached).update(interview_round=None, updated_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0006_contact_owner_updated_index'),
+        ('interviews', '0012_syncoperation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(detach_duplicate_open_interviews, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='interview',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['in_progress', 'paused'])), fields=('interview_round',), name='interview_one_open_per_round'),
+        ),
+    ]
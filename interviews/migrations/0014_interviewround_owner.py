@@ -0,0 +1,43 @@
+# Generated by Django 5.2.3 on 2026-10-17 01:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_contact_owner(apps, schema_editor):
+    """Copy the contact owner onto rounds, and onto the tombstones of deleted rounds"""
+    InterviewRound = apps.get_model('interviews', 'InterviewRound')
+    SyncTombstone = apps.get_model('interviews', 'SyncTombstone')
+    Contact = apps.get_model('contacts', 'Contact')
+    owner = models.Subquery(
+        Contact.objects.filter(id=models.OuterRef('contact_id')).values('created_by_id')[:1]
+    )
+    InterviewRound.objects.update(owner_id=owner)
+    SyncTombstone.objects.filter(kind='interview_round', owner_id__isnull=True).update(owner_id=owner)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0007_contact_search_update_trigger'),
+        ('interviews', '0013_interview_one_open_per_round'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='interviewround',
+            name='interviewround_updated_id',
+        ),
+        migrations.AddField(
+            model_name='interviewround',
+            name='owner',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(copy_contact_owner, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='interviewround',
+            index=models.Index(fields=['owner', 'updated_at', 'id'], name='round_owner_updated_id'),
+        ),
+    ]
@@ -1,8 +1,9 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
-from datetime import datetime, timedelta
+from datetime import datetime
 from contacts.models import Contact
 
 User = get_user_model()
@@ -33,6 +34,13 @@ class Question(models.Model):
         round_info = f" (Round {self.round})" if self.round else " (All rounds)"
         return f"Stage {self.stage}: {self.text[:50]}...{round_info}"
 
+    def clean(self):
+        from .routing import RoutingError, validate_routing_logic
+        try:
+            validate_routing_logic(self)
+        except RoutingError as e:
+            raise ValidationError({'routing_logic': str(e)})
+
 
 class InterviewRound(models.Model):
     ROUND_STATUS_CHOICES = [
@@ -46,57 +54,135 @@ class InterviewRound(models.Model):
     round_number = models.IntegerField(choices=[(1, 'Round 1'), (2, 'Round 2'), (3, 'Round 3'), (4, 'Round 4')])
     status = models.CharField(max_length=20, choices=ROUND_STATUS_CHOICES, default='pending')
     scheduled_at = models.DateTimeField(default=timezone.now)  # Added default
+    priority = models.IntegerField(default=0, help_text="Higher priority rounds are dispatched first")
+    leased_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        related_name='leased_rounds',
+        null=True,
+        blank=True
+    )
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    # Copy of contact.created_by, so a user's rounds are read from one index
+    # by the delta sync feed; Contact.save() keeps it in step
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=False
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         unique_together = ['contact', 'round_number']
         ordering = ['contact', 'round_number']
+        indexes = [
+            # Used by the scheduler to find due pending rounds
+            models.Index(fields=['status', 'scheduled_at'], name='interviewround_status_sched'),
+            # Used by the dispatch queue to pick the next round to call
+            models.Index(fields=['status', '-priority', 'scheduled_at'], name='interviewround_dispatch'),
+            # Backs the delta sync feed (changes since a watermark)
+            models.Index(fields=['owner', 'updated_at', 'id'], name='round_owner_updated_id'),
+        ]
     
     def __str__(self):
         return f"{self.contact.name} - Round {self.round_number} ({self.status})"
     
     @classmethod
-    def calculate_next_round_date(cls, previous_date, months=3):
-        """Calculate next round date 3 months later, excluding weekends"""
-        # Add approximately 3 months (90 days)
-        next_date = previous_date + timedelta(days=90)
-        
-        # Adjust for weekends - if it falls on weekend, move to next Monday
-        while next_date.weekday() >= 5:  # 5=Saturday, 6=Sunday
-            next_date += timedelta(days=1)
-        
-        return next_date
+    def calculate_next_round_date(cls, previous_date, months=None, round_number=None):
+        """
+        Calculate the next round date, skipping weekends and holidays. The
+        interval is `months` months when given, else the calendar's rule for
+        `round_number`.
+        """
+        from .scheduling import get_calendar
+        interval = {'months': months} if months is not None else None
+        return get_calendar().next_round_date(previous_date, round_number, interval)
     
     @classmethod
-    def create_rounds_for_contact(cls, contact):
-        """Create all 4 rounds for a contact with proper scheduling"""
-        if cls.objects.filter(contact=contact).exists():
-            return  # Rounds already exist
-        
+    def round_schedule(cls, start=None):
+        """Return (round_number, scheduled_at, status) for the 4 rounds starting at `start`"""
+        from .scheduling import get_calendar
         # Round 1 should always be active for new contacts or not_started status
-        round1_date = timezone.now()
-        round1_status = 'active'  # Always active for round 1
+        round1_date = start or timezone.now()
         
-        # Calculate subsequent rounds (3 months apart, excluding weekends)
-        round2_date = cls.calculate_next_round_date(round1_date)
-        round3_date = cls.calculate_next_round_date(round2_date)
-        round4_date = cls.calculate_next_round_date(round3_date)
-        
-        rounds_data = [
-            (1, round1_date, round1_status),
-            (2, round2_date, 'pending'),
-            (3, round3_date, 'pending'),
-            (4, round4_date, 'pending'),
+        # Subsequent rounds follow the business calendar (3 months apart by default)
+        dates = get_calendar().round_dates(round1_date, rounds=4)
+        return [
+            (round_number, scheduled_date, 'active' if round_number == 1 else 'pending')
+            for round_number, scheduled_date in enumerate(dates, start=1)
         ]
-        
-        for round_num, scheduled_date, status in rounds_data:
-            cls.objects.create(
+    
+    @classmethod
+    def build_rounds_for_contact(cls, contact, schedule=None):
+        """Build (unsaved) round instances for a contact, suitable for bulk_create"""
+        schedule = schedule or cls.round_schedule()
+        return [
+            cls(
                 contact=contact,
+                owner_id=contact.created_by_id,
                 round_number=round_num,
                 scheduled_at=scheduled_date,
                 status=status
             )
+            for round_num, scheduled_date, status in schedule
+        ]
+    
+    @classmethod
+    def create_rounds_for_contact(cls, contact):
+        """Create all 4 rounds for a contact with proper scheduling"""
+        from . import counters
+        
+        if cls.objects.filter(contact=contact).exists():
+            return  # Rounds already exist
+        
+        rounds = cls.build_rounds_for_contact(contact)
+        with transaction.atomic():
+            cls.objects.bulk_create(rounds)
+            deltas = counters.new_deltas()
+            for interview_round in rounds:
+                counters.transition(deltas, counters.ROUND_STATUS, None, interview_round.status)
+            counters.apply_deltas(deltas)
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so save() can update the dashboard counters
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        from . import counters
+        
+        is_new = self.pk is None
+        update_fields = kwargs.get('update_fields')
+        old_status = getattr(self, '_loaded_status', None)
+        track_status = is_new or (
+            old_status is not None and (update_fields is None or 'status' in update_fields)
+        )
+        if self.owner_id is None and self.contact_id is not None:
+            self.owner_id = self.contact.created_by_id
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if track_status:
+                counters.apply_deltas(counters.transition(
+                    counters.new_deltas(), counters.ROUND_STATUS, old_status, self.status
+                ))
+        self._loaded_status = self.status
+    
+    def is_leased_by_other(self, user):
+        """Whether another interviewer holds an unexpired dispatch lease on this round"""
+        return (
+            self.leased_by_id is not None and
+            self.leased_by_id != user.pk and
+            self.lease_expires_at is not None and
+            self.lease_expires_at > timezone.now()
+        )
     
     def can_start_interview(self):
         """Check if this round can start an interview"""
@@ -133,6 +219,19 @@ class InterviewRound(models.Model):
         return True
 
 
+class InterviewQuerySet(models.QuerySet):
+    def with_related(self, include_responses=True):
+        """Load contact (with its rounds), round and optionally responses in a fixed number of queries"""
+        queryset = self.select_related('interview_round').prefetch_related(
+            models.Prefetch('contact', queryset=Contact.objects.with_interview_summary())
+        )
+        if include_responses:
+            queryset = queryset.prefetch_related(
+                models.Prefetch('responses', queryset=Response.objects.select_related('question'))
+            )
+        return queryset
+
+
 class Interview(models.Model):
     STATUS_CHOICES = [
         ('in_progress', 'In Progress'),
@@ -162,8 +261,24 @@ class Interview(models.Model):
     completed_at = models.DateTimeField(null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = InterviewQuerySet.as_manager()
+
     class Meta:
         ordering = ['-started_at']
+        indexes = [
+            # Backs keyset pagination of an interviewer's interview list
+            models.Index(fields=['interviewer', '-started_at', 'id'], name='interview_owner_started_id'),
+            # Backs the delta sync feed (changes since a watermark)
+            models.Index(fields=['interviewer', 'updated_at', 'id'], name='interview_owner_updated_id'),
+        ]
+        constraints = [
+            # At most one open interview per round; concurrent starts resume it
+            models.UniqueConstraint(
+                fields=['interview_round'],
+                condition=models.Q(status__in=['in_progress', 'paused']),
+                name='interview_one_open_per_round'
+            ),
+        ]
 
     def clean(self):
         """Validate that interview can be created or resumed for this round"""
@@ -183,22 +298,53 @@ class Interview(models.Model):
                         f"Scheduled: {self.interview_round.scheduled_at}"
                     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored completion so save() can update the dashboard counters
+        instance._loaded_status = instance.__dict__.get('status')
+        instance._loaded_completed_at = instance.__dict__.get('completed_at')
+        return instance
+
     def save(self, *args, **kwargs):
+        from . import counters
+        
         self.full_clean()
-        super().save(*args, **kwargs)
+        old_status = getattr(self, '_loaded_status', None)
         
-        # If interview is completed, mark the round as completed
-        if self.status == 'completed' and self.interview_round and self.interview_round.status == 'active':
-            self.interview_round.status = 'completed'
-            self.interview_round.save()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
             
-            # Activate next round if it exists
-            next_round = InterviewRound.objects.filter(
-                contact=self.contact,
-                round_number=self.interview_round.round_number + 1
-            ).first()
-            if next_round:
-                next_round.activate_if_ready()
+            deltas = counters.new_deltas()
+            if self.status == 'completed' and old_status != 'completed':
+                deltas[(counters.INTERVIEWS_COMPLETED, counters.completion_key(self.completed_at))] += 1
+            elif old_status == 'completed' and self.status != 'completed':
+                deltas[(counters.INTERVIEWS_COMPLETED, counters.completion_key(self._loaded_completed_at))] -= 1
+            counters.apply_deltas(deltas)
+            
+            # If interview is completed, mark the round as completed
+            if self.status == 'completed' and self.interview_round and self.interview_round.status == 'active':
+                self.interview_round.status = 'completed'
+                self.interview_round.save()
+                
+                # Push later rounds back if this round finished late
+                from .scheduling import reschedule_following_rounds
+                reschedule_following_rounds([(
+                    self.contact_id,
+                    self.interview_round.round_number,
+                    self.completed_at or timezone.now()
+                )])
+                
+                # Activate next round if it exists
+                next_round = InterviewRound.objects.filter(
+                    contact=self.contact,
+                    round_number=self.interview_round.round_number + 1
+                ).first()
+                if next_round:
+                    next_round.activate_if_ready()
+        
+        self._loaded_status = self.status
+        self._loaded_completed_at = self.completed_at
 
     def __str__(self):
         round_info = f"Round {self.interview_round.round_number}" if self.interview_round else "No Round"
@@ -218,3 +364,134 @@ class Response(models.Model):
 
     def __str__(self):
         return f"Response: {self.interview.contact.name} - Q{self.question.id}"
+
+    @classmethod
+    def bulk_upsert(cls, interview, answers):
+        """
+        Insert or update the responses of an interview in one statement,
+        using the (interview, question) unique key. `answers` maps question
+        ids to answers. Returns the saved responses keyed by question id.
+        """
+        if not answers:
+            return {}
+        cls.objects.bulk_create(
+            [
+                cls(interview=interview, question_id=question_id, answer=answer)
+                for question_id, answer in answers.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['interview', 'question'],
+            update_fields=['answer', 'updated_at'],
+        )
+        return {
+            response.question_id: response
+            for response in cls.objects.filter(interview=interview, question_id__in=answers.keys())
+        }
+
+
+class FormFieldValue(models.Model):
+    """Typed, indexed copy of a single Interview.form_data path, used for reporting"""
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name='form_values')
+    path = models.CharField(max_length=255)
+    value_text = models.CharField(max_length=255, null=True, blank=True)
+    value_number = models.FloatField(null=True, blank=True)
+    value_bool = models.BooleanField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ['interview', 'path']
+        indexes = [
+            models.Index(fields=['path', 'value_text'], name='formfield_path_text'),
+            models.Index(fields=['path', 'value_number'], name='formfield_path_number'),
+        ]
+
+    def __str__(self):
+        return f"{self.path} = {self.value_text}"
+
+
+class DashboardCounter(models.Model):
+    """Incrementally maintained count used by the supervisor dashboard"""
+    SCOPE_CHOICES = [
+        ('contact_status', 'Contacts per status'),
+        ('round_status', 'Rounds per status'),
+        ('interviews_completed', 'Interviews completed per day'),
+    ]
+
+    scope = models.CharField(max_length=30, choices=SCOPE_CHOICES)
+    key = models.CharField(max_length=50)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['scope', 'key']
+        ordering = ['scope', 'key']
+
+    def __str__(self):
+        return f"{self.scope}:{self.key} = {self.value}"
+
+
+class ArchivedContact(models.Model):
+    """
+    A fully completed contact moved out of the hot tables together with its
+    rounds, interviews, responses and form values (see archive.py). The graph
+    is kept as one zlib-compressed JSON document per contact.
+    """
+    contact_id = models.BigIntegerField(unique=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='archived_contacts')
+    name = models.CharField(max_length=255)
+    phone_key = models.CharField(max_length=20, blank=True, default='', db_index=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    payload = models.BinaryField()
+
+    class Meta:
+        ordering = ['-archived_at']
+
+    def __str__(self):
+        return f"Archived {self.name} (contact {self.contact_id})"
+
+
+class SyncTombstone(models.Model):
+    """A deleted contact, round or interview, reported by the delta sync feed (see sync.py)"""
+    KIND_CHOICES = [
+        ('contact', 'Contact'),
+        ('interview_round', 'Interview round'),
+        ('interview', 'Interview'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    contact_id = models.BigIntegerField()
+    # Plain ids rather than foreign keys: the rows they point at may be deleted
+    # in the same transaction
+    owner_id = models.BigIntegerField(null=True, blank=True, help_text='User whose feed reports the deletion')
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['owner_id', 'deleted_at', 'id'], name='tombstone_owner_deleted_id'),
+            models.Index(fields=['contact_id', 'deleted_at', 'id'], name='tombstone_contact_deleted_id'),
+        ]
+
+    def __str__(self):
+        return f"Deleted {self.kind} {self.object_id}"
+
+
+class SyncOperation(models.Model):
+    """
+    Result of an operation applied by the sync upload, keyed by the client's
+    idempotency key so that replays return it instead of writing again
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sync_operations')
+    key = models.CharField(max_length=100)
+    operation = models.CharField(max_length=30)
+    status_code = models.PositiveSmallIntegerField()
+    result = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='syncoperation_user_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.operation} {self.key} ({self.status_code})"
@@ -0,0 +1,204 @@
+"""
+Interview write operations shared by the single-call endpoints and the
+batched sync upload (see upload.py). Failures raise OperationError carrying
+the HTTP status and message the endpoints return.
+"""
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, models, transaction
+from django.utils import timezone
+
+from contacts.models import Contact
+from .form_fields import extract_form_fields
+from .models import Interview, InterviewRound, Question, Response
+
+
+class OperationError(Exception):
+    def __init__(self, message, status_code=400, details=None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.details = details
+
+    def as_data(self):
+        data = {'error': self.message}
+        if self.details is not None:
+            data['details'] = self.details
+        return data
+
+
+def check_startable(interview_round, user):
+    if interview_round.is_leased_by_other(user):
+        raise OperationError(
+            'This round is assigned to another interviewer', 409,
+            {'lease_expires_at': interview_round.lease_expires_at}
+        )
+
+    if not interview_round.can_start_interview():
+        raise OperationError('Cannot start interview for this round', 400, {
+            'status': interview_round.status,
+            'scheduled_at': interview_round.scheduled_at,
+            'can_start': interview_round.can_start_interview()
+        })
+
+
+def open_interview(interview_round):
+    return Interview.objects.filter(
+        interview_round=interview_round,
+        status__in=['in_progress', 'paused']
+    ).first()
+
+
+def lock_round(round_id):
+    """
+    Lock a round row until the end of the transaction and return it.
+
+    SQLite has no row locks and ignores select_for_update(). There a no-op
+    UPDATE is run as the first statement of the transaction instead. It takes
+    the database write lock, which concurrent starts wait for, up to the
+    connection timeout. Other transactions and reads keep the default
+    deferred locking.
+    """
+    if not connection.features.has_select_for_update:
+        InterviewRound.objects.filter(pk=round_id).update(status=models.F('status'))
+    return InterviewRound.objects.select_for_update().get(pk=round_id)
+
+
+def start_round(user, contact_id, round_number):
+    """
+    Start the interview of a contact's round, or resume the open one.
+    Returns (interview, created).
+
+    Resuming takes no lock. Creating locks the round row, so concurrent
+    starts of the same round queue up and the later ones resume the
+    interview the first one created. The interview_one_open_per_round
+    constraint backs this up on databases without row locks.
+    """
+    try:
+        contact_id, round_number = int(contact_id), int(round_number)
+    except (TypeError, ValueError):
+        raise OperationError('contact_id and round_number must be integers', 400)
+
+    try:
+        interview_round = InterviewRound.objects.get(contact_id=contact_id, round_number=round_number)
+    except InterviewRound.DoesNotExist:
+        if not Contact.objects.filter(id=contact_id).exists():
+            raise OperationError('Contact not found', 404)
+        raise OperationError('Interview round not found', 404)
+
+    check_startable(interview_round, user)
+    existing_interview = open_interview(interview_round)
+    if existing_interview:
+        return existing_interview, False
+
+    try:
+        with transaction.atomic():
+            interview_round = lock_round(interview_round.pk)
+            # Another request may have started the round while this one waited for the lock
+            check_startable(interview_round, user)
+            existing_interview = open_interview(interview_round)
+            if existing_interview:
+                return existing_interview, False
+
+            interview = Interview.objects.create(
+                contact_id=interview_round.contact_id,
+                interviewer=user,
+                interview_round=interview_round,
+                status='in_progress',
+                stage=1,
+                current_question_index=0
+            )
+
+            # Update interview round status to active
+            interview_round.status = 'active'
+            interview_round.save()
+    except (IntegrityError, ValidationError):
+        existing_interview = open_interview(interview_round)
+        if existing_interview is None:
+            raise
+        return existing_interview, False
+    return interview, True
+
+
+def get_own_interview(user, interview_id, message='Interview not found'):
+    try:
+        return Interview.objects.get(id=interview_id, interviewer=user)
+    except (Interview.DoesNotExist, ValueError, TypeError):
+        raise OperationError(message, 404)
+
+
+def submit_xform(user, interview_id, form_data, status='completed'):
+    """Store the XForm data of an interview, completing it unless another status is given"""
+    interview = get_own_interview(user, interview_id, 'Interview not found or access denied')
+    if not form_data:
+        raise OperationError('form_data is required', 400)
+
+    interview.form_data = form_data
+    interview.status = status
+
+    # Set completion time if status is completed
+    if interview.status == 'completed':
+        interview.completed_at = timezone.now()
+
+    with transaction.atomic():
+        interview.save()
+        extract_form_fields([interview])
+    return interview
+
+
+def check_response_items(items):
+    """
+    Validate response items ([{"question_id": ..., "answer": ...}]) with one
+    query for the questions. Returns (results, answers): a result per item,
+    {"index", "question_id"} plus "error" when the item is invalid, and the
+    valid answers keyed by question id, where later items for the same
+    question win.
+    """
+    if not isinstance(items, list) or not items:
+        raise OperationError('responses must be a non-empty list', 400)
+
+    results = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results.append({'index': index, 'error': 'Each item must be an object'})
+            continue
+        question_id = item.get('question_id')
+        # Floats, booleans and numeric strings would be silently coerced by int()
+        if not isinstance(question_id, int) or isinstance(question_id, bool):
+            results.append({'index': index, 'error': 'question_id must be an integer'})
+            continue
+        result = {'index': index, 'question_id': question_id}
+        if item.get('answer') is None:
+            result['error'] = 'answer is required'
+        results.append(result)
+
+    known = set(Question.objects.filter(
+        id__in={result['question_id'] for result in results if 'error' not in result}
+    ).values_list('id', flat=True))
+    answers = {}
+    for result in results:
+        if 'error' in result:
+            continue
+        if result['question_id'] not in known:
+            result['error'] = 'Question not found'
+            continue
+        answers[result['question_id']] = items[result['index']]['answer']
+    return results, answers
+
+
+def save_answers(interview, answers):
+    """Upsert `answers` ({question_id: answer}); returns {question_id: response}"""
+    with transaction.atomic():
+        return Response.bulk_upsert(interview, answers)
+
+
+def upsert_responses(user, interview_id, items):
+    """
+    Save all of `items` for the user's interview, or nothing when any item is
+    invalid (see check_response_items). Returns (interview, {question_id: response}).
+    """
+    interview = get_own_interview(user, interview_id)
+    results, answers = check_response_items(items)
+    errors = [result for result in results if 'error' in result]
+    if errors:
+        raise OperationError('Invalid responses', 400, errors)
+    return interview, save_answers(interview, answers)
@@ -0,0 +1,56 @@
+"""
+Autosave of interview progress (current_question_index and stage).
+
+Progress is written with a single conditional UPDATE scoped to the owning
+interviewer and an open interview, without loading the row or running
+full_clean(). Repeated saves of the same position are coalesced through the
+cache: a save matching the last written position within the coalesce window
+does not touch the database at all.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Interview
+
+PROGRESS_FIELDS = ['current_question_index', 'stage']
+OPEN_STATUSES = ['in_progress', 'paused']
+
+
+def coalesce_window():
+    return getattr(settings, 'INTERVIEW_AUTOSAVE_COALESCE_SECONDS', 5)
+
+
+def progress_cache_key(interview_id):
+    return f'interviews:progress:{interview_id}'
+
+
+def forget_progress(interview_id):
+    """Drop the coalescing entry, e.g. after a full save changed the interview"""
+    cache.delete(progress_cache_key(interview_id))
+
+
+def save_progress(interview_id, user, progress):
+    """
+    Persist `progress` ({field: value} for PROGRESS_FIELDS) for the user's
+    open interview. Returns True when written, False when coalesced with the
+    previous save and None when there is no such open interview.
+    """
+    progress = {field: progress[field] for field in PROGRESS_FIELDS if field in progress}
+    key = progress_cache_key(interview_id)
+    last = cache.get(key)
+    if (last is not None and last['user'] == user.pk
+            and all(last['progress'].get(field) == value for field, value in progress.items())):
+        return False
+
+    written = Interview.objects.filter(
+        id=interview_id, interviewer=user, status__in=OPEN_STATUSES
+    ).update(updated_at=timezone.now(), **progress)
+    if not written:
+        forget_progress(interview_id)
+        return None
+
+    merged = dict(last['progress']) if last is not None and last['user'] == user.pk else {}
+    merged.update(progress)
+    cache.set(key, {'user': user.pk, 'progress': merged}, timeout=coalesce_window())
+    return True
@@ -0,0 +1,184 @@
+"""
+Server-side questionnaire routing.
+
+`Question.routing_logic` is interpreted as:
+
+    {
+        "rules": [
+            {"when": {"operator": "equals", "value": "yes"}, "goto": 42},
+            {"when": {"question": 7, "operator": "gt", "value": 5}, "goto": "end"}
+        ],
+        "default": 43
+    }
+
+A bare list is accepted as the rules. Rules are checked in order once the
+question is answered; `when.question` defaults to the question itself.
+Every rule needs a `goto`. `goto`/`default` is a question id or "end";
+without a matching rule or default the next question in (stage, order)
+sequence follows.
+
+The rules of a round's questionnaire are compiled into a decision graph that
+is cached per process and rebuilt only when the question catalog version
+changes (see catalog.py), so routing is a dictionary walk instead of a rescan
+of the questionnaire.
+"""
+import threading
+
+from django.db import models
+
+from .catalog import get_catalog_version
+from .models import Question
+
+END = 'end'
+
+OPERATORS = {
+    'equals': lambda answer, value: answer == value,
+    'not_equals': lambda answer, value: answer != value,
+    'in': lambda answer, value: answer in (value or []),
+    'not_in': lambda answer, value: answer not in (value or []),
+    'contains': lambda answer, value: isinstance(answer, (list, str)) and value in answer,
+    'gt': lambda answer, value: answer is not None and answer > value,
+    'gte': lambda answer, value: answer is not None and answer >= value,
+    'lt': lambda answer, value: answer is not None and answer < value,
+    'lte': lambda answer, value: answer is not None and answer <= value,
+    'answered': lambda answer, value: answer not in (None, '', []),
+    'not_answered': lambda answer, value: answer in (None, '', []),
+}
+
+
+class RoutingError(Exception):
+    pass
+
+
+class CompiledNode:
+    __slots__ = ['question', 'index', 'rules', 'default']
+
+    def __init__(self, question, index, rules, default):
+        self.question = question
+        self.index = index
+        self.rules = rules
+        self.default = default
+
+
+class RoutingGraph:
+    """Decision graph for one round's questionnaire"""
+
+    def __init__(self, questions):
+        self.questions = list(questions)
+        self.nodes = {}
+        ids = [question.id for question in self.questions]
+        for index, question in enumerate(self.questions):
+            sequential = ids[index + 1] if index + 1 < len(ids) else END
+            rules, default = self._compile(question, set(ids))
+            self.nodes[question.id] = CompiledNode(
+                question, index, rules, sequential if default is None else default
+            )
+        self.start = ids[0] if ids else END
+
+    @staticmethod
+    def _label(question):
+        return f"Question {question.id}" if question.id else "Routing logic"
+
+    @classmethod
+    def _target(cls, value, known_ids, question, strict=False):
+        if value is None or value == END:
+            return value
+        try:
+            target = int(value)
+        except (TypeError, ValueError):
+            raise RoutingError(f"{cls._label(question)} routes to invalid target {value!r}")
+        if strict and target not in known_ids:
+            raise RoutingError(f"{cls._label(question)} routes to unknown question {target}")
+        # Targets outside this round's questionnaire end the interview
+        return target if target in known_ids else END
+
+    @classmethod
+    def _compile(cls, question, known_ids, strict=False):
+        """
+        (rules, default) of a question. With `strict`, targets missing from
+        `known_ids` are rejected instead of ending the interview.
+        """
+        logic = question.routing_logic
+        if not logic:
+            return [], None
+        if isinstance(logic, list):
+            logic = {'rules': logic}
+        if not isinstance(logic, dict) or not isinstance(logic.get('rules') or [], list):
+            raise RoutingError(f"{cls._label(question)} has invalid routing logic")
+
+        rules = []
+        for rule in logic.get('rules') or []:
+            condition = (rule.get('when') or {}) if isinstance(rule, dict) else None
+            if not isinstance(condition, dict):
+                raise RoutingError(f"{cls._label(question)} has an invalid rule {rule!r}")
+            operator = OPERATORS.get(condition.get('operator', 'equals'))
+            if operator is None:
+                raise RoutingError(
+                    f"{cls._label(question)} uses unknown operator {condition.get('operator')!r}"
+                )
+            source = question.id
+            if 'question' in condition:
+                try:
+                    source = int(condition['question'])
+                except (TypeError, ValueError):
+                    raise RoutingError(
+                        f"{cls._label(question)} has an invalid rule source {condition['question']!r}"
+                    )
+            if rule.get('goto') is None:
+                raise RoutingError(f"{cls._label(question)} has a rule without goto")
+            target = cls._target(rule['goto'], known_ids, question, strict)
+            rules.append((source, operator, condition.get('value'), target))
+        return rules, cls._target(logic.get('default'), known_ids, question, strict)
+
+    def next_question(self, answers):
+        """
+        Walk the graph from the start using `answers` ({question_id: answer})
+        and return the first question that has not been answered yet, or None
+        when the questionnaire is finished. A key present with a null answer
+        counts as skipped.
+        """
+        current = self.start
+        visited = set()
+        while current != END:
+            if current in visited:
+                raise RoutingError(f"Routing loop detected at question {current}")
+            visited.add(current)
+            node = self.nodes[current]
+            if current not in answers:
+                return node
+            current = node.default
+            for source, operator, value, target in node.rules:
+                try:
+                    matched = operator(answers.get(source), value)
+                except TypeError:
+                    matched = False
+                if matched:
+                    current = target
+                    break
+        return None
+
+
+def validate_routing_logic(question):
+    """Raise RoutingError when the routing_logic of `question` is malformed or routes to a missing question"""
+    RoutingGraph._compile(question, set(Question.objects.values_list('id', flat=True)), strict=True)
+
+
+_graphs = {}
+_lock = threading.Lock()
+
+
+def get_routing_graph(round_number):
+    """Compiled graph for a round, rebuilt only when the catalog version changes"""
+    version = get_catalog_version()
+    cached = _graphs.get(round_number)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    queryset = Question.objects.order_by('stage', 'order', 'id')
+    if round_number:
+        queryset = queryset.filter(models.Q(round__isnull=True) | models.Q(round=round_number))
+    graph = RoutingGraph(queryset)
+
+    with _lock:
+        _graphs[round_number] = (version, graph)
+    return graph
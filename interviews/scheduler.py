@@ -0,0 +1,122 @@
+import logging
+import os
+import sys
+import threading
+
+from django.db import close_old_connections, models, transaction
+from django.utils import timezone
+
+from contacts.models import Contact
+from . import counters
+from .models import InterviewRound
+
+logger = logging.getLogger(__name__)
+
+
+def due_rounds(now=None):
+    """
+    Pending rounds whose scheduled time has passed and whose previous rounds
+    are all completed. The previous-round check runs in SQL as a NOT EXISTS
+    subquery, and the (status, scheduled_at) index serves the outer filter.
+    """
+    now = now or timezone.now()
+    unfinished_previous = InterviewRound.objects.filter(
+        contact=models.OuterRef('contact'),
+        round_number__lt=models.OuterRef('round_number')
+    ).exclude(status='completed')
+
+    return InterviewRound.objects.filter(
+        status='pending',
+        scheduled_at__lte=now
+    ).exclude(
+        models.Exists(unfinished_previous)
+    ).order_by('scheduled_at', 'id')
+
+
+def activate_due_rounds(now=None, batch_size=500):
+    """
+    Activate every due round in batches and refresh the status of the
+    affected contacts in the same transaction as each batch.
+
+    Several runners may work at once (the in-process scheduler of each
+    worker, the management command). Each batch is locked with SKIP LOCKED
+    where the database supports it and claimed with an UPDATE that only
+    matches still pending rows, so a round is activated, and counted, once.
+    """
+    now = now or timezone.now()
+    activated = 0
+    contacts_updated = 0
+
+    while True:
+        with transaction.atomic():
+            batch = list(
+                due_rounds(now).select_for_update(skip_locked=True).values_list('id', 'contact_id')[:batch_size]
+            )
+            if not batch:
+                break
+
+            claimed = InterviewRound.objects.filter(
+                id__in=[round_id for round_id, _ in batch], status='pending'
+            ).update(status='active', updated_at=now)
+            if not claimed:
+                # Another runner activated the whole batch first
+                break
+            counters.apply_deltas({
+                (counters.ROUND_STATUS, 'pending'): -claimed,
+                (counters.ROUND_STATUS, 'active'): claimed,
+            })
+
+            contacts_updated += Contact.bulk_update_status_from_rounds(
+                {contact_id for _, contact_id in batch}
+            )
+        activated += claimed
+
+    return {'activated': activated, 'contacts_updated': contacts_updated}
+
+
+class RoundActivationScheduler(threading.Thread):
+    """In-process periodic runner for activate_due_rounds()"""
+
+    def __init__(self, interval, batch_size=500):
+        super().__init__(name='round-activation-scheduler', daemon=True)
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            close_old_connections()
+            try:
+                result = activate_due_rounds(batch_size=self.batch_size)
+                if result['activated']:
+                    logger.info('Activated %(activated)s rounds, updated %(contacts_updated)s contacts', result)
+            except Exception:
+                logger.exception('Round activation pass failed')
+            finally:
+                close_old_connections()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_scheduler = None
+
+
+def is_serving_process(argv=None):
+    """
+    False for management commands other than runserver, and for the
+    autoreloader's parent process of runserver, which serves no requests.
+    """
+    argv = sys.argv if argv is None else argv
+    if len(argv) > 1 and os.path.basename(argv[0]) in ('manage.py', 'django-admin'):
+        return argv[1] == 'runserver' and (os.environ.get('RUN_MAIN') == 'true' or '--noreload' in argv)
+    return True
+
+
+def start_scheduler(interval, batch_size=500):
+    """Start the in-process scheduler once per process"""
+    global _scheduler
+    if _scheduler is None or not _scheduler.is_alive():
+        _scheduler = RoundActivationScheduler(interval, batch_size=batch_size)
+        _scheduler.start()
+    return _scheduler
@@ -0,0 +1,159 @@
+import calendar
+from datetime import date, timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+
+class BusinessCalendar:
+    """
+    Business-day calendar used to schedule interview rounds.
+
+    Rounds are placed an interval after the previous round and then rolled
+    forward past weekends and holidays. Intervals are rules per round number,
+    either {'days': N} or {'months': N}; rounds without a rule use the
+    default interval. Rolled dates are memoized per calendar day, so
+    scheduling thousands of contacts that share start dates only resolves
+    each distinct day once.
+    """
+
+    def __init__(self, holidays=(), weekend_days=(5, 6), default_interval=None, intervals=None):
+        self.holidays = frozenset(self._to_date(day) for day in holidays)
+        self.weekend_days = frozenset(weekend_days)
+        if len(self.weekend_days) >= 7:
+            raise ValueError('A calendar needs at least one working weekday')
+        self.default_interval = default_interval or {'days': 90}
+        self.intervals = {int(k): v for k, v in (intervals or {}).items()}
+        self._roll_cache = {}
+
+    @staticmethod
+    def _to_date(value):
+        if isinstance(value, date):
+            return value
+        return date.fromisoformat(str(value).strip())
+
+    @staticmethod
+    def _add_months(day, months):
+        month_index = day.month - 1 + months
+        year = day.year + month_index // 12
+        month = month_index % 12 + 1
+        return day.replace(year=year, month=month, day=min(day.day, calendar.monthrange(year, month)[1]))
+
+    def is_business_day(self, day):
+        return day.weekday() not in self.weekend_days and day not in self.holidays
+
+    def roll_forward(self, day):
+        """Return `day` if it is a business day, otherwise the next one"""
+        rolled = self._roll_cache.get(day)
+        if rolled is None:
+            rolled = day
+            while not self.is_business_day(rolled):
+                rolled += timedelta(days=1)
+            self._roll_cache[day] = rolled
+        return rolled
+
+    def interval_for(self, round_number):
+        return self.intervals.get(round_number, self.default_interval)
+
+    def add_interval(self, day, round_number=None, interval=None):
+        rule = interval or self.interval_for(round_number)
+        if 'months' in rule:
+            day = self._add_months(day, int(rule['months']))
+        return day + timedelta(days=int(rule.get('days', 0)))
+
+    def next_round_date(self, previous, round_number=None, interval=None):
+        """
+        Date of the round following `previous`, keeping its time of day.
+        `interval` ({'days': N} or {'months': N}) overrides the round's rule.
+        """
+        previous_day = previous.date() if hasattr(previous, 'date') else previous
+        target_day = self.roll_forward(self.add_interval(previous_day, round_number, interval))
+        return previous + (target_day - previous_day)
+
+    def round_dates(self, start, rounds=4):
+        """Scheduled datetimes for rounds 1..`rounds` starting at `start`"""
+        dates = [start]
+        for round_number in range(2, rounds + 1):
+            dates.append(self.next_round_date(dates[-1], round_number))
+        return dates
+
+    def schedule_many(self, starts, rounds=4):
+        """
+        Compute round dates for many start datetimes in one call. Day offsets
+        are resolved once per distinct start day and applied to every start
+        falling on that day.
+        """
+        offsets = {}
+        schedules = []
+        for start in starts:
+            start_day = start.date()
+            day_offsets = offsets.get(start_day)
+            if day_offsets is None:
+                day_offsets = [day - start_day for day in self.round_dates(start_day, rounds)]
+                offsets[start_day] = day_offsets
+            schedules.append([start + offset for offset in day_offsets])
+        return schedules
+
+
+@lru_cache(maxsize=1)
+def get_calendar():
+    """The calendar configured in settings"""
+    return BusinessCalendar(
+        holidays=[day for day in getattr(settings, 'ROUND_HOLIDAYS', []) if day],
+        weekend_days=getattr(settings, 'ROUND_WEEKEND_DAYS', (5, 6)),
+        default_interval={'days': getattr(settings, 'ROUND_INTERVAL_DAYS', 90)},
+        intervals=getattr(settings, 'ROUND_INTERVALS', {}),
+    )
+
+
+@receiver(setting_changed)
+def _reset_calendar(setting, **kwargs):
+    if setting.startswith('ROUND_'):
+        get_calendar.cache_clear()
+
+
+def reschedule_following_rounds(completions, business_calendar=None):
+    """
+    Push later pending rounds back when a round finished late.
+
+    `completions` is an iterable of (contact_id, round_number, completed_at).
+    Every pending round after the completed one is moved to at least one
+    interval after its predecessor. All affected rounds are loaded with one
+    query and written back with bulk_update. Returns the moved rounds.
+    """
+    from .models import InterviewRound
+
+    business_calendar = business_calendar or get_calendar()
+    latest = {}
+    for contact_id, round_number, completed_at in completions:
+        current = latest.get(contact_id)
+        if current is None or round_number > current[0]:
+            latest[contact_id] = (round_number, completed_at)
+    if not latest:
+        return []
+
+    pending = InterviewRound.objects.filter(
+        contact_id__in=latest.keys(),
+        status='pending'
+    ).only('id', 'contact_id', 'round_number', 'scheduled_at', 'updated_at').order_by('contact_id', 'round_number')
+
+    now = timezone.now()
+    moved = []
+    previous = {}
+    for interview_round in pending:
+        completed_round_number, completed_at = latest[interview_round.contact_id]
+        if interview_round.round_number <= completed_round_number:
+            continue
+        previous_date = previous.get(interview_round.contact_id, completed_at)
+        earliest = business_calendar.next_round_date(previous_date, interview_round.round_number)
+        if earliest > interview_round.scheduled_at:
+            interview_round.scheduled_at = earliest
+            interview_round.updated_at = now
+            moved.append(interview_round)
+        previous[interview_round.contact_id] = interview_round.scheduled_at
+
+    InterviewRound.objects.bulk_update(moved, ['scheduled_at', 'updated_at'], batch_size=500)
+    return moved
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Interview, Question, Response, InterviewRound
+from .routing import RoutingError, validate_routing_logic
 from contacts.serializers import ContactSerializer
 
 
@@ -11,6 +12,13 @@ class QuestionSerializer(serializers.ModelSerializer):
             'required', 'order', 'round', 'created_at'
         ]
 
+    def validate_routing_logic(self, value):
+        try:
+            validate_routing_logic(Question(id=getattr(self.instance, 'id', None), routing_logic=value))
+        except RoutingError as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
 
 class InterviewRoundSerializer(serializers.ModelSerializer):
     can_start_interview = serializers.ReadOnlyField()
@@ -93,6 +101,26 @@ class InterviewSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class InterviewListSerializer(InterviewSerializer):
+    """Lighter interview representation for lists, without the responses array"""
+
+    class Meta(InterviewSerializer.Meta):
+        fields = [
+            field for field in InterviewSerializer.Meta.fields if field != 'responses'
+        ]
+
+
+class InterviewProgressSerializer(serializers.Serializer):
+    """Progress fields accepted by the autosave endpoint"""
+    current_question_index = serializers.IntegerField(min_value=0, required=False)
+    stage = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError('current_question_index or stage is required')
+        return attrs
+
+
 class ContactInterviewRoundsSerializer(serializers.Serializer):
     """Serializer for getting all rounds for a contact"""
     contact_id = serializers.IntegerField()
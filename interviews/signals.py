@@ -0,0 +1,41 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from contacts.models import Contact
+from . import counters, sync
+from .catalog import bump_catalog_version
+from .models import Interview, InterviewRound, Question
+from .progress import forget_progress
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_question_catalog(sender, **kwargs):
+    bump_catalog_version()
+
+
+@receiver(post_save, sender=Interview)
+def reset_progress_coalescing(sender, instance, **kwargs):
+    # A full save may have moved the interview; the next autosave must be written
+    forget_progress(instance.pk)
+
+
+@receiver(post_delete, sender=Contact)
+def count_deleted_contact(sender, instance, **kwargs):
+    counters.apply_deltas({(counters.CONTACT_STATUS, instance.status): -1})
+    sync.record_deletion('contact', instance.pk, instance.pk, instance.created_by_id)
+
+
+@receiver(post_delete, sender=InterviewRound)
+def count_deleted_round(sender, instance, **kwargs):
+    counters.apply_deltas({(counters.ROUND_STATUS, instance.status): -1})
+    sync.record_deletion('interview_round', instance.pk, instance.contact_id, instance.owner_id)
+
+
+@receiver(post_delete, sender=Interview)
+def count_deleted_interview(sender, instance, **kwargs):
+    if instance.status == 'completed':
+        counters.apply_deltas({
+            (counters.INTERVIEWS_COMPLETED, counters.completion_key(instance.completed_at)): -1
+        })
+    sync.record_deletion('interview', instance.pk, instance.contact_id, instance.interviewer_id)
@@ -0,0 +1,215 @@
+"""
+Delta sync ("changes since") for clients.
+
+A client pages through GET /api/interviews/sync/ until `has_more` is false
+and keeps the last `cursor`. Polling with that cursor later returns only the
+contacts, rounds and interviews whose `updated_at` moved past it, plus the
+ids of rows deleted since (tombstones). Every collection is read in
+(updated_at, id) order from an index, so a poll costs what changed instead
+of the size of the dataset.
+
+Once a page reaches the end of a collection, its position is held back to
+SYNC_WATERMARK_LAG_SECONDS before the read, so rows written by transactions
+that committed late are sent on the next poll. Clients apply rows as
+upserts, which makes the few repeated rows harmless.
+"""
+import base64
+import binascii
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from contacts.models import Contact
+from contacts.serializers import ContactSerializer
+from .models import Interview, InterviewRound, SyncTombstone
+from .serializers import InterviewListSerializer, InterviewRoundSerializer
+
+DEFAULT_LIMIT = 200
+MAX_LIMIT = 1000
+
+_pending_tombstones = ContextVar('pending_sync_tombstones', default=None)
+
+
+class SyncCursorError(Exception):
+    """The cursor cannot be decoded"""
+
+
+class SyncCursorExpired(Exception):
+    """The cursor is older than the kept tombstones; the client must sync from scratch"""
+
+
+# name: (cursor key, queryset for a user, serializer); every queryset is
+# sought on an (owner, updated_at, id) index
+COLLECTIONS = {
+    'contacts': (
+        'c',
+        lambda user: Contact.objects.filter(created_by=user).with_interview_summary(),
+        ContactSerializer,
+    ),
+    'interview_rounds': (
+        'r',
+        lambda user: InterviewRound.objects.filter(owner=user),
+        InterviewRoundSerializer,
+    ),
+    'interviews': (
+        'i',
+        lambda user: Interview.objects.filter(interviewer=user).with_related(include_responses=False),
+        InterviewListSerializer,
+    ),
+}
+TOMBSTONE_KEY = 't'
+TOMBSTONE_GROUPS = {
+    'contact': 'contacts',
+    'interview_round': 'interview_rounds',
+    'interview': 'interviews',
+}
+
+
+def record_deletion(kind, object_id, contact_id, owner_id=None):
+    """Store a tombstone, or queue it when inside batched()"""
+    tombstone = SyncTombstone(kind=kind, object_id=object_id, contact_id=contact_id, owner_id=owner_id)
+    pending = _pending_tombstones.get()
+    if pending is not None:
+        pending.append(tombstone)
+    else:
+        tombstone.save()
+
+
+@contextmanager
+def batched():
+    """Write the tombstones of every deletion made inside the block with one bulk insert"""
+    pending = []
+    token = _pending_tombstones.set(pending)
+    try:
+        yield pending
+    finally:
+        _pending_tombstones.reset(token)
+    SyncTombstone.objects.bulk_create(pending, batch_size=500)
+
+
+def user_tombstones(user):
+    """Deletions of the user's contacts, rounds and interviews"""
+    return SyncTombstone.objects.filter(owner_id=user.id)
+
+
+def encode_cursor(positions):
+    payload = {
+        key: None if position is None else [position[0].isoformat(), position[1]]
+        for key, position in positions.items()
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+
+
+def decode_cursor(token):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+        positions = {}
+        for key in [key for key, _, _ in COLLECTIONS.values()] + [TOMBSTONE_KEY]:
+            if payload[key] is None and key != TOMBSTONE_KEY:
+                positions[key] = None
+                continue
+            moment, pk = payload[key]
+            positions[key] = (parse_moment(moment), int(pk))
+        return positions
+    except (binascii.Error, TypeError, KeyError, ValueError, SyncCursorError):
+        raise SyncCursorError('Invalid cursor')
+
+
+def parse_moment(value):
+    """An aware datetime from an ISO 8601 string; naive values are taken in the current time zone"""
+    try:
+        # None when malformed, ValueError for impossible values such as month 13
+        moment = parse_datetime(value)
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise SyncCursorError('since must be an ISO 8601 timestamp')
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def initial_positions(since=None):
+    """Positions for a first sync (everything) or for changes since a timestamp"""
+    positions = {key: None if since is None else (since, 0) for key, _, _ in COLLECTIONS.values()}
+    # Rows deleted before a full sync are simply absent from it
+    positions[TOMBSTONE_KEY] = (since or timezone.now() - watermark_lag(), 0)
+    return positions
+
+
+def watermark_lag():
+    return timedelta(seconds=getattr(settings, 'SYNC_WATERMARK_LAG_SECONDS', 5))
+
+
+def seek(queryset, field, position):
+    """
+    The rows strictly after `position` (None: from the start) in (field, id)
+    order. The `field >= moment` bound gives the index a range start; the OR
+    alone would not.
+    """
+    if position is not None:
+        moment, pk = position
+        queryset = queryset.filter(**{f'{field}__gte': moment}).filter(
+            models.Q(**{f'{field}__gt': moment}) | models.Q(**{field: moment, 'id__gt': pk})
+        )
+    return queryset.order_by(field, 'id')
+
+
+def read_after(queryset, field, position, limit):
+    """Up to `limit` rows after `position` and whether more follow"""
+    rows = list(seek(queryset, field, position)[:limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+def advance(position, last, has_more, horizon):
+    """The position after a page whose last (moment, id) is `last` (None when empty)"""
+    if last is not None:
+        position = last
+    if not has_more and (position is None or position > (horizon, 0)):
+        # Caught up: re-read the last few seconds on the next poll
+        position = (horizon, 0)
+    return position
+
+
+def changes_since(user, positions, limit=DEFAULT_LIMIT, context=None):
+    """One page of changes after `positions`: the serialized rows, tombstones and next cursor"""
+    retention = timedelta(days=getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+    now = timezone.now()
+    if positions[TOMBSTONE_KEY][0] < now - retention:
+        raise SyncCursorExpired('Cursor expired, sync from scratch')
+    horizon = now - watermark_lag()
+
+    result = {}
+    next_positions = {}
+    has_more = False
+    for name, (key, queryset, serializer_class) in COLLECTIONS.items():
+        rows, more = read_after(queryset(user), 'updated_at', positions[key], limit)
+        last = (rows[-1].updated_at, rows[-1].id) if rows else None
+        result[name] = serializer_class(rows, many=True, context=context or {}).data
+        next_positions[key] = advance(positions[key], last, more, horizon)
+        has_more = has_more or more
+
+    tombstones, more = read_after(user_tombstones(user), 'deleted_at', positions[TOMBSTONE_KEY], limit)
+    result['deleted'] = {group: [] for group in TOMBSTONE_GROUPS.values()}
+    for tombstone in tombstones:
+        result['deleted'][TOMBSTONE_GROUPS[tombstone.kind]].append(tombstone.object_id)
+    last = (tombstones[-1].deleted_at, tombstones[-1].id) if tombstones else None
+    next_positions[TOMBSTONE_KEY] = advance(positions[TOMBSTONE_KEY], last, more, horizon)
+
+    result['cursor'] = encode_cursor(next_positions)
+    result['has_more'] = has_more or more
+    return result
+
+
+def prune_tombstones(days=None):
+    """Delete tombstones older than the retention period; returns how many"""
+    if days is None:
+        days = getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 30)
+    deleted, _ = SyncTombstone.objects.filter(deleted_at__lt=timezone.now() - timedelta(days=days)).delete()
+    return deleted
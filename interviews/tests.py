@@ -0,0 +1,632 @@
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection, connections
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from cati_system import testing
+from contacts.models import Contact
+from interviews.archive import archive_contacts, restore_contacts
+from interviews.counters import dashboard_snapshot, reconcile_counters
+from interviews import sync
+from interviews.models import ArchivedContact, DashboardCounter, Interview, InterviewRound, Question, Response
+from interviews.routing import RoutingError, RoutingGraph, get_routing_graph
+from interviews.scheduler import activate_due_rounds, due_rounds
+from interviews.scheduling import BusinessCalendar, get_calendar, reschedule_following_rounds
+from interviews.serializers import QuestionSerializer
+
+
+class InterviewQueryBudgetTests(testing.QueryBudgetTestCase):
+    ENDPOINTS = [
+        ('interview-list', 4, lambda f: '/api/interviews/'),
+        ('interview-list-responses', 5, lambda f: '/api/interviews/?include_responses=true'),
+        ('interview-list-form-filter', 4, lambda f: '/api/interviews/?form_path=region&form_value=Lagos'),
+        ('interview-detail', 5, lambda f: f"/api/interviews/{f['interview'].id}/"),
+        ('async-interview-detail', 5, lambda f: f"/api/async/interviews/{f['interview'].id}/"),
+        ('question-list', 3, lambda f: '/api/interviews/questions/'),
+        ('async-question-list', 3, lambda f: '/api/async/interviews/questions/'),
+        ('contact-interview-rounds', 5, lambda f: f"/api/interviews/contact/{f['contact'].id}/rounds/"),
+        ('async-contact-interview-rounds', 3, lambda f: f"/api/async/interviews/contact/{f['contact'].id}/rounds/"),
+        ('export-csv', 4, lambda f: '/api/interviews/export/?output=csv'),
+        ('export-ndjson', 4, lambda f: '/api/interviews/export/?output=ndjson'),
+        ('form-field-summary', 3, lambda f: '/api/interviews/form-fields/summary/?path=household.size'),
+        ('dashboard', 2, lambda f: '/api/interviews/dashboard/'),
+        ('sync-changes', 8, lambda f: '/api/interviews/sync/?limit=50'),
+    ]
+
+
+class ConcurrentStartTests(TransactionTestCase):
+    """
+    Many threads start the same round at once, as double taps and retries
+    do. Exactly one interview must be created and every caller must get it.
+    """
+    THREADS = 8
+    CONTACTS = 5
+    # Generous per-request bound; a lock wait should take milliseconds
+    MAX_SECONDS = 5
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='starter', password='starter', role='interviewer')
+        self.token = Token.objects.create(user=self.user).key
+
+    def start_concurrently(self, contact):
+        barrier = threading.Barrier(self.THREADS)
+        results = []
+
+        def start():
+            try:
+                barrier.wait()
+                started = time.perf_counter()
+                response = Client().post(
+                    f'/api/interviews/contact/{contact.id}/round/1/start/',
+                    secure=True, HTTP_AUTHORIZATION=f'Token {self.token}'
+                )
+                results.append((response.status_code, response.json().get('id'), time.perf_counter() - started))
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=start) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_starts_create_one_interview(self):
+        for index in range(self.CONTACTS):
+            contact = Contact.objects.create(name=f'Race {index}', phone=f'0803000{index:04d}', created_by=self.user)
+            results = self.start_concurrently(contact)
+
+            statuses = sorted(status_code for status_code, _, _ in results)
+            self.assertEqual(statuses, [200] * (self.THREADS - 1) + [201], results)
+            self.assertEqual(len({interview_id for _, interview_id, _ in results}), 1, results)
+            self.assertEqual(Interview.objects.filter(contact=contact).count(), 1)
+            self.assertLess(max(elapsed for _, _, elapsed in results), self.MAX_SECONDS, results)
+
+    def test_second_open_interview_is_rejected(self):
+        contact = Contact.objects.create(name='Duplicate', phone='08039999999', created_by=self.user)
+        interview_round = contact.interview_rounds.get(round_number=1)
+        Interview.objects.create(contact=contact, interviewer=self.user, interview_round=interview_round)
+        with self.assertRaises(ValidationError):
+            Interview.objects.create(contact=contact, interviewer=self.user, interview_round=interview_round)
+
+
+class InterviewUpdateTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='updater', password='updater', role='interviewer')
+        self.auth = f'Token {Token.objects.create(user=self.user).key}'
+
+    def test_completing_an_interview_moves_the_contact_to_the_next_round(self):
+        contact = Contact.objects.create(name='Updater', phone='08031111111', created_by=self.user)
+        interview_round = contact.interview_rounds.get(round_number=1)
+        interview_round.status = 'active'
+        interview_round.save()
+        interview = Interview.objects.create(contact=contact, interviewer=self.user, interview_round=interview_round)
+
+        response = self.client.patch(
+            f'/api/interviews/{interview.id}/', {'status': 'completed'},
+            content_type='application/json', secure=True, HTTP_AUTHORIZATION=self.auth
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        contact.refresh_from_db()
+        self.assertEqual(contact.status, 'round_2')
+
+
+class SyncUploadTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='uploader', password='uploader', role='interviewer')
+        self.auth = f'Token {Token.objects.create(user=self.user).key}'
+        self.contact = Contact.objects.create(name='Offline', phone='08032222222', created_by=self.user)
+
+    def upload(self, operations):
+        return self.client.post(
+            '/api/interviews/sync/upload/', {'operations': operations},
+            content_type='application/json', secure=True, HTTP_AUTHORIZATION=self.auth
+        )
+
+    def test_malformed_operation_fails_alone(self):
+        response = self.upload([
+            {'key': 'start', 'type': 'start_round', 'contact_id': self.contact.id, 'round_number': 1},
+            {'key': 'bad-id', 'type': 'progress', 'interview_id': 'zzz', 'current_question_index': 1, 'stage': 1},
+            {'key': 'bad-key', 'type': 'progress', 'interview_key': ['start'], 'current_question_index': 1, 'stage': 1},
+        ])
+        self.assertEqual(response.status_code, 200, response.content)
+        results = response.json()['results']
+        self.assertEqual([result['status'] for result in results], [201, 400, 400])
+        self.assertEqual(Interview.objects.filter(contact=self.contact).count(), 1)
+
+    def test_replayed_upload_does_not_write_again(self):
+        operations = [{'key': 'start', 'type': 'start_round', 'contact_id': self.contact.id, 'round_number': 1}]
+        first = self.upload(operations).json()['results'][0]
+        second = self.upload(operations).json()['results'][0]
+        self.assertTrue(second['replayed'])
+        self.assertEqual(first['result'], second['result'])
+        self.assertEqual(Interview.objects.filter(contact=self.contact).count(), 1)
+
+
+class ResponseBatchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='batcher', password='batcher', role='interviewer')
+        self.auth = f'Token {Token.objects.create(user=self.user).key}'
+        contact = Contact.objects.create(name='Batch', phone='08032333333', created_by=self.user)
+        self.interview = Interview.objects.create(
+            contact=contact, interviewer=self.user, interview_round=contact.interview_rounds.get(round_number=1)
+        )
+        self.questions = [
+            Question.objects.create(text=f'Question {order}', type='text', stage=1, order=order)
+            for order in range(2)
+        ]
+
+    def post(self, path, data):
+        return self.client.post(path, data, content_type='application/json', secure=True, HTTP_AUTHORIZATION=self.auth)
+
+    def batch(self, items):
+        return self.post(
+            '/api/interviews/response/batch/', {'interview_id': self.interview.id, 'responses': items}
+        )
+
+    def upload(self, items):
+        operation = {
+            'key': 'answers', 'type': 'upsert_responses', 'interview_id': self.interview.id, 'responses': items
+        }
+        return self.post('/api/interviews/sync/upload/', {'operations': [operation]}).json()['results'][0]
+
+    def test_batch_and_upload_apply_the_same_rules(self):
+        first, second = self.questions
+        items = [
+            {'question_id': first.id, 'answer': 'a'},
+            {'question_id': 999999, 'answer': 'b'},
+            {'question_id': second.id},
+            {'question_id': first.id, 'answer': 'c'},
+        ]
+        batch = self.batch(items).json()
+        upload = self.upload(items)
+
+        errors = [(result['index'], result['error']) for result in batch['results'] if 'error' in result]
+        self.assertEqual(errors, [(1, 'Question not found'), (2, 'answer is required')])
+        self.assertEqual(upload['status'], 400)
+        self.assertEqual([(error['index'], error['error']) for error in upload['details']], errors)
+        # The batch saves the valid items, later ones winning; the upload saves nothing
+        self.assertEqual(dict(self.interview.responses.values_list('question_id', 'answer')), {first.id: 'c'})
+
+    def test_question_ids_must_be_json_integers(self):
+        question = self.questions[0]
+        items = [{'question_id': value, 'answer': 'x'} for value in (question.id + 0.9, True, str(question.id))]
+        batch = self.batch(items).json()
+        self.assertEqual(batch['failed'], 3)
+        self.assertEqual({result['error'] for result in batch['results']}, {'question_id must be an integer'})
+        self.assertEqual(self.upload(items)['status'], 400)
+        self.assertFalse(self.interview.responses.exists())
+
+
+class InterviewProgressTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='autosaver', password='autosaver', role='interviewer')
+        self.auth = f'Token {Token.objects.create(user=self.user).key}'
+        contact = Contact.objects.create(name='Autosave', phone='08033333333', created_by=self.user)
+        self.interview = Interview.objects.create(
+            contact=contact, interviewer=self.user, interview_round=contact.interview_rounds.get(round_number=1)
+        )
+        self.questions = [
+            Question.objects.create(text=f'Question {order}', type='text', stage=1, order=order)
+            for order in range(2)
+        ]
+
+    def post(self, path, data):
+        return self.client.post(
+            f'/api/interviews/{self.interview.id}/{path}/', data,
+            content_type='application/json', secure=True, HTTP_AUTHORIZATION=self.auth
+        )
+
+    def test_autosave_after_next_question_is_written(self):
+        self.assertTrue(self.post('progress', {'current_question_index': 0, 'stage': 1}).json()['saved'])
+        response = self.post('next-question', {'answers': {str(self.questions[0].id): 'yes'}})
+        self.assertEqual(response.json()['index'], 1)
+
+        # Going back to the previous position must reach the database
+        self.assertTrue(self.post('progress', {'current_question_index': 0, 'stage': 1}).json()['saved'])
+        self.interview.refresh_from_db()
+        self.assertEqual(self.interview.current_question_index, 0)
+
+
+class RoundActivationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='scheduler', password='scheduler', role='interviewer')
+        for index in range(3):
+            contact = Contact.objects.create(name=f'Due {index}', phone=f'0803444{index:04d}', created_by=self.user)
+            contact.interview_rounds.filter(round_number=1).update(status='completed')
+        reconcile_counters()
+        self.later = timezone.now() + timedelta(days=200)
+
+    def test_due_rounds_are_activated(self):
+        result = activate_due_rounds(now=self.later)
+        self.assertEqual(result['activated'], 3)
+        self.assertEqual(InterviewRound.objects.filter(round_number=2, status='active').count(), 3)
+        self.assertEqual(set(Contact.objects.values_list('status', flat=True)), {'round_2'})
+
+    def test_rounds_claimed_by_another_runner_are_not_counted_twice(self):
+        due = list(due_rounds(self.later).values_list('id', flat=True))
+        activate_due_rounds(now=self.later)
+        before = dashboard_snapshot()['rounds']
+
+        # A runner that read the batch before the first one committed
+        stale = InterviewRound.objects.filter(id__in=due).order_by('id')
+        with mock.patch('interviews.scheduler.due_rounds', lambda now: stale):
+            result = activate_due_rounds(now=self.later)
+
+        self.assertEqual(result['activated'], 0)
+        self.assertEqual(dashboard_snapshot()['rounds'], before)
+
+
+class ReconcileCountersTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='counted', password='counted', role='interviewer')
+        for index in range(2):
+            Contact.objects.create(name=f'Counted {index}', phone=f'0803555{index:04d}', created_by=self.user)
+
+    def test_drift_is_repaired_in_place(self):
+        reconcile_counters()
+        counts = dashboard_snapshot()
+        drifted = DashboardCounter.objects.get(scope='round_status', key='active')
+        DashboardCounter.objects.filter(id=drifted.id).update(value=50)
+        DashboardCounter.objects.create(scope='contact_status', key='gone', value=3)
+
+        reconcile_counters()
+        self.assertEqual(DashboardCounter.objects.get(id=drifted.id).value, counts['rounds']['active'])
+        self.assertEqual(dashboard_snapshot()['contacts'], counts['contacts'])
+
+    def test_counts_are_read_under_the_counter_lock(self):
+        with CaptureQueriesContext(connection) as queries:
+            reconcile_counters()
+        statements = [query['sql'] for query in queries]
+        begin = next(i for i, sql in enumerate(statements) if sql.startswith('SAVEPOINT'))
+        release = next(i for i, sql in enumerate(statements) if sql.startswith('RELEASE SAVEPOINT'))
+        lock = next(i for i, sql in enumerate(statements) if 'FROM "interviews_dashboardcounter"' in sql)
+        counts = [i for i, sql in enumerate(statements) if 'COUNT(' in sql]
+        self.assertTrue(begin < lock < min(counts) and max(counts) < release, statements)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='exporter', password='exporter', role='admin')
+        self.auth = f'Token {Token.objects.create(user=self.user).key}'
+        self.common = Question.objects.create(text='Common', type='text', stage=1, order=0)
+        self.round_1 = Question.objects.create(text='Round 1', type='text', stage=1, order=1, round=1)
+        self.round_2 = Question.objects.create(text='Round 2', type='text', stage=1, order=2, round=2)
+
+    def get(self, query):
+        return self.client.get(f'/api/interviews/export/?{query}', secure=True, HTTP_AUTHORIZATION=self.auth)
+
+    def test_invalid_filters_are_rejected(self):
+        for query in ('round=abc', 'started_after=2026-13-01', 'started_before=yesterday'):
+            self.assertEqual(self.get(query).status_code, 400, query)
+
+    def test_round_export_has_only_that_rounds_questions(self):
+        header = b''.join(self.get('round=1').streaming_content).decode().splitlines()[0].split(',')
+        self.assertIn(f'q_{self.common.id}', header)
+        self.assertIn(f'q_{self.round_1.id}', header)
+        self.assertNotIn(f'q_{self.round_2.id}', header)
+
+    def test_form_field_summary_rejects_invalid_round(self):
+        response = self.client.get(
+            '/api/interviews/form-fields/summary/?path=region&round=abc', secure=True, HTTP_AUTHORIZATION=self.auth
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class SyncChangesTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='syncer', password='syncer', role='interviewer')
+        self.auth = f'Token {Token.objects.create(user=self.user).key}'
+        self.contact = Contact.objects.create(name='Synced', phone='08035555555', created_by=self.user)
+
+    def get(self, query=''):
+        return self.client.get(f'/api/interviews/sync/?{query}', secure=True, HTTP_AUTHORIZATION=self.auth)
+
+    def test_invalid_since_is_rejected(self):
+        for since in ('2026-13-01T00:00:00', 'yesterday'):
+            self.assertEqual(self.get(f'since={since}').status_code, 400, since)
+
+    def test_naive_since_is_taken_in_the_current_time_zone(self):
+        since = (timezone.now() - timedelta(hours=1)).replace(tzinfo=None).isoformat()
+        response = self.get(f'since={since}')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([contact['id'] for contact in response.json()['contacts']], [self.contact.id])
+
+    def test_poll_returns_only_changes_after_the_cursor(self):
+        first = self.get().json()
+        self.assertEqual([contact['id'] for contact in first['contacts']], [self.contact.id])
+        self.assertFalse(first['has_more'])
+
+        contact_id = self.contact.id
+        self.contact.delete()
+        polled = self.get(f"cursor={first['cursor']}").json()
+        self.assertEqual(polled['contacts'], [])
+        self.assertEqual(polled['deleted']['contacts'], [contact_id])
+
+    def test_rounds_follow_their_contact_to_a_new_owner(self):
+        other = User.objects.create_user(username='heir', password='heir', role='interviewer')
+        self.contact.created_by = other
+        self.contact.save()
+        rounds = set(self.contact.interview_rounds.values_list('id', flat=True))
+        self.assertEqual(set(InterviewRound.objects.filter(owner=other).values_list('id', flat=True)), rounds)
+        self.assertFalse(InterviewRound.objects.filter(owner=self.user).exists())
+
+    def add_contacts(self, count):
+        for index in range(count):
+            contact = Contact.objects.create(name=f'Bulk {index}', phone=f'0803556{index:04d}', created_by=self.user)
+            Interview.objects.create(
+                contact=contact, interviewer=self.user, interview_round=contact.interview_rounds.get(round_number=1)
+            )
+
+    @override_settings(SYNC_WATERMARK_LAG_SECONDS=0)
+    def test_empty_poll_costs_the_same_for_any_dataset_size(self):
+        for count in (5, 40):
+            self.add_contacts(count)
+            positions = sync.initial_positions()
+            while True:
+                page = sync.changes_since(self.user, positions)
+                positions = sync.decode_cursor(page['cursor'])
+                if not page['has_more']:
+                    break
+            with self.assertNumQueries(4):
+                page = sync.changes_since(self.user, positions)
+            self.assertEqual([page[name] for name in sync.COLLECTIONS], [[], [], []])
+
+    @skipUnless(connection.vendor == 'sqlite', 'checks the SQLite query plan')
+    def test_poll_seeks_on_the_owner_index_without_sorting(self):
+        self.add_contacts(20)
+        indexes = {
+            'contacts': 'contact_owner_updated_id',
+            'interview_rounds': 'round_owner_updated_id',
+            'interviews': 'interview_owner_updated_id',
+        }
+        for name, (_, queryset, _) in sync.COLLECTIONS.items():
+            plan = sync.seek(queryset(self.user), 'updated_at', (timezone.now(), 0))[:200].explain()
+            self.assertIn(f'INDEX {indexes[name]} (', plan, name)
+            self.assertIn('updated_at>?', plan, name)
+            self.assertNotIn('TEMP B-TREE', plan, name)
+
+
+class RoutingValidationTests(TestCase):
+    def test_malformed_routing_logic_is_rejected_on_save(self):
+        for logic in (
+            {'rules': [{'when': {'operator': 'between', 'value': 1}, 'goto': 'end'}]},
+            {'rules': ['yes']},
+            {'rules': [{'when': {'operator': 'equals', 'value': 1}, 'goto': 'next'}]},
+            {'rules': [{'when': {'question': 'q1', 'value': 1}, 'goto': 'end'}]},
+            {'rules': [{'when': {'value': 1}}]},
+            {'rules': [{'when': {'value': 1}, 'goto': None}]},
+            {'rules': [{'when': {'value': 1}, 'goto': 999999}]},
+            {'default': 999999},
+            'skip',
+        ):
+            question = Question(text='Routed', type='text', routing_logic=logic)
+            with self.assertRaises(ValidationError, msg=logic):
+                question.full_clean()
+            self.assertFalse(QuestionSerializer(data={'text': 'Routed', 'type': 'text', 'routing_logic': logic}).is_valid())
+
+        target = Question.objects.create(text='Target', type='text')
+        Question(text='Routed', type='text', routing_logic=[{'when': {'value': 'yes'}, 'goto': 'end'}]).full_clean()
+        Question(text='Routed', type='text', routing_logic=[{'when': {'value': 'yes'}, 'goto': target.id}]).full_clean()
+
+    def test_next_question_reports_broken_routing_as_a_conflict(self):
+        user = User.objects.create_user(username='router', password='router', role='interviewer')
+        contact = Contact.objects.create(name='Routed', phone='08036666666', created_by=user)
+        interview = Interview.objects.create(
+            contact=contact, interviewer=user, interview_round=contact.interview_rounds.get(round_number=1)
+        )
+        # Stored before validation existed
+        Question.objects.create(text='Broken', type='text', routing_logic={'rules': [{'when': {'operator': 'between'}}]})
+
+        response = self.client.post(
+            f'/api/interviews/{interview.id}/next-question/', {}, content_type='application/json',
+            secure=True, HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}'
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('unknown operator', response.json()['error'])
+
+    def test_rule_without_goto_is_a_routing_error(self):
+        question = Question.objects.create(text='Stored', type='text')
+        Question.objects.filter(id=question.id).update(routing_logic={'rules': [{'when': {'value': 'yes'}}]})
+        with self.assertRaises(RoutingError):
+            RoutingGraph(Question.objects.all()).next_question({question.id: 'yes'})
+
+
+class BusinessCalendarTests(TestCase):
+    def at(self, day, hour=14):
+        return datetime(*day, hour, 30, tzinfo=dt_timezone.utc)
+
+    def test_weekends_and_holidays_roll_forward(self):
+        business_calendar = BusinessCalendar()
+        self.assertEqual(business_calendar.roll_forward(date(2026, 1, 3)), date(2026, 1, 5))
+        self.assertEqual(business_calendar.roll_forward(date(2026, 1, 5)), date(2026, 1, 5))
+        business_calendar = BusinessCalendar(holidays=['2026-01-05', '2026-01-06'])
+        self.assertEqual(business_calendar.roll_forward(date(2026, 1, 3)), date(2026, 1, 7))
+
+    def test_next_round_keeps_the_time_of_day(self):
+        business_calendar = BusinessCalendar()
+        self.assertEqual(business_calendar.next_round_date(self.at((2026, 1, 2))), self.at((2026, 4, 2)))
+        # Thursday and Friday off, then the weekend
+        business_calendar = BusinessCalendar(holidays=['2026-04-02', '2026-04-03'])
+        self.assertEqual(business_calendar.next_round_date(self.at((2026, 1, 2))), self.at((2026, 4, 6)))
+
+    def test_month_intervals_clamp_to_the_end_of_the_month(self):
+        business_calendar = BusinessCalendar(intervals={2: {'months': 1}})
+        # Dec 31 + 1 month is Saturday Jan 31, Jan 31 + 1 month is Saturday Feb 28
+        self.assertEqual(business_calendar.next_round_date(self.at((2025, 12, 31)), 2), self.at((2026, 2, 2)))
+        self.assertEqual(business_calendar.next_round_date(self.at((2026, 1, 31)), 2), self.at((2026, 3, 2)))
+        # Rounds without a rule use the default interval
+        self.assertEqual(business_calendar.next_round_date(self.at((2026, 1, 2)), 3), self.at((2026, 4, 2)))
+
+    def test_schedule_many_matches_round_dates(self):
+        business_calendar = BusinessCalendar(holidays=['2026-04-02'])
+        starts = [self.at((2026, 1, 2), hour) for hour in (8, 12, 17)] + [self.at((2026, 2, 27))]
+        schedules = business_calendar.schedule_many(starts)
+        self.assertEqual(schedules, [business_calendar.round_dates(start) for start in starts])
+        for schedule in schedules:
+            self.assertEqual(len(schedule), 4)
+            self.assertTrue(all(business_calendar.is_business_day(moment.date()) for moment in schedule[1:]))
+
+    @override_settings(ROUND_HOLIDAYS=['2026-03-02'])
+    def test_calculate_next_round_date_honours_months(self):
+        self.assertEqual(
+            InterviewRound.calculate_next_round_date(self.at((2026, 1, 31)), months=1), self.at((2026, 3, 3))
+        )
+        self.assertEqual(InterviewRound.calculate_next_round_date(self.at((2026, 1, 2))), self.at((2026, 4, 2)))
+
+    def test_late_completion_pushes_later_rounds_back(self):
+        user = User.objects.create_user(username='calendar', password='calendar', role='interviewer')
+        contact = Contact.objects.create(name='Late', phone='08037777777', created_by=user)
+        completed_at = timezone.now() + timedelta(days=200)
+
+        moved = reschedule_following_rounds([(contact.id, 1, completed_at)])
+
+        self.assertEqual(sorted(interview_round.round_number for interview_round in moved), [2, 3, 4])
+        rounds = {r.round_number: r.scheduled_at for r in contact.interview_rounds.all()}
+        business_calendar = get_calendar()
+        self.assertEqual(rounds[2], business_calendar.next_round_date(completed_at, 2))
+        self.assertEqual(rounds[3], business_calendar.next_round_date(rounds[2], 3))
+        self.assertEqual(rounds[4], business_calendar.next_round_date(rounds[3], 4))
+
+
+class RoutingEngineTests(TestCase):
+    def graph(self, *routing):
+        return RoutingGraph([
+            Question(id=index, text=f'Question {index}', type='text', stage=1, order=index, routing_logic=logic)
+            for index, logic in enumerate(routing, start=1)
+        ])
+
+    def next_id(self, graph, answers):
+        node = graph.next_question(answers)
+        return None if node is None else node.question.id
+
+    def test_questions_follow_in_sequence_without_rules(self):
+        graph = self.graph(None, None, None)
+        self.assertEqual(self.next_id(graph, {}), 1)
+        self.assertEqual(self.next_id(graph, {1: 'a'}), 2)
+        # A null answer counts as skipped
+        self.assertEqual(self.next_id(graph, {1: 'a', 2: None}), 3)
+        self.assertIsNone(self.next_id(graph, {1: 'a', 2: 'b', 3: 'c'}))
+
+    def test_operators(self):
+        cases = [
+            ({'operator': 'equals', 'value': 'no'}, 'no', 'yes'),
+            ({'operator': 'not_equals', 'value': 'yes'}, 'no', 'yes'),
+            ({'operator': 'in', 'value': ['a', 'b']}, 'b', 'c'),
+            ({'operator': 'not_in', 'value': ['a', 'b']}, 'c', 'a'),
+            ({'operator': 'contains', 'value': 'x'}, ['x', 'y'], ['y']),
+            ({'operator': 'gt', 'value': 5}, 6, 5),
+            ({'operator': 'gte', 'value': 5}, 5, 4),
+            ({'operator': 'lt', 'value': 5}, 4, 5),
+            ({'operator': 'lte', 'value': 5}, 5, 6),
+            ({'operator': 'answered'}, 'x', ''),
+            ({'operator': 'not_answered'}, [], 'x'),
+            # Incomparable values do not match instead of failing
+            ({'operator': 'gt', 'value': 5}, 6, 'six'),
+        ]
+        for condition, matching, other in cases:
+            graph = self.graph([{'when': condition, 'goto': 3}], None, None)
+            self.assertEqual(self.next_id(graph, {1: matching}), 3, (condition, matching))
+            self.assertEqual(self.next_id(graph, {1: other}), 2, (condition, other))
+
+    def test_rules_on_other_questions_defaults_and_end(self):
+        graph = self.graph(
+            None,
+            {'rules': [{'when': {'question': 1, 'operator': 'equals', 'value': 'stop'}, 'goto': 'end'}], 'default': 4},
+            None,
+            # Targets outside the questionnaire end the interview
+            {'default': 99},
+            None,
+        )
+        self.assertIsNone(self.next_id(graph, {1: 'stop', 2: 'x'}))
+        self.assertEqual(self.next_id(graph, {1: 'go', 2: 'x'}), 4)
+        self.assertIsNone(self.next_id(graph, {1: 'go', 2: 'x', 4: 'y'}))
+
+    def test_first_matching_rule_wins(self):
+        graph = self.graph([
+            {'when': {'operator': 'gt', 'value': 1}, 'goto': 3},
+            {'when': {'operator': 'gt', 'value': 0}, 'goto': 2},
+        ], None, None)
+        self.assertEqual(self.next_id(graph, {1: 2}), 3)
+        self.assertEqual(self.next_id(graph, {1: 1}), 2)
+
+    def test_loops_are_detected(self):
+        graph = self.graph(None, {'default': 1}, None)
+        self.assertEqual(self.next_id(graph, {1: 'a'}), 2)
+        with self.assertRaisesMessage(RoutingError, 'Routing loop detected at question 1'):
+            graph.next_question({1: 'a', 2: 'b'})
+
+    def test_round_graph_is_rebuilt_when_the_catalog_changes(self):
+        first = Question.objects.create(text='First', type='text', stage=1, order=0)
+        graph = get_routing_graph(1)
+        self.assertIs(get_routing_graph(1), graph)
+
+        second = Question.objects.create(text='Round 1 only', type='text', stage=1, order=1, round=1)
+        Question.objects.create(text='Round 2 only', type='text', stage=1, order=2, round=2)
+        graph = get_routing_graph(1)
+        self.assertEqual([question.id for question in graph.questions], [first.id, second.id])
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='archivist', password='archivist', role='interviewer')
+        self.contact = Contact.objects.create(name='Done', phone='08035000001', created_by=self.user)
+        question = Question.objects.create(text='Question', type='text', stage=1, order=0)
+        self.contact.interview_rounds.update(status='active', scheduled_at=timezone.now() - timedelta(days=1))
+        for interview_round in self.contact.interview_rounds.all():
+            interview = Interview.objects.create(
+                contact=self.contact, interviewer=self.user, interview_round=interview_round
+            )
+            Response.objects.create(
+                interview=interview, question=question, answer={'round': interview_round.round_number}
+            )
+
+        old = timezone.now() - timedelta(days=200)
+        InterviewRound.objects.filter(contact=self.contact).update(status='completed')
+        Interview.objects.filter(contact=self.contact).update(status='completed', completed_at=old, updated_at=old)
+        Contact.objects.filter(id=self.contact.id).update(status='completed', updated_at=old)
+        reconcile_counters()
+
+    def graph(self):
+        """Ids and creation times of the contact and everything under it"""
+        return (
+            list(Contact.objects.filter(id=self.contact.id).values_list('id', 'created_at')),
+            list(InterviewRound.objects.filter(contact=self.contact).order_by('id').values_list('id', 'created_at')),
+            list(Interview.objects.filter(contact=self.contact).order_by('id').values_list(
+                'id', 'interview_round_id', 'status', 'started_at', 'completed_at'
+            )),
+            list(Response.objects.filter(interview__contact=self.contact).order_by('id').values_list(
+                'id', 'interview_id', 'answer', 'completed_at'
+            )),
+        )
+
+    def test_round_trip_keeps_ids_and_timestamps(self):
+        before = self.graph()
+        counts = dashboard_snapshot()
+
+        self.assertEqual(archive_contacts(), 1)
+        self.assertFalse(Contact.objects.filter(id=self.contact.id).exists())
+        self.assertFalse(Interview.objects.filter(contact_id=self.contact.id).exists())
+        self.assertTrue(ArchivedContact.objects.filter(contact_id=self.contact.id).exists())
+        self.assertEqual(dashboard_snapshot()['contacts'].get('completed', 0), counts['contacts']['completed'] - 1)
+
+        self.assertEqual(restore_contacts([self.contact.id]), [self.contact.id])
+        self.assertEqual(self.graph(), before)
+        self.assertFalse(ArchivedContact.objects.exists())
+        self.assertEqual(dashboard_snapshot()['contacts'], counts['contacts'])
+        self.assertEqual(dashboard_snapshot()['rounds'], counts['rounds'])
+
+    def test_recently_changed_contacts_are_kept(self):
+        Contact.objects.filter(id=self.contact.id).update(updated_at=timezone.now())
+        self.assertEqual(archive_contacts(), 0)
+        self.assertTrue(Contact.objects.filter(id=self.contact.id).exists())
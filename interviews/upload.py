@@ -0,0 +1,173 @@
+"""
+Batched sync upload for interviewers working offline.
+
+The client queues operations while offline and uploads them in order in a
+single request. Every operation carries a client-generated idempotency
+`key`. The batch runs in one transaction, and each operation runs in its own
+savepoint, so a failing operation is reported without undoing the others.
+The result of each successful operation is stored in SyncOperation under
+(user, key). A retried upload replays the stored results instead of writing
+again. Failed operations are not stored and can be retried with the same key.
+
+Operations after `start_round` can refer to the interview it opened with
+`interview_key` (the key of that start_round operation) instead of
+`interview_id`, since an offline client does not know the id yet.
+"""
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import SyncOperation
+from .operations import OperationError, start_round, submit_xform, upsert_responses
+from .progress import save_progress
+from .serializers import InterviewProgressSerializer
+
+MAX_OPERATIONS = 200
+MAX_KEY_LENGTH = SyncOperation._meta.get_field('key').max_length
+
+
+def resolve_interview(operation, done):
+    """The interview id of an operation, given directly or through an earlier start_round key"""
+    if operation.get('interview_id') is not None:
+        try:
+            return int(operation['interview_id'])
+        except (TypeError, ValueError):
+            raise OperationError('interview_id must be an integer', 400)
+    record = done.get(operation.get('interview_key'))
+    if record is None or record.operation != 'start_round':
+        raise OperationError('interview_id or the interview_key of a start_round operation is required', 400)
+    return record.result['interview_id']
+
+
+def apply_start_round(user, operation, done):
+    interview, created = start_round(user, operation.get('contact_id'), operation.get('round_number'))
+    return 201 if created else 200, {
+        'interview_id': interview.id,
+        'round_id': interview.interview_round_id,
+        'created': created,
+    }
+
+
+def apply_upsert_responses(user, operation, done):
+    interview, saved = upsert_responses(user, resolve_interview(operation, done), operation.get('responses'))
+    return 200, {
+        'interview_id': interview.id,
+        'responses': [
+            {'id': response.id, 'question_id': question_id}
+            for question_id, response in sorted(saved.items())
+        ],
+    }
+
+
+def apply_submit_xform(user, operation, done):
+    interview = submit_xform(
+        user,
+        resolve_interview(operation, done),
+        operation.get('form_data'),
+        operation.get('status', 'completed')
+    )
+    return 200, {
+        'interview_id': interview.id,
+        'status': interview.status,
+        'completed_at': interview.completed_at,
+    }
+
+
+def apply_progress(user, operation, done):
+    interview_id = resolve_interview(operation, done)
+    serializer = InterviewProgressSerializer(data=operation)
+    if not serializer.is_valid():
+        raise OperationError('Invalid progress', 400, serializer.errors)
+    saved = save_progress(interview_id, user, serializer.validated_data)
+    if saved is None:
+        raise OperationError('Open interview not found', 404)
+    return 200, {'interview_id': interview_id, 'saved': saved, **serializer.validated_data}
+
+
+OPERATIONS = {
+    'start_round': apply_start_round,
+    'upsert_responses': apply_upsert_responses,
+    'submit_xform': apply_submit_xform,
+    'progress': apply_progress,
+}
+
+
+def replayed(index, record):
+    return {
+        'index': index,
+        'key': record.key,
+        'type': record.operation,
+        'status': record.status_code,
+        'replayed': True,
+        'result': record.result,
+    }
+
+
+def apply_operation(user, index, operation, done):
+    if not isinstance(operation, dict):
+        return {'index': index, 'status': 400, 'error': 'Each operation must be an object'}
+    key = operation.get('key')
+    kind = operation.get('type')
+    if not isinstance(key, str) or not key or len(key) > MAX_KEY_LENGTH:
+        return {'index': index, 'status': 400, 'error': f'key must be a string of 1 to {MAX_KEY_LENGTH} characters'}
+    if key in done:
+        return replayed(index, done[key])
+    if kind not in OPERATIONS:
+        return {
+            'index': index, 'key': key, 'status': 400,
+            'error': f"type must be one of {', '.join(OPERATIONS)}"
+        }
+
+    failure = {'index': index, 'key': key, 'type': kind}
+    try:
+        with transaction.atomic():
+            status_code, result = OPERATIONS[kind](user, operation, done)
+            # Stored and returned in JSON form so first runs and replays look alike
+            result = json.loads(json.dumps(result, cls=DjangoJSONEncoder))
+            record = SyncOperation.objects.create(
+                user=user, key=key, operation=kind, status_code=status_code, result=result
+            )
+    except OperationError as e:
+        return {**failure, 'status': e.status_code, **e.as_data()}
+    except ValidationError as e:
+        return {**failure, 'status': 400, 'error': 'Invalid operation', 'details': e.messages}
+    except (TypeError, ValueError) as e:
+        # Malformed fields must fail this operation only, not the whole batch
+        return {**failure, 'status': 400, 'error': 'Invalid operation', 'details': [str(e)]}
+    except IntegrityError:
+        # A concurrent upload stored this key first; its writes stand
+        record = SyncOperation.objects.filter(user=user, key=key).first()
+        if record is None:
+            return {**failure, 'status': 409, 'error': 'Operation conflicts with existing data'}
+        done[key] = record
+        return replayed(index, record)
+
+    done[key] = record
+    return {**failure, 'status': status_code, 'replayed': False, 'result': result}
+
+
+def apply_batch(user, operations):
+    """
+    Apply `operations` in order in one transaction. Returns one result per
+    operation: the stored result of new and replayed operations, or an error.
+    """
+    keys = [
+        operation.get('key') for operation in operations
+        if isinstance(operation, dict) and isinstance(operation.get('key'), str)
+    ]
+    done = {record.key: record for record in SyncOperation.objects.filter(user=user, key__in=keys)}
+    with transaction.atomic():
+        return [apply_operation(user, index, operation, done) for index, operation in enumerate(operations)]
+
+
+def prune_operations(days=None):
+    """Delete idempotency records older than the retention period; returns how many"""
+    if days is None:
+        days = getattr(settings, 'SYNC_IDEMPOTENCY_RETENTION_DAYS', 30)
+    deleted, _ = SyncOperation.objects.filter(created_at__lt=timezone.now() - timedelta(days=days)).delete()
+    return deleted
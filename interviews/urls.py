@@ -5,8 +5,19 @@ urlpatterns = [
     path('', views.InterviewListCreateView.as_view(), name='interview-list-create'),
     path('<int:pk>/', views.InterviewRetrieveUpdateDestroyView.as_view(), name='interview-detail'),
     path('<int:interview_id>/xform-submit/', views.submit_xform_data, name='submit-xform-data'),
+    path('<int:interview_id>/next-question/', views.next_question, name='next-question'),
+    path('<int:interview_id>/progress/', views.save_interview_progress, name='save-interview-progress'),
     path('questions/', views.QuestionListView.as_view(), name='question-list'),
+    path('export/', views.export_responses, name='export-responses'),
+    path('form-fields/summary/', views.form_field_summary, name='form-field-summary'),
+    path('archive/contact/<int:contact_id>/', views.archived_contact, name='archived-contact'),
+    path('sync/', views.sync_changes, name='sync-changes'),
+    path('sync/upload/', views.sync_upload, name='sync-upload'),
+    path('dashboard/', views.dashboard, name='dashboard'),
     path('response/', views.create_response, name='create-response'),
+    path('response/batch/', views.create_responses_batch, name='create-responses-batch'),
+    path('dispatch/next/', views.dispatch_next, name='dispatch-next'),
+    path('dispatch/<int:round_id>/release/', views.dispatch_release, name='dispatch-release'),
     path('contact/<int:contact_id>/rounds/', views.ContactInterviewRoundsView.as_view(), name='contact-interview-rounds'),
     path('contact/<int:contact_id>/round/<int:round_number>/start/', views.start_interview_round, name='start-interview-round'),
 ]
@@ -3,25 +3,68 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.http import StreamingHttpResponse
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db import models
-from .models import Interview, Question, Response as InterviewResponse, InterviewRound
+from cati_system.pagination import KeysetPagination
+from . import sync
+from .archive import archived_document
+from .catalog import (
+    catalog_etag, catalog_fingerprint, get_cached_catalog, get_catalog_version,
+    set_cached_catalog
+)
+from .counters import dashboard_snapshot
+from .dispatch import lease_next_round, release_round
+from .exports import WideResponseExport
+from .models import ArchivedContact, FormFieldValue, Interview, Question
+from .operations import (
+    OperationError, check_response_items, get_own_interview, save_answers, start_round, submit_xform
+)
+from .progress import forget_progress, save_progress
+from .upload import MAX_OPERATIONS, apply_batch
+from .routing import RoutingError, get_routing_graph
 from .serializers import (
-    InterviewSerializer, QuestionSerializer, ResponseSerializer,
-    InterviewRoundSerializer, ContactInterviewRoundsSerializer
+    InterviewSerializer, InterviewListSerializer, QuestionSerializer, ResponseSerializer,
+    InterviewRoundSerializer, ContactInterviewRoundsSerializer, InterviewProgressSerializer
 )
 from contacts.models import Contact
+from contacts.serializers import ContactSerializer
 
 
 class InterviewListCreateView(generics.ListCreateAPIView):
+    """
+    List or create interviews. Listing leaves out the responses array
+    unless `?include_responses=true` is passed.
+    """
     serializer_class = InterviewSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['status', 'stage']
 
+    def include_responses(self):
+        value = self.request.query_params.get('include_responses', '')
+        return value.lower() in ('1', 'true', 'yes')
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET' and not self.include_responses():
+            return InterviewListSerializer
+        return InterviewSerializer
+
     def get_queryset(self):
-        return Interview.objects.filter(interviewer=self.request.user)
+        queryset = Interview.objects.filter(interviewer=self.request.user).with_related(
+            include_responses=self.include_responses()
+        )
+        # Filter on an extracted form field, e.g. ?form_path=_11_Are_you_still_using_the_sa&form_value=Yes
+        form_path = self.request.query_params.get('form_path')
+        if form_path:
+            queryset = queryset.filter(
+                form_values__path=form_path,
+                form_values__value_text=self.request.query_params.get('form_value', '')
+            )
+        return queryset
 
 
 class InterviewRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
@@ -29,7 +72,11 @@ class InterviewRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Interview.objects.filter(interviewer=self.request.user)
+        queryset = Interview.objects.filter(interviewer=self.request.user)
+        if self.request.method == 'GET':
+            # Writes must not see the prefetched rounds: update_status_from_rounds reads them
+            queryset = queryset.with_related()
+        return queryset
 
     def perform_update(self, serializer):
         interview = serializer.save()
@@ -59,6 +106,26 @@ class QuestionListView(generics.ListAPIView):
         
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        """
+        Serve the catalog from a versioned cache. The version changes whenever
+        a question is saved or deleted, so clients sending a matching
+        If-None-Match get a 304 without any database work.
+        """
+        fingerprint = catalog_fingerprint(get_catalog_version(), request)
+        etag = catalog_etag(fingerprint)
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+
+        if_none_match = request.headers.get('If-None-Match', '')
+        if etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*':
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        data = get_cached_catalog(fingerprint)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            set_cached_catalog(fingerprint, data)
+        return Response(data, headers=headers)
+
 
 class ContactInterviewRoundsView(APIView):
     permission_classes = [IsAuthenticated]
@@ -113,70 +180,136 @@ def create_response(request):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
-def start_interview_round(request, contact_id, round_number):
+def create_responses_batch(request):
+    """
+    Save many answers of one interview in a single request.
+
+    Expects {"interview_id": ..., "responses": [{"question_id": ..., "answer": ...}]}.
+    Questions are resolved with one query and all valid answers are upserted
+    in one transaction; the result of every item is returned in order.
+    """
     try:
-        contact = Contact.objects.get(id=contact_id)
-        interview_round = contact.interview_rounds.get(round_number=round_number)
-    except Contact.DoesNotExist:
-        return Response(
-            {'error': 'Contact not found'},
-            status=status.HTTP_404_NOT_FOUND
+        interview = get_own_interview(request.user, request.data.get('interview_id'))
+        results, answers = check_response_items(request.data.get('responses'))
+    except OperationError as e:
+        return Response(e.as_data(), status=e.status_code)
+
+    # Invalid items are reported and the valid ones saved (the sync upload's
+    # upsert_responses operation saves all of them or none)
+    saved = save_answers(interview, answers)
+    for result in results:
+        if 'error' not in result:
+            result['response'] = ResponseSerializer(saved[result['question_id']]).data
+
+    failed = sum(1 for result in results if 'error' in result)
+    return Response({
+        'saved': len(results) - failed,
+        'failed': failed,
+        'results': results
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def next_question(request, interview_id):
+    """
+    Return the next question of an interview according to the routing logic.
+
+    Answers already stored for the interview are combined with the optional
+    `answers` object ({question_id: answer}) from the request. The interview's
+    current_question_index and stage are moved to the returned question.
+    """
+    try:
+        interview = Interview.objects.select_related('interview_round').get(
+            id=interview_id,
+            interviewer=request.user
         )
-    except InterviewRound.DoesNotExist:
+    except Interview.DoesNotExist:
         return Response(
-            {'error': 'Interview round not found'},
+            {'error': 'Interview not found'},
             status=status.HTTP_404_NOT_FOUND
         )
 
-    if not interview_round.can_start_interview():
+    posted = request.data.get('answers') or {}
+    if not isinstance(posted, dict):
         return Response(
-            {
-                'error': 'Cannot start interview for this round',
-                'details': {
-                    'status': interview_round.status,
-                    'scheduled_at': interview_round.scheduled_at,
-                    'can_start': interview_round.can_start_interview()
-                }
-            },
+            {'error': 'answers must be an object keyed by question id'},
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    # Check if there's already an active interview for this round
-    existing_interview = Interview.objects.filter(
-        contact=contact,
-        interview_round=interview_round,
-        status__in=['in_progress', 'paused']
-    ).first()
-
-    if existing_interview:
-        # Return the existing interview instead of creating a new one
-        serializer = InterviewSerializer(existing_interview, context={'request': request})
-        return Response(serializer.data)
+    answers = dict(interview.responses.values_list('question_id', 'answer'))
+    try:
+        answers.update({int(question_id): answer for question_id, answer in posted.items()})
+    except (TypeError, ValueError):
+        return Response(
+            {'error': 'answers must be keyed by question id'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
+    round_number = interview.interview_round.round_number if interview.interview_round else None
     try:
-        # Create new interview for this round
-        interview = Interview.objects.create(
-            contact=contact,
-            interviewer=request.user,
-            interview_round=interview_round,
-            status='in_progress',
-            stage=1,
-            current_question_index=0
+        node = get_routing_graph(round_number).next_question(answers)
+    except RoutingError as e:
+        # The questionnaire is misconfigured (e.g. saved before validation existed)
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_409_CONFLICT
         )
 
-        # Update interview round status to active
-        interview_round.status = 'active'
-        interview_round.save()
+    if node is None:
+        return Response({'complete': True, 'question': None})
+
+    Interview.objects.filter(pk=interview.pk).update(
+        current_question_index=node.index,
+        stage=node.question.stage,
+        updated_at=timezone.now()
+    )
+    # The bare update bypasses post_save; the next autosave must not be coalesced
+    forget_progress(interview.id)
+    return Response({
+        'complete': False,
+        'index': node.index,
+        'stage': node.question.stage,
+        'question': QuestionSerializer(node.question).data
+    })
+
+
+@api_view(['POST', 'PATCH'])
+@permission_classes([IsAuthenticated])
+def save_interview_progress(request, interview_id):
+    """
+    Autosave/heartbeat for a running interview: writes only
+    current_question_index and stage with one UPDATE, skipping full_clean().
+    Repeats of the last saved position within the coalesce window are not written.
+    """
+    serializer = InterviewProgressSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    saved = save_progress(interview_id, request.user, serializer.validated_data)
+    if saved is None:
+        return Response(
+            {'error': 'Open interview not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    return Response({'id': interview_id, 'saved': saved, **serializer.validated_data})
 
-        serializer = InterviewSerializer(interview, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def start_interview_round(request, contact_id, round_number):
+    try:
+        interview, created = start_round(request.user, contact_id, round_number)
+    except OperationError as e:
+        return Response(e.as_data(), status=e.status_code)
     except Exception as e:
         return Response(
             {'error': f'Failed to create interview: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+    serializer = InterviewSerializer(interview, context={'request': request})
+    return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -185,42 +318,263 @@ def submit_xform_data(request, interview_id):
     Submit XForm data for a specific interview
     """
     try:
-        # Get the interview
-        interview = Interview.objects.get(
-            id=interview_id,
-            interviewer=request.user
+        interview = submit_xform(
+            request.user,
+            interview_id,
+            request.data.get('form_data'),
+            request.data.get('status', 'completed')
         )
-    except Interview.DoesNotExist:
+    except OperationError as e:
+        return Response(e.as_data(), status=e.status_code)
+    except Exception as e:
         return Response(
-            {'error': 'Interview not found or access denied'},
+            {'error': f'Failed to submit XForm data: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    # Serialize and return updated interview
+    serializer = InterviewSerializer(interview, context={'request': request})
+    return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+def round_param(request):
+    """The optional `round` query param as an int (None when absent); ValueError when invalid"""
+    value = request.query_params.get('round')
+    return int(value) if value else None
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_responses(request):
+    """
+    Stream responses as one row per interview and one column per question.
+
+    Query params: `output` (csv or ndjson), `round`, `status`,
+    `started_after` and `started_before` (YYYY-MM-DD). Administrators export
+    every interview, other users only their own.
+    """
+    output = request.query_params.get('output', 'csv')
+    if output not in ('csv', 'ndjson'):
+        return Response(
+            {'error': 'output must be csv or ndjson'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    interviews = Interview.objects.all()
+    if not (request.user.is_staff or request.user.role == 'admin'):
+        interviews = interviews.filter(interviewer=request.user)
+
+    try:
+        round_number = round_param(request)
+    except ValueError:
+        return Response(
+            {'error': 'round must be an integer'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if round_number is not None:
+        interviews = interviews.filter(interview_round__round_number=round_number)
+    interview_status = request.query_params.get('status')
+    if interview_status:
+        interviews = interviews.filter(status=interview_status)
+    for param, lookup in (('started_after', 'started_at__date__gte'), ('started_before', 'started_at__date__lte')):
+        value = request.query_params.get(param)
+        if value:
+            try:
+                # None when malformed, ValueError for impossible dates such as 2026-13-01
+                day = parse_date(value)
+            except ValueError:
+                day = None
+            if day is None:
+                return Response(
+                    {'error': f'{param} must be a date (YYYY-MM-DD)'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            interviews = interviews.filter(**{lookup: day})
+
+    export = WideResponseExport(interviews, round_number=round_number)
+    if output == 'csv':
+        response = StreamingHttpResponse(export.stream_csv(), content_type='text/csv')
+    else:
+        response = StreamingHttpResponse(export.stream_ndjson(), content_type='application/x-ndjson')
+    response['Content-Disposition'] = f'attachment; filename="responses.{output}"'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def form_field_summary(request):
+    """
+    Aggregate an extracted form field: answer counts plus numeric statistics.
+    Requires `path`; supports the same `round` and `status` filters as the export.
+    """
+    path = request.query_params.get('path')
+    if not path:
+        return Response(
+            {'error': 'path is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    values = FormFieldValue.objects.filter(path=path)
+    if not (request.user.is_staff or request.user.role == 'admin'):
+        values = values.filter(interview__interviewer=request.user)
+    try:
+        round_number = round_param(request)
+    except ValueError:
+        return Response(
+            {'error': 'round must be an integer'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if round_number is not None:
+        values = values.filter(interview__interview_round__round_number=round_number)
+    interview_status = request.query_params.get('status')
+    if interview_status:
+        values = values.filter(interview__status=interview_status)
+
+    counts = values.order_by().values('value_text').annotate(
+        count=models.Count('id')
+    ).order_by('-count', 'value_text')
+    numbers = values.filter(value_number__isnull=False).aggregate(
+        count=models.Count('id'),
+        min=models.Min('value_number'),
+        max=models.Max('value_number'),
+        avg=models.Avg('value_number'),
+    )
+    return Response({
+        'path': path,
+        'values': [{'value': row['value_text'], 'count': row['count']} for row in counts],
+        'numeric': numbers,
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def dashboard(request):
+    """
+    Live contact/round status counts and today's completed interviews, read
+    from the counters table instead of COUNT(*) scans.
+    """
+    return Response(dashboard_snapshot())
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def archived_contact(request, contact_id):
+    """
+    Read-only view of an archived contact with its rounds, interviews,
+    responses and form values. Admins see every archive, other users only
+    the contacts they created.
+    """
+    archive = ArchivedContact.objects.filter(contact_id=contact_id).first()
+    is_admin = request.user.is_staff or request.user.role == 'admin'
+    if archive is None or not (is_admin or archive.created_by_id == request.user.id):
+        return Response(
+            {'error': 'Archived contact not found'},
             status=status.HTTP_404_NOT_FOUND
         )
+    return Response(archived_document(archive))
 
-    # Validate request data
-    form_data = request.data.get('form_data')
-    if not form_data:
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def sync_changes(request):
+    """
+    Contacts, rounds and interviews changed since `?cursor=` (or `?since=`,
+    an ISO timestamp), plus the ids of deleted ones. Without either the whole
+    dataset is returned page by page. Apply `deleted` first, then upsert the
+    rows, and request the next page with the returned cursor while
+    `has_more` is true.
+    """
+    cursor = request.query_params.get('cursor')
+    since = request.query_params.get('since')
+    try:
+        limit = int(request.query_params.get('limit', sync.DEFAULT_LIMIT))
+    except ValueError:
         return Response(
-            {'error': 'form_data is required'},
+            {'error': 'limit must be an integer'},
             status=status.HTTP_400_BAD_REQUEST
         )
+    limit = max(1, min(limit, sync.MAX_LIMIT))
 
     try:
-        # Update interview with XForm data
-        interview.form_data = form_data
-        interview.status = request.data.get('status', 'completed')
+        if cursor:
+            positions = sync.decode_cursor(cursor)
+        elif since:
+            positions = sync.initial_positions(sync.parse_moment(since))
+        else:
+            positions = sync.initial_positions()
+        return Response(sync.changes_since(request.user, positions, limit, context={'request': request}))
+    except sync.SyncCursorError as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except sync.SyncCursorExpired as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_410_GONE
+        )
 
-        # Set completion time if status is completed
-        if interview.status == 'completed':
-            interview.completed_at = timezone.now()
 
-        interview.save()
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def sync_upload(request):
+    """
+    Apply a queued batch of offline operations in one transaction.
 
-        # Serialize and return updated interview
-        serializer = InterviewSerializer(interview, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    Expects {"operations": [{"key": ..., "type": ..., ...}]} where type is
+    start_round, upsert_responses, submit_xform or progress. Operations
+    whose key was already applied return the stored result instead of
+    writing again. The result of every operation is returned in order.
+    """
+    operations = request.data.get('operations')
+    if not isinstance(operations, list) or not operations:
+        return Response(
+            {'error': 'operations must be a non-empty list'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(operations) > MAX_OPERATIONS:
+        return Response(
+            {'error': f'At most {MAX_OPERATIONS} operations per upload'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
-    except Exception as e:
+    results = apply_batch(request.user, operations)
+    replays = sum(1 for result in results if result.get('replayed'))
+    failed = sum(1 for result in results if 'error' in result)
+    return Response({
+        'applied': len(results) - replays - failed,
+        'replayed': replays,
+        'failed': failed,
+        'results': results
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def dispatch_next(request):
+    """
+    Lease the next contact to call to the requesting interviewer.
+    Returns 204 when there is nothing to call right now.
+    """
+    interview_round = lease_next_round(request.user)
+    if interview_round is None:
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    contact = Contact.objects.with_interview_summary().get(pk=interview_round.contact_id)
+    return Response({
+        'lease_expires_at': interview_round.lease_expires_at,
+        'interview_round': InterviewRoundSerializer(interview_round).data,
+        'contact': ContactSerializer(contact).data,
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def dispatch_release(request, round_id):
+    """Release the requesting interviewer's lease on a round"""
+    if not release_round(request.user, round_id):
         return Response(
-            {'error': f'Failed to submit XForm data: {str(e)}'},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            {'error': 'No lease held on this round'},
+            status=status.HTTP_404_NOT_FOUND
         )
+    return Response({'message': 'Lease released'})